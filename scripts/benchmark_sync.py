@@ -0,0 +1,519 @@
+"""
+Synthetic large-scale benchmark for GoogleTasksSync.
+
+Runs the full sync against local fakes: a fake `gh` executable on PATH
+(fake_gh.py) serving issues, project items and GraphQL responses from
+generated fixtures, and an in-memory stand-in for the Google Tasks service.
+Each run records wall time, per-step timings, external call counts and peak
+Python memory, so scaling and the effect of an optimisation can be measured
+without network access.
+
+    python scripts/benchmark_sync.py --scales 100,1000,10000 --out bench.json
+"""
+import os
+import sys
+import json
+import time
+import re
+import random
+import shutil
+import logging
+import argparse
+import tempfile
+import threading
+import tracemalloc
+from collections import Counter
+from datetime import datetime, timezone, timedelta
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from rate_limiter import RateLimitScheduler
+from sync_google_tasks import GoogleTasksSync, AsyncGoogleTasksSync
+
+logger = logging.getLogger(__name__)
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+FAKE_GH = os.path.join(SCRIPTS_DIR, 'fake_gh.py')
+
+# tasks.list / tasklists.list return 20 results per page unless maxResults is given (max 100)
+TASKS_DEFAULT_PAGE_SIZE = 20
+TASKS_MAX_PAGE_SIZE = 100
+PROJECT_PAGE_SIZE = 100
+# Top-level names of a `fields=` projection, each with its optional `(subfields)` list
+FIELDS_PATTERN = re.compile(r'(\w+)(?:\(([^)]*)\))?')
+
+STATUS_OPTIONS = {
+    'Todo': GoogleTasksSync.TODO_OPTION_ID,
+    'In Progress': GoogleTasksSync.IN_PROGRESS_OPTION_ID,
+    'Done': GoogleTasksSync.DONE_OPTION_ID,
+}
+
+
+def _timestamp(value):
+    return value.strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+
+def _task_body(task_id, tasklist_id, notes, gmail_id=None):
+    """Issue / draft body in the format written by GoogleTasksSync._build_task_body."""
+    link = f"https://www.googleapis.com/tasks/v1/lists/{tasklist_id}/tasks/{task_id}"
+    lines = [
+        "## 📋 Task Details",
+        "",
+        "### Links",
+        f"- [🔗 View Task in Google Tasks]({link})",
+        "",
+        "---",
+        f"Origin: Google Tasks {task_id}",
+        f"Tasklist-ID: {tasklist_id}",
+        f"System-Link: {link} (Do not click / System use only)",
+        f"Note: {notes}",
+    ]
+    if gmail_id:
+        lines.append(f"Gmail-ID: {gmail_id}")
+    return "\n".join(lines)
+
+
+def generate_fixtures(scale, seed=0, tasklists=5, linked_ratio=0.8, issue_ratio=0.5,
+                      completed_ratio=0.2, done_ratio=0.25, stale_done_ratio=0.3, now=None):
+    """
+    Build a board with `scale` Google Tasks and roughly `scale` issues + project items.
+
+    linked_ratio of the tasks already have an issue (issue_ratio of those) or a draft item;
+    the rest are new and get created by Step 1. Completed tasks have closed issues / Done
+    items, done_ratio of the open ones are Done on the board (Step 3 completes them), and
+    stale_done_ratio of the Done items are old enough for Step 5 to archive. A further 10%
+    of unrelated issues carry no Google Tasks marker.
+    """
+    rng = random.Random(seed)
+    now = now or datetime.now(timezone.utc)
+    list_ids = [f"tasklist-{index:02d}" for index in range(max(1, tasklists))]
+    tasks_by_list = {list_id: [] for list_id in list_ids}
+    issues = []
+    nodes = []
+    issue_number = 0
+
+    def project_node(content, status, updated_at):
+        node = {
+            'id': f"PVTI_bench_{len(nodes):07d}",
+            'updatedAt': _timestamp(updated_at),
+            'isArchived': False,
+            'status': {'name': status, 'optionId': STATUS_OPTIONS[status]} if status else None,
+            'content': content,
+        }
+        nodes.append(node)
+
+    for index in range(scale):
+        list_id = list_ids[index % len(list_ids)]
+        task_id = f"bench-task-{index:07d}"
+        completed = rng.random() < completed_ratio
+        updated = now - timedelta(minutes=rng.randint(1, 60 * 24 * 60))
+        gmail_id = f"gmail{index:07d}" if rng.random() < 0.1 else None
+        notes = f"Synthetic task {index}" + (
+            f"\nhttps://mail.google.com/mail/u/0/#inbox/{gmail_id}" if gmail_id else ''
+        )
+        title = f"Benchmark task {index}"
+        tasks_by_list[list_id].append({
+            'kind': 'tasks#task',
+            'id': task_id,
+            'etag': f'"{rng.getrandbits(32):08x}"',
+            'title': title,
+            'notes': notes,
+            'status': 'completed' if completed else 'needsAction',
+            'updated': _timestamp(updated),
+            'selfLink': f"https://www.googleapis.com/tasks/v1/lists/{list_id}/tasks/{task_id}",
+        })
+        if rng.random() >= linked_ratio:
+            continue
+
+        body = _task_body(task_id, list_id, notes, gmail_id)
+        done = completed or rng.random() < done_ratio
+        status = 'Done' if done else rng.choice(['Todo', 'Todo', 'In Progress', ''])
+        if done and rng.random() < stale_done_ratio:
+            item_updated = now - timedelta(days=rng.randint(8, 365))
+        else:
+            item_updated = now - timedelta(hours=rng.randint(1, 24 * 6))
+
+        if rng.random() < issue_ratio:
+            issue_number += 1
+            issues.append({
+                'number': issue_number,
+                'id': f"I_bench_{issue_number:07d}",
+                'title': f"🐺 Phantom要対応: {title}",
+                'body': body,
+                'labels': [{'name': 'Status: 🕵️ Infiltration'}],
+                'state': 'CLOSED' if completed or (done and rng.random() < 0.5) else 'OPEN',
+                'createdAt': _timestamp(min(updated, item_updated)),
+                'updatedAt': _timestamp(item_updated),
+            })
+            # A few open issues never made it onto the board (Step 4 adds them)
+            if rng.random() < 0.95:
+                project_node({'__typename': 'Issue', 'id': f"I_bench_{issue_number:07d}",
+                              'title': issues[-1]['title'], 'number': issue_number}, status, item_updated)
+        else:
+            project_node({'__typename': 'DraftIssue', 'id': f"DI_bench_{index:07d}",
+                          'title': f"📝 Phantom Task: {title}", 'body': body}, status, item_updated)
+
+    for _ in range(scale // 10):
+        issue_number += 1
+        issues.append({
+            'number': issue_number,
+            'id': f"I_bench_{issue_number:07d}",
+            'title': f"Unrelated issue {issue_number}",
+            'body': "Regular issue without a Google Tasks origin.",
+            'labels': [],
+            'state': rng.choice(['OPEN', 'CLOSED']),
+            'createdAt': _timestamp(now - timedelta(hours=issue_number)),
+            'updatedAt': _timestamp(now - timedelta(hours=issue_number)),
+        })
+
+    # gh lists newest issues first
+    issues.sort(key=lambda issue: issue['number'], reverse=True)
+    return {
+        'tasklists': [{'kind': 'tasks#taskList', 'id': list_id, 'title': f"Benchmark list {list_id}",
+                       'updated': _timestamp(now)} for list_id in list_ids],
+        'tasks': tasks_by_list,
+        'issues': issues,
+        'project_nodes': nodes,
+        'next_issue_number': issue_number + 1,
+    }
+
+
+def write_fixtures(fixtures, directory):
+    """Write the GitHub side of the fixtures in the layout fake_gh.py reads."""
+    os.makedirs(os.path.join(directory, 'issues'), exist_ok=True)
+    os.makedirs(os.path.join(directory, 'project_pages'), exist_ok=True)
+    with open(os.path.join(directory, 'issues.json'), 'w', encoding='utf-8') as f:
+        json.dump(fixtures['issues'], f, ensure_ascii=False)
+    for issue in fixtures['issues']:
+        with open(os.path.join(directory, 'issues', f"{issue['number']}.json"), 'w', encoding='utf-8') as f:
+            json.dump(issue, f, ensure_ascii=False)
+    nodes = fixtures['project_nodes']
+    pages = [nodes[start:start + PROJECT_PAGE_SIZE] for start in range(0, len(nodes), PROJECT_PAGE_SIZE)] or [[]]
+    for index, page in enumerate(pages):
+        with open(os.path.join(directory, 'project_pages', f'{index}.json'), 'w', encoding='utf-8') as f:
+            json.dump(page, f, ensure_ascii=False)
+    with open(os.path.join(directory, 'project_meta.json'), 'w', encoding='utf-8') as f:
+        json.dump({'pages': len(pages), 'items': len(nodes)}, f)
+    with open(os.path.join(directory, 'next_issue_number'), 'w', encoding='utf-8') as f:
+        f.write(str(fixtures['next_issue_number']))
+    open(os.path.join(directory, 'calls.log'), 'w').close()
+
+
+def install_fake_gh(directory):
+    """Create a bin directory whose `gh` runs fake_gh.py; returns the directory."""
+    bin_dir = os.path.join(directory, 'bin')
+    os.makedirs(bin_dir, exist_ok=True)
+    path = os.path.join(bin_dir, 'gh')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f'#!/bin/sh\nexec "{sys.executable}" "{FAKE_GH}" "$@"\n')
+    os.chmod(path, 0o755)
+    return bin_dir
+
+
+def read_gh_calls(directory):
+    with open(os.path.join(directory, 'calls.log'), 'r', encoding='utf-8') as f:
+        return dict(Counter(line.strip() for line in f if line.strip()))
+
+
+class FakeRequest:
+    """googleapiclient HttpRequest stand-in: execute() runs the handler and decodes through postproc."""
+
+    def __init__(self, service, method, handler):
+        self._service = service
+        self.method = method
+        self._handler = handler
+        self.postproc = lambda resp, content: json.loads(content)
+
+    def _respond(self):
+        self._service.count(self.method)
+        content = json.dumps(self._handler(), ensure_ascii=False).encode('utf-8')
+        return self.postproc({'status': '200'}, content)
+
+    def execute(self, http=None, num_retries=0):
+        self._service.count_request()
+        return self._respond()
+
+
+class FakeBatch:
+    def __init__(self, service, callback):
+        self._service = service
+        self._callback = callback
+        self._requests = []
+
+    def add(self, request, request_id=None, callback=None):
+        self._requests.append((request_id or str(len(self._requests)), request, callback))
+
+    def execute(self, http=None):
+        self._service.count_request()
+        self._service.count('batch')
+        for request_id, request, callback in self._requests:
+            try:
+                response, error = request._respond(), None
+            except HttpError as e:
+                response, error = None, e
+            (callback or self._callback)(request_id, response, error)
+
+
+class _Resource:
+    def __init__(self, service, kind, methods):
+        self._service = service
+        self._kind = kind
+        self._methods = methods
+
+    def __getattr__(self, name):
+        method = self._methods[name]
+        return lambda **kwargs: FakeRequest(self._service, f"{self._kind}.{name}",
+                                            lambda: method(**kwargs))
+
+
+class FakeTasksService:
+    """
+    In-memory Google Tasks API v1 with the tasklists()/tasks() surface the sync uses,
+    including list paging, updatedMin filtering and batch requests. Counts every API
+    operation and HTTP round trip (a batch is one round trip).
+    """
+
+    def __init__(self, tasklists, tasks_by_list):
+        self._lock = threading.Lock()
+        self._tasklists = [dict(tl) for tl in tasklists]
+        self._tasks = {list_id: {task['id']: dict(task) for task in tasks}
+                       for list_id, tasks in tasks_by_list.items()}
+        self.operations = Counter()
+        self.http_requests = 0
+
+    def count(self, method):
+        with self._lock:
+            self.operations[method] += 1
+
+    def count_request(self):
+        with self._lock:
+            self.http_requests += 1
+
+    @staticmethod
+    def _page(items, maxResults=None, pageToken=None):
+        size = min(int(maxResults or TASKS_DEFAULT_PAGE_SIZE), TASKS_MAX_PAGE_SIZE)
+        start = int(pageToken or 0)
+        page = {'items': items[start:start + size]}
+        if start + size < len(items):
+            page['nextPageToken'] = str(start + size)
+        return page
+
+    def _missing(self, what):
+        resp = httplib2.Response({'status': '404', 'reason': 'Not Found'})
+        content = json.dumps({'error': {'code': 404, 'message': f"{what} not found"}}).encode('utf-8')
+        return HttpError(resp, content)
+
+    @staticmethod
+    def _project(response, fields):
+        """Apply a `fields=` partial-response projection of the form `nextPageToken,items(a,b)`."""
+        if not fields:
+            return response
+        projected = {}
+        for name, subfields in FIELDS_PATTERN.findall(fields):
+            if name not in response:
+                continue
+            if subfields:
+                keep = subfields.split(',')
+                projected[name] = [{key: item[key] for key in keep if key in item} for item in response[name]]
+            else:
+                projected[name] = response[name]
+        return projected
+
+    def _list_tasklists(self, maxResults=None, pageToken=None, fields=None):
+        with self._lock:
+            page = {'kind': 'tasks#taskLists', **self._page(list(self._tasklists), maxResults, pageToken)}
+        return self._project(page, fields)
+
+    def _list_tasks(self, tasklist, showCompleted=True, showHidden=False, updatedMin=None,
+                    maxResults=None, pageToken=None, fields=None, **_):
+        with self._lock:
+            tasks = list(self._tasks.get(tasklist, {}).values())
+        if not showCompleted:
+            tasks = [task for task in tasks if task['status'] != 'completed']
+        if updatedMin:
+            tasks = [task for task in tasks if task['updated'] >= updatedMin]
+        return self._project({'kind': 'tasks#tasks', **self._page(tasks, maxResults, pageToken)}, fields)
+
+    def _get_task(self, tasklist, task):
+        with self._lock:
+            found = self._tasks.get(tasklist, {}).get(task)
+            if found is None:
+                raise self._missing(f"Task {task}")
+            return dict(found)
+
+    def _write_task(self, tasklist, task, body):
+        with self._lock:
+            found = self._tasks.get(tasklist, {}).get(task)
+            if found is None:
+                raise self._missing(f"Task {task}")
+            found.update({key: value for key, value in body.items() if key not in ('id', 'kind')})
+            found['updated'] = _timestamp(datetime.now(timezone.utc))
+            return dict(found)
+
+    def tasklists(self):
+        return _Resource(self, 'tasklists', {'list': self._list_tasklists})
+
+    def tasks(self):
+        return _Resource(self, 'tasks', {
+            'list': self._list_tasks,
+            'get': self._get_task,
+            'patch': self._write_task,
+            'update': self._write_task,
+        })
+
+    def new_batch_http_request(self, callback=None):
+        return FakeBatch(self, callback)
+
+
+class FakeWorkspaceSkill:
+    """GoogleWorkspaceSkill stand-in that acknowledges Gmail marks."""
+
+    def __init__(self):
+        self.marked = Counter()
+        self._lock = threading.Lock()
+
+    def mark_email_as_done(self, message_id):
+        with self._lock:
+            self.marked[message_id] += 1
+        return json.dumps({'id': message_id, 'labelIds': []})
+
+
+def run_benchmark(scale, engine='sequential', create_issues=False, seed=0, tasklists=5,
+                  rates=None, concurrency=None, trace_memory=True, work_dir=None, runs=1):
+    """
+    Generate fixtures for `scale` and run `runs` full syncs against the fakes, each with a fresh
+    engine sharing the state files (link index, sync state) like consecutive cron runs.
+    Returns one measurement dict per run; later runs show the steady-state cost.
+    """
+    fixtures = generate_fixtures(scale, seed=seed, tasklists=tasklists)
+    own_dir = work_dir is None
+    work_dir = work_dir or tempfile.mkdtemp(prefix=f'sync-bench-{scale}-')
+    fixture_dir = os.path.join(work_dir, 'fixtures')
+    write_fixtures(fixtures, fixture_dir)
+    bin_dir = install_fake_gh(work_dir)
+
+    saved_env = {name: os.environ.get(name) for name in ('PATH', 'FAKE_GH_FIXTURES', 'GH_TOKEN')}
+    os.environ['PATH'] = bin_dir + os.pathsep + os.environ.get('PATH', '')
+    os.environ['FAKE_GH_FIXTURES'] = fixture_dir
+    os.environ.setdefault('GH_TOKEN', 'benchmark')
+
+    service = FakeTasksService(fixtures['tasklists'], fixtures['tasks'])
+    workspace_skill = FakeWorkspaceSkill()
+    engine_class = AsyncGoogleTasksSync if engine == 'async' else GoogleTasksSync
+    engine_kwargs = {'concurrency': concurrency} if engine == 'async' else {}
+    results = []
+    try:
+        for run in range(1, max(1, runs) + 1):
+            open(os.path.join(fixture_dir, 'calls.log'), 'w').close()
+            service.operations.clear()
+            service.http_requests = 0
+            workspace_skill.marked.clear()
+            # Rate 0 disables pacing: measure the sync itself, not the configured request budget
+            scheduler = RateLimitScheduler(rates=rates or {'github': 0, 'google': 0, 'gmail': 0})
+
+            if trace_memory:
+                tracemalloc.start()
+            started = time.perf_counter()
+            try:
+                sync_engine = engine_class(
+                    owner='bench-owner',
+                    repo='bench-repo',
+                    create_issues=create_issues,
+                    state_file=os.path.join(work_dir, 'sync_state.json'),
+                    link_index_file=os.path.join(work_dir, 'task_links.sqlite3'),
+                    mutation_journal_file=os.path.join(work_dir, 'mutation_journal.sqlite3'),
+                    scheduler=scheduler,
+                    service=service,
+                    workspace_skill=workspace_skill,
+                    **engine_kwargs
+                )
+                summary = sync_engine.sync()
+                wall_time = time.perf_counter() - started
+                peak_memory = tracemalloc.get_traced_memory()[1] if trace_memory else None
+            finally:
+                if trace_memory:
+                    tracemalloc.stop()
+            sync_engine.link_index.close()
+
+            metrics = sync_engine.metrics.to_dict()
+            results.append({
+                'scale': scale,
+                'run': run,
+                'engine': engine,
+                'create_issues': create_issues,
+                'fixtures': {
+                    'tasks': sum(len(tasks) for tasks in fixtures['tasks'].values()),
+                    'tasklists': len(fixtures['tasklists']),
+                    'issues': len(fixtures['issues']),
+                    'project_items': len(fixtures['project_nodes']),
+                },
+                'wall_time_s': round(wall_time, 4),
+                'peak_memory_mib': round(peak_memory / (1024 * 1024), 2) if peak_memory is not None else None,
+                'calls': metrics['totals']['calls'],
+                'bytes_received': metrics['totals']['bytes_received'],
+                'gh_processes': read_gh_calls(fixture_dir),
+                'google_operations': dict(service.operations),
+                'google_http_requests': service.http_requests,
+                'gmail_marks': sum(workspace_skill.marked.values()),
+                'steps': {name: step['wall_time_s'] for name, step in metrics['steps'].items()},
+                'summary': summary,
+            })
+    finally:
+        for name, value in saved_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        if own_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+
+def format_results(results):
+    header = f"{'scale':>7} {'run':>3} {'engine':<10} {'wall s':>9} {'peak MiB':>9} {'github':>7} {'google':>7} {'gh spawns':>9}"
+    lines = [header, '-' * len(header)]
+    for result in results:
+        peak = f"{result['peak_memory_mib']:.1f}" if result['peak_memory_mib'] is not None else '-'
+        lines.append(
+            f"{result['scale']:>7} {result['run']:>3} {result['engine']:<10} {result['wall_time_s']:>9.2f} {peak:>9} "
+            f"{result['calls'].get('github', 0):>7} {result['calls'].get('google', 0):>7} "
+            f"{sum(result['gh_processes'].values()):>9}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark GoogleTasksSync against local gh / Google Tasks fakes')
+    parser.add_argument('--scales', default='100,1000',
+                        help='Comma-separated numbers of tasks (and roughly as many issues/items) (default: 100,1000)')
+    parser.add_argument('--engine', choices=['sequential', 'async'], default='sequential',
+                        help='Sync engine to benchmark (default: sequential)')
+    parser.add_argument('--create-issues', action=argparse.BooleanOptionalAction, default=False,
+                        help='Benchmark issue creation instead of draft items')
+    parser.add_argument('--tasklists', type=int, default=5, help='Number of Google Tasks lists (default: 5)')
+    parser.add_argument('--runs', type=int, default=1,
+                        help='Consecutive syncs per scale sharing state files; later runs show steady-state cost (default: 1)')
+    parser.add_argument('--seed', type=int, default=0, help='Fixture generator seed (default: 0)')
+    parser.add_argument('--trace-memory', action=argparse.BooleanOptionalAction, default=True,
+                        help='Record peak Python memory with tracemalloc (slows the run down)')
+    parser.add_argument('--log-level', default='WARNING', help='Log level of the sync during runs (default: WARNING)')
+    parser.add_argument('--out', default=None, help='Write the results as JSON to this file')
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(args.log_level.upper())
+    results = []
+    for scale in [int(value) for value in args.scales.split(',') if value.strip()]:
+        print(f"Running scale {scale} ({args.engine})...", flush=True)
+        results.extend(run_benchmark(scale, engine=args.engine, create_issues=args.create_issues,
+                                     seed=args.seed, tasklists=args.tasklists, trace_memory=args.trace_memory,
+                                     runs=args.runs))
+    print(format_results(results))
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"Wrote benchmark results to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
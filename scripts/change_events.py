@@ -0,0 +1,50 @@
+"""
+Change feed for the Google Tasks sync.
+
+Appends one JSON object per line (NDJSON) for every change the sync makes or
+observes: drafts and issues created, project statuses set, items archived,
+tasks completed, closed issues and Done items picked up. Dashboards and
+reports can follow the board from this feed instead of re-listing the
+project. Each event carries a UTC timestamp, the sync run ID, the repository
+and project, and the IDs involved. The path '-' writes the feed to stdout.
+"""
+import os
+import sys
+import json
+import threading
+from datetime import datetime, timezone
+
+EVENT_VERSION = 1
+
+
+class ChangeEventStream:
+    """Thread-safe NDJSON appender; one instance can be shared by several sync engines."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        if path == '-':
+            self._file = sys.stdout
+            self._owns_file = False
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._file = open(path, 'a', encoding='utf-8')
+            self._owns_file = True
+
+    def emit(self, event, **fields):
+        record = {
+            'v': EVENT_VERSION,
+            'ts': datetime.now(timezone.utc).isoformat(),
+            'event': event,
+            **{name: value for name, value in fields.items() if value is not None},
+        }
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        with self._lock:
+            self._file.write(line)
+            # Consumers tail the feed; a line is only useful once it is out of our buffer
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._owns_file:
+                self._file.close()
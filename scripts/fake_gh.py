@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Stand-in for the `gh` CLI used by benchmark_sync.py.
+
+Serves issue lists and searches, single issues, project items and GraphQL responses from
+the fixture directory named by FAKE_GH_FIXTURES (written by
+benchmark_sync.write_fixtures), and appends one line per invocation to
+calls.log there so a benchmark run can count process spawns per command.
+Writes are acknowledged with fresh IDs but not persisted: every run of the
+benchmark starts from the same fixtures.
+"""
+import os
+import re
+import sys
+import json
+import uuid
+import fcntl
+
+FIXTURES = os.environ.get('FAKE_GH_FIXTURES', '')
+
+# `gh issue list` returns 30 issues unless --limit is given
+DEFAULT_ISSUE_LIMIT = 30
+
+MUTATION_FIELD_PATTERN = re.compile(
+    r'(?:(\w+):\s*)?(addProjectV2DraftIssue|updateProjectV2ItemFieldValue|archiveProjectV2Item|addProjectV2ItemById'
+    r'|updateProjectV2DraftIssue)\('
+)
+
+ISSUE_FIELD_PATTERN = re.compile(r'(\w+): issue\(number: (\d+)\)')
+STATUS_TERM = re.compile(r'status:((?:"[^"]*"|[^\s,"]+)(?:,(?:"[^"]*"|[^\s,"]+))*)')
+UPDATED_BEFORE_TERM = re.compile(r'updated:<(\d{4}-\d{2}-\d{2})')
+SEARCH_PHRASE = re.compile(r'"([^"]+)" in:body')
+SEARCH_DATE_TERM = re.compile(r'(created|updated):>=(\S+)')
+# GitHub search returns at most 1000 results per query (lowered by tests to keep boards small)
+SEARCH_RESULT_LIMIT = int(os.environ.get('FAKE_GH_SEARCH_LIMIT') or 1000)
+
+
+def _path(*parts):
+    return os.path.join(FIXTURES, *parts)
+
+
+def _load(*parts):
+    with open(_path(*parts), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _log_call(kind):
+    with open(_path('calls.log'), 'a', encoding='utf-8') as f:
+        f.write(kind + '\n')
+
+
+def _option(args, name, default=None):
+    if name in args:
+        index = args.index(name)
+        if index + 1 < len(args):
+            return args[index + 1]
+    return default
+
+
+def _fail(message, code=1):
+    sys.stderr.write(message + '\n')
+    sys.exit(code)
+
+
+def _next_issue_number():
+    """Issue numbers for `gh issue create`, shared by concurrent fake processes."""
+    with open(_path('next_issue_number'), 'r+', encoding='utf-8') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        number = int(f.read().strip() or 1)
+        f.seek(0)
+        f.truncate()
+        f.write(str(number + 1))
+    return number
+
+
+def _new_item_id():
+    return f"PVTI_fake_{uuid.uuid4().hex[:16]}"
+
+
+def _project_nodes():
+    nodes = []
+    for page in range(_load('project_meta.json')['pages']):
+        nodes.extend(_load('project_pages', f'{page}.json'))
+    return nodes
+
+
+def _select(record, fields):
+    return {field: record.get(field) for field in fields}
+
+
+def issue_command(args):
+    action = args[0]
+    repo = _option(args, '--repo', '')
+    if action == 'list':
+        _log_call('issue list')
+        state = _option(args, '--state', 'open').upper()
+        fields = _option(args, '--json', 'number,title').split(',')
+        limit = int(_option(args, '--limit', DEFAULT_ISSUE_LIMIT))
+        issues = _load('issues.json')
+        if state != 'ALL':
+            issues = [issue for issue in issues if issue['state'] == state]
+        return [_select(issue, fields) for issue in issues[:limit]]
+    if action == 'view':
+        _log_call('issue view')
+        path = _path('issues', f'{args[1]}.json')
+        if not os.path.exists(path):
+            _fail(f"GraphQL: Could not resolve to an issue or pull request with the number of {args[1]}. (repository.issue)")
+        fields = _option(args, '--json', 'number,title').split(',')
+        return _select(_load('issues', f'{args[1]}.json'), fields)
+    if action == 'create':
+        _log_call('issue create')
+        sys.stdout.write(f"https://github.com/{repo}/issues/{_next_issue_number()}\n")
+        return None
+    if action == 'edit':
+        _log_call('issue edit')
+        if not os.path.exists(_path('issues', f'{args[1]}.json')):
+            _fail(f"GraphQL: Could not resolve to an issue or pull request with the number of {args[1]}. (repository.issue)")
+        sys.stdout.write(f"https://github.com/{repo}/issues/{args[1]}\n")
+        return None
+    _fail(f"fake gh: unsupported issue command: {action}")
+
+
+def project_command(args):
+    action = args[0]
+    _log_call(f'project {action}')
+    if action == 'item-list':
+        limit = int(_option(args, '--limit', 30))
+        items = []
+        for node in _project_nodes():
+            if node.get('isArchived'):
+                continue
+            content = node.get('content') or {}
+            items.append({
+                'id': node['id'],
+                'title': content.get('title', ''),
+                'status': (node.get('status') or {}).get('name', ''),
+                'content': {
+                    'type': content.get('__typename'),
+                    'title': content.get('title', ''),
+                    'body': content.get('body', ''),
+                    'number': content.get('number'),
+                },
+            })
+        return {'items': items[:limit], 'totalCount': len(items)}
+    if action == 'item-create':
+        return {'id': _new_item_id(), 'title': _option(args, '--title', '')}
+    if action == 'item-add':
+        url = _option(args, '--url', '')
+        return {'id': _new_item_id(), 'title': f"Issue {url.rsplit('/', 1)[-1]}"}
+    if action in ('item-edit', 'item-archive'):
+        return {'id': _option(args, '--id')}
+    _fail(f"fake gh: unsupported project command: {action}")
+
+
+def _graphql_variables(args):
+    variables = {}
+    for flag, value in zip(args, args[1:]):
+        if flag not in ('-f', '-F'):
+            continue
+        name, _, raw = value.partition('=')
+        if flag == '-F' and raw.lstrip('-').isdigit():
+            raw = int(raw)
+        elif flag == '-F' and raw in ('true', 'false'):
+            raw = raw == 'true'
+        variables[name] = raw
+    return variables
+
+
+def _mutation_result(field, variables, prefix):
+    if field == 'addProjectV2DraftIssue':
+        return {'projectItem': {'id': _new_item_id()}}
+    if field == 'addProjectV2ItemById':
+        return {'item': {'id': _new_item_id()}}
+    if field == 'updateProjectV2DraftIssue':
+        return {'draftIssue': {'id': variables.get(f'{prefix}draftIssueId')}}
+    if field == 'updateProjectV2ItemFieldValue':
+        return {'projectV2Item': {'id': variables.get(f'{prefix}itemId')}}
+    return {'item': {'id': variables.get(f'{prefix}itemId')}}
+
+
+def _matches_filter(node, search):
+    """The subset of Project filter syntax the sync sends: status:"A","B" and updated:<YYYY-MM-DD."""
+    for term in STATUS_TERM.findall(search):
+        statuses = [value.strip('"') for value in term.split(',')]
+        if (node.get('status') or {}).get('name') not in statuses:
+            return False
+    for date in UPDATED_BEFORE_TERM.findall(search):
+        if (node.get('updatedAt') or '')[:10] >= date:
+            return False
+    return True
+
+
+def _filtered_items_page(variables):
+    nodes = [node for node in _project_nodes() if _matches_filter(node, variables.get('filter', ''))]
+    start = int(variables.get('cursor') or 0)
+    page = nodes[start:start + 100]
+    has_next = start + 100 < len(nodes)
+    return {'data': {
+        'rateLimit': {'cost': 1, 'remaining': 4999, 'resetAt': '2099-01-01T00:00:00Z'},
+        'node': {'items': {
+            'pageInfo': {'hasNextPage': has_next, 'endCursor': str(start + 100) if has_next else None},
+            'nodes': page,
+        }},
+    }}
+
+
+def _matches_search(issue, search):
+    """The issue search qualifiers the sync sends: is:open/closed, "phrase" in:body, created/updated:>=."""
+    if 'is:open' in search and issue['state'] != 'OPEN':
+        return False
+    if 'is:closed' in search and issue['state'] != 'CLOSED':
+        return False
+    for phrase in SEARCH_PHRASE.findall(search):
+        if phrase not in (issue.get('body') or ''):
+            return False
+    for field, value in SEARCH_DATE_TERM.findall(search):
+        if (issue.get(f'{field}At') or '') < value:
+            return False
+    return True
+
+
+def _search_page(variables):
+    search = variables.get('searchQuery', '')
+    issues = sorted((issue for issue in _load('issues.json') if _matches_search(issue, search)),
+                    key=lambda issue: (issue.get('createdAt') or '', issue['number']))
+    reachable = issues[:SEARCH_RESULT_LIMIT]
+    start = int(variables.get('cursor') or 0)
+    page = reachable[start:start + 100]
+    has_next = start + 100 < len(reachable)
+    return {'data': {
+        'rateLimit': {'cost': 1, 'remaining': 4999, 'resetAt': '2099-01-01T00:00:00Z'},
+        'search': {
+            'issueCount': len(issues),
+            'pageInfo': {'hasNextPage': has_next, 'endCursor': str(start + 100) if has_next else None},
+            'nodes': [_select(issue, ['number', 'state', 'body', 'createdAt']) for issue in page],
+        },
+    }}
+
+
+def graphql_command(args):
+    variables = _graphql_variables(args)
+    query = variables.pop('query', '')
+    if query.lstrip().startswith('mutation'):
+        _log_call('api graphql mutation')
+        data = {}
+        for alias, field in MUTATION_FIELD_PATTERN.findall(query):
+            prefix = f'{alias}_' if alias else ''
+            data[alias or field] = _mutation_result(field, variables, prefix)
+        return {'data': data}
+
+    _log_call('api graphql query')
+    if 'search(type: ISSUE' in query:
+        return _search_page(variables)
+    if 'query: $filter' in query:
+        return _filtered_items_page(variables)
+    if 'items(first: 100' in query:
+        meta = _load('project_meta.json')
+        page = int(variables.get('cursor') or 0)
+        nodes = _load('project_pages', f'{page}.json') if page < meta['pages'] else []
+        has_next = page + 1 < meta['pages']
+        return {'data': {
+            'rateLimit': {'cost': 1, 'remaining': 4999, 'resetAt': '2099-01-01T00:00:00Z'},
+            'node': {'items': {
+                'pageInfo': {'hasNextPage': has_next, 'endCursor': str(page + 1) if has_next else None},
+                'nodes': nodes,
+            }},
+        }}
+    if 'repository(owner: $owner, name: $name)' in query:
+        repository = {}
+        errors = []
+        for alias, number in ISSUE_FIELD_PATTERN.findall(query):
+            path = _path('issues', f'{number}.json')
+            if os.path.exists(path):
+                repository[alias] = _select(_load('issues', f'{number}.json'), ['number', 'body', 'state'])
+            else:
+                repository[alias] = None
+                errors.append({'type': 'NOT_FOUND', 'path': ['repository', alias],
+                               'message': f"Could not resolve to an Issue with the number of {number}."})
+        response = {'data': {'repository': repository}}
+        if errors:
+            response['errors'] = errors
+        return response
+    if 'node(id: $itemId)' in query:
+        item_id = variables.get('itemId')
+        node = next((node for node in _project_nodes() if node['id'] == item_id), None)
+        return {'data': {'node': node}}
+    _fail(f"fake gh: unsupported GraphQL query: {query[:200]}")
+
+
+def main(argv):
+    if not FIXTURES:
+        _fail("fake gh: FAKE_GH_FIXTURES is not set")
+    if len(argv) >= 2 and argv[0] == 'issue':
+        output = issue_command(argv[1:])
+    elif len(argv) >= 2 and argv[0] == 'project':
+        output = project_command(argv[1:])
+    elif argv[:2] == ['api', 'graphql']:
+        output = graphql_command(argv[2:])
+    else:
+        _fail(f"fake gh: unsupported command: {' '.join(argv[:3])}")
+    if output is not None:
+        json.dump(output, sys.stdout, ensure_ascii=False)
+        sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,354 @@
+"""
+In-process GitHub API client for the sync scripts.
+
+Talks to the GraphQL and REST endpoints over one pooled keep-alive
+requests.Session, so a run with hundreds of operations pays for a single
+TLS handshake instead of one `gh` process (and auth lookup) per call.
+"""
+import os
+import re
+import copy
+import json
+import logging
+import subprocess
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+GITHUB_API_URL = 'https://api.github.com'
+
+# How gh reports a request GitHub answered with an error (as opposed to never reaching it)
+GH_REJECTION_PATTERN = re.compile(r'HTTP 4\d\d|GraphQL: ')
+
+
+class GitHubClientError(Exception):
+    """Raised for HTTP errors and GraphQL error payloads returned by GitHub."""
+
+    def __init__(self, message, status=None, response=None, errors=None):
+        super().__init__(message)
+        self.status = status
+        self.response = response
+        self.errors = errors or []
+
+
+def is_rejection(error):
+    """
+    Whether a failed write was definitely refused by GitHub: an HTTP 4xx or GraphQL error
+    from the client, or gh reporting one. Timeouts, connection errors and 5xx responses
+    may have been applied and are not rejections.
+    """
+    if isinstance(error, GitHubClientError):
+        return error.status is not None and error.status < 500
+    if not isinstance(error, subprocess.CalledProcessError):
+        return False
+    stderr = str(error.stderr or '')
+    if re.search(r'HTTP 5\d\d', stderr):
+        return False
+    if GH_REJECTION_PATTERN.search(stderr):
+        return True
+    # gh exits non-zero on GraphQL errors and prints the error payload
+    try:
+        return bool(json.loads(error.stdout or '').get('errors'))
+    except (ValueError, AttributeError):
+        return False
+
+
+class GitHubClient:
+    def __init__(self, token=None, api_url=GITHUB_API_URL, timeout=30, pool_size=10, scheduler=None, cache=None):
+        self.token = token or os.environ.get('GITHUB_TOKEN') or os.environ.get('GH_TOKEN')
+        if not self.token:
+            raise GitHubClientError("GITHUB_TOKEN or GH_TOKEN environment variable is required for the HTTP backend")
+        self.api_url = api_url.rstrip('/')
+        self.timeout = timeout
+        # Optional RateLimitScheduler; every request is paced and retried through it
+        self.scheduler = scheduler
+        # Optional ConditionalRequestCache; REST GETs are revalidated with ETag / Last-Modified
+        self.cache = cache
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'Authorization': f'Bearer {self.token}',
+            'Accept': 'application/vnd.github+json',
+            'X-GitHub-Api-Version': '2022-11-28',
+            'User-Agent': 'phantom-sync',
+        })
+
+    def with_scheduler(self, scheduler):
+        """A client sharing this one's pooled session but paced through `scheduler`."""
+        client = copy.copy(self)
+        client.scheduler = scheduler
+        return client
+
+    def _url(self, path):
+        if path.startswith('http://') or path.startswith('https://'):
+            return path
+        return f"{self.api_url}/{path.lstrip('/')}"
+
+    def _scheduled(self, fn):
+        if self.scheduler is None:
+            return fn()
+        return self.scheduler.call('github', fn)
+
+    def request(self, method, path, params=None, json_body=None, headers=None):
+        """Send a request and return the requests.Response; raises GitHubClientError on HTTP errors."""
+        return self._scheduled(lambda: self._send(method, path, params, json_body, headers))
+
+    def _send(self, method, path, params=None, json_body=None, headers=None):
+        response = self.session.request(
+            method,
+            self._url(path),
+            params=params,
+            json=json_body,
+            headers=headers,
+            timeout=self.timeout,
+        )
+        if self.scheduler is not None:
+            self.scheduler.observe_github_headers(response.headers)
+            self.scheduler.record_bytes('github', len(response.content))
+        if response.status_code >= 400:
+            try:
+                message = response.json().get('message', response.text)
+            except ValueError:
+                message = response.text
+            raise GitHubClientError(
+                f"{method} {path} failed with HTTP {response.status_code}: {message}",
+                status=response.status_code,
+                response=response,
+            )
+        return response
+
+    def rest(self, method, path, params=None, json_body=None):
+        """REST call returning the decoded JSON body (None for empty responses)."""
+        if method == 'GET' and self.cache is not None:
+            return self._scheduled(lambda: self._get_conditional(path, params))[0]
+        response = self.request(method, path, params=params, json_body=json_body)
+        if not response.content:
+            return None
+        return response.json()
+
+    def _get_conditional(self, path, params=None):
+        """
+        GET through the cache: a stored copy is revalidated with If-None-Match / If-Modified-Since
+        and served on 304. Returns (decoded body, next page URL).
+        """
+        url = self._url(path)
+        cached = self.cache.get(url, params)
+        headers = {}
+        if cached and cached['etag']:
+            headers['If-None-Match'] = cached['etag']
+        if cached and cached['last_modified']:
+            headers['If-Modified-Since'] = cached['last_modified']
+        response = self._send('GET', url, params=params, headers=headers or None)
+        if response.status_code == 304 and cached:
+            self.cache.touch(url, params)
+            if self.scheduler is not None:
+                self.scheduler.record_cache_hit('github')
+            return (json.loads(cached['body']) if cached['body'] else None), cached['next_url']
+
+        body = response.json() if response.content else None
+        next_url = response.links.get('next', {}).get('url')
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            self.cache.store(url, params, etag, last_modified, response.text if response.content else None, next_url)
+        return body, next_url
+
+    def paginate(self, path, params=None, limit=None):
+        """Follow `Link: rel="next"` headers and return the concatenated list results."""
+        results = []
+        url = path
+        page_params = dict(params or {})
+        page_params.setdefault('per_page', 100)
+        while url:
+            if self.cache is not None:
+                page, next_url = self._scheduled(lambda: self._get_conditional(url, page_params))
+            else:
+                response = self.request('GET', url, params=page_params)
+                page, next_url = response.json(), response.links.get('next', {}).get('url')
+            results.extend(page or [])
+            if limit and len(results) >= limit:
+                return results[:limit]
+            url = next_url
+            # The next link already carries the query string
+            page_params = None
+        return results
+
+    def graphql(self, query, variables=None, allow_partial=False):
+        """
+        Run a GraphQL document and return the full payload ({'data': ..., 'errors': ...}),
+        matching what `gh api graphql` prints. Error payloads raise unless allow_partial is set.
+        """
+        return self._scheduled(lambda: self._graphql_once(query, variables, allow_partial))
+
+    def _graphql_once(self, query, variables, allow_partial):
+        response = self._send('POST', 'graphql', json_body={'query': query, 'variables': variables or {}})
+        payload = response.json()
+        errors = payload.get('errors')
+        if errors and not (allow_partial and payload.get('data')):
+            messages = '; '.join(e.get('message', str(e)) for e in errors)
+            raise GitHubClientError(f"GraphQL error: {messages}", status=response.status_code,
+                                    response=response, errors=errors)
+        return payload
+
+    def close(self):
+        self.session.close()
+
+
+class PendingMutation:
+    """A queued mutation; result/error are filled in when its batch is flushed."""
+
+    def __init__(self, field, inputs, input_shape, selection, key=None):
+        self.field = field
+        self.inputs = inputs
+        self.input_shape = input_shape
+        self.selection = selection
+        self.key = key
+        self.result = None
+        self.error = None
+        # The exception that failed the whole batch, if one did
+        self.exception = None
+        # True when the batch failed in transit, so GitHub may have applied it anyway
+        self.uncertain = False
+        self.done = False
+
+    @property
+    def ok(self):
+        return self.done and self.error is None
+
+
+class ProjectMutationBatcher:
+    """
+    Queue Project v2 mutations and flush them as aliased multi-mutation GraphQL documents
+    (`m0: addProjectV2DraftIssue(...) m1: ...`), batch_size operations per request.
+
+    `graphql` is any callable (query, variables, allow_partial=True) -> payload, so the
+    batcher works with both the gh CLI and the HTTP backend. Results are reported per
+    operation on the PendingMutation objects returned by the queue methods.
+    `map_chunks(send, chunks)` may send the chunk documents concurrently; by default they
+    go out one after another.
+    """
+
+    def __init__(self, graphql, batch_size=50, map_chunks=None):
+        self._graphql = graphql
+        self.batch_size = max(1, int(batch_size))
+        self._map_chunks = map_chunks or (lambda send, chunks: [send(chunk) for chunk in chunks])
+        self._pending = []
+        self.request_count = 0
+
+    def __len__(self):
+        return len(self._pending)
+
+    def _queue(self, field, inputs, input_shape, selection, key):
+        mutation = PendingMutation(field, inputs, input_shape, selection, key=key)
+        self._pending.append(mutation)
+        return mutation
+
+    def add_draft(self, project_id, title, body, key=None):
+        return self._queue(
+            'addProjectV2DraftIssue',
+            {'projectId': ('ID!', project_id), 'title': ('String!', title), 'body': ('String', body)},
+            {'projectId': 'projectId', 'title': 'title', 'body': 'body'},
+            'projectItem { id }',
+            key,
+        )
+
+    def update_draft(self, draft_issue_id, title, body, key=None):
+        return self._queue(
+            'updateProjectV2DraftIssue',
+            {'draftIssueId': ('ID!', draft_issue_id), 'title': ('String', title), 'body': ('String', body)},
+            {'draftIssueId': 'draftIssueId', 'title': 'title', 'body': 'body'},
+            'draftIssue { id }',
+            key,
+        )
+
+    def set_single_select(self, project_id, item_id, field_id, option_id, key=None):
+        return self._queue(
+            'updateProjectV2ItemFieldValue',
+            {'projectId': ('ID!', project_id), 'itemId': ('ID!', item_id),
+             'fieldId': ('ID!', field_id), 'optionId': ('String!', option_id)},
+            {'projectId': 'projectId', 'itemId': 'itemId', 'fieldId': 'fieldId',
+             'value': {'singleSelectOptionId': 'optionId'}},
+            'projectV2Item { id }',
+            key,
+        )
+
+    def archive(self, project_id, item_id, key=None):
+        return self._queue(
+            'archiveProjectV2Item',
+            {'projectId': ('ID!', project_id), 'itemId': ('ID!', item_id)},
+            {'projectId': 'projectId', 'itemId': 'itemId'},
+            'item { id }',
+            key,
+        )
+
+    @staticmethod
+    def _render_input(shape, prefix):
+        parts = []
+        for name, value in shape.items():
+            if isinstance(value, dict):
+                parts.append(f"{name}: {ProjectMutationBatcher._render_input(value, prefix)}")
+            else:
+                parts.append(f"{name}: ${prefix}{value}")
+        return '{' + ', '.join(parts) + '}'
+
+    def _build_document(self, chunk):
+        definitions = []
+        selections = []
+        variables = {}
+        for index, mutation in enumerate(chunk):
+            alias = f"m{index}"
+            prefix = f"{alias}_"
+            for name, (gql_type, value) in mutation.inputs.items():
+                definitions.append(f"${prefix}{name}: {gql_type}")
+                variables[f"{prefix}{name}"] = value
+            rendered = self._render_input(mutation.input_shape, prefix)
+            selections.append(f"  {alias}: {mutation.field}(input: {rendered}) {{ {mutation.selection} }}")
+        document = f"mutation({', '.join(definitions)}) {{\n" + "\n".join(selections) + "\n}"
+        return document, variables
+
+    def _send_chunk(self, chunk):
+        document, variables = self._build_document(chunk)
+        self.request_count += 1
+        try:
+            payload = self._graphql(document, variables, allow_partial=True) or {}
+        except Exception as e:
+            uncertain = not is_rejection(e)
+            for mutation in chunk:
+                mutation.error = str(e)
+                mutation.exception = e
+                mutation.uncertain = uncertain
+                mutation.done = True
+            logger.error(f"Mutation batch of {len(chunk)} failed: {e}")
+            return
+
+        data = payload.get('data') or {}
+        errors_by_alias = {}
+        unscoped_errors = []
+        for error in payload.get('errors') or []:
+            path = error.get('path') or []
+            if path:
+                errors_by_alias.setdefault(path[0], []).append(error.get('message', str(error)))
+            else:
+                unscoped_errors.append(error.get('message', str(error)))
+
+        for index, mutation in enumerate(chunk):
+            alias = f"m{index}"
+            mutation.done = True
+            if alias in errors_by_alias:
+                mutation.error = '; '.join(errors_by_alias[alias])
+            elif data.get(alias) is None:
+                mutation.error = '; '.join(unscoped_errors) or 'No data returned'
+            else:
+                mutation.result = data[alias]
+
+    def flush(self):
+        """Send every queued mutation; returns the flushed PendingMutation list."""
+        flushed, self._pending = self._pending, []
+        chunks = [flushed[start:start + self.batch_size] for start in range(0, len(flushed), self.batch_size)]
+        self._map_chunks(self._send_chunk, chunks)
+        return flushed
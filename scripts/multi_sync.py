@@ -0,0 +1,128 @@
+"""
+Multi-target runner for the Google Tasks sync.
+
+Reads a JSON config listing several (owner, repo, project, tasklist filter)
+targets and syncs them concurrently in one process, so several boards share
+one set of credentials, one pooled GitHub session and one rate budget instead
+of each cron job cold-starting its own. Results and metrics are reported per
+target; one failing target does not stop the others.
+
+    {
+      "defaults": {"create_issues": false},
+      "targets": [
+        {
+          "name": "work",
+          "owner": "octocat",
+          "repo": "tasks",
+          "project": {"id": "PVT_...", "number": 1, "status_field_id": "PVTSSF_...",
+                      "todo_option_id": "...", "in_progress_option_id": "...", "done_option_id": "..."},
+          "tasklists": ["Work", "@default"]
+        }
+      ]
+    }
+"""
+import os
+import re
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+PROJECT_KEYS = {'id', 'number', 'status_field_id', 'todo_option_id', 'in_progress_option_id', 'done_option_id'}
+# Per-target settings a config may give (in "defaults" or on a target)
+TARGET_OPTIONS = {'create_issues', 'incremental', 'full_resync_hours', 'verify_hours'}
+
+
+def load_targets(path):
+    """Parse and validate a multi-target config; returns target dicts with defaults applied."""
+    with open(path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    defaults = config.get('defaults') or {}
+    targets = []
+    seen = set()
+    for index, raw in enumerate(config.get('targets') or []):
+        target = {**defaults, **raw}
+        missing = [key for key in ('owner', 'repo') if not target.get(key)]
+        if missing:
+            raise ValueError(f"Target #{index} in {path} is missing {', '.join(missing)}")
+        target.setdefault('name', f"{target['owner']}-{target['repo']}")
+        if not re.fullmatch(r'[A-Za-z0-9._-]+', target['name']):
+            raise ValueError(f"Target name {target['name']!r} may only use letters, digits, '.', '_' and '-'")
+        if target['name'] in seen:
+            raise ValueError(f"Duplicate target name {target['name']!r} in {path}")
+        seen.add(target['name'])
+        unknown = set(target.get('project') or {}) - PROJECT_KEYS
+        if unknown:
+            raise ValueError(f"Unknown project keys for target {target['name']!r}: {sorted(unknown)}")
+        unknown = set(target) - TARGET_OPTIONS - {'name', 'owner', 'repo', 'project', 'tasklists'}
+        if unknown:
+            raise ValueError(f"Unknown settings for target {target['name']!r}: {sorted(unknown)}")
+        targets.append(target)
+    if not targets:
+        raise ValueError(f"No targets defined in {path}")
+    return targets
+
+
+def target_path(path, name):
+    """Per-target variant of a state file path: memory/x.json -> memory/x.<name>.json."""
+    root, ext = os.path.splitext(path)
+    return f"{root}.{name}{ext}"
+
+
+class TargetResult:
+    def __init__(self, name):
+        self.name = name
+        self.summary = None
+        self.error = None
+        self.metrics = None
+
+    def to_dict(self):
+        result = {'summary': self.summary, 'error': str(self.error) if self.error else None}
+        if self.metrics is not None:
+            result['metrics'] = self.metrics.to_dict()
+        return result
+
+
+def run_targets(targets, engine_factory, max_workers=None):
+    """
+    Build one engine per target with engine_factory(target) and run their syncs concurrently.
+    Engines are built one after another (credential and client setup is not thread-safe).
+    Returns {target name: TargetResult} in config order.
+    """
+    results = {target['name']: TargetResult(target['name']) for target in targets}
+    engines = []
+    for target in targets:
+        try:
+            engines.append((target['name'], engine_factory(target)))
+        except Exception as e:
+            logger.error(f"[{target['name']}] Could not set up sync: {e}", exc_info=True)
+            results[target['name']].error = e
+
+    def run(name, engine):
+        result = results[name]
+        try:
+            logger.info(f"[{name}] Starting sync for {engine.owner}/{engine.repo} (project {engine.PROJECT_ID})")
+            result.summary = engine.sync()
+            logger.info(f"[{name}] Sync finished: {result.summary}")
+        except Exception as e:
+            logger.error(f"[{name}] Sync failed: {e}", exc_info=True)
+            result.error = e
+        finally:
+            result.metrics = engine.metrics
+
+    workers = max(1, min(max_workers or len(engines) or 1, len(engines) or 1))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='sync-target') as executor:
+        for future in [executor.submit(run, name, engine) for name, engine in engines]:
+            future.result()
+    return results
+
+
+def write_results(results, path):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'targets': {name: result.to_dict() for name, result in results.items()}},
+                  f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
@@ -0,0 +1,130 @@
+"""
+Write-ahead journal for the sync's non-idempotent GitHub writes.
+
+Every draft item or issue the sync is about to create is first claimed in a
+SQLite journal under an idempotency key (task ID + operation), and marked
+committed once GitHub confirmed it. A later run, a retry or a concurrent worker
+consults the journal before creating anything:
+
+  - committed: the write already happened; it is not sent again.
+  - in flight: another worker claimed it recently; this one leaves it alone.
+  - uncertain: an earlier attempt never reported back (crash, timeout), so the
+    write may or may not have happened; the caller checks GitHub before
+    sending it again.
+
+Writes that are safe to repeat (status edits, archiving, completing a task)
+are not journaled.
+"""
+import os
+import json
+import uuid
+import socket
+import sqlite3
+import threading
+from datetime import datetime, timezone, timedelta
+
+CLAIMED = 'claimed'
+COMMITTED = 'committed'
+IN_FLIGHT = 'in_flight'
+UNCERTAIN = 'uncertain'
+
+
+class MutationJournal:
+    def __init__(self, path, lease_minutes=30, owner=None):
+        self.path = path
+        # Claims by other workers younger than this are treated as still being worked on
+        self.lease = timedelta(minutes=lease_minutes)
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS mutations (
+                    task_id TEXT NOT NULL,
+                    operation TEXT NOT NULL,
+                    state TEXT NOT NULL,
+                    owner TEXT NOT NULL,
+                    result TEXT,
+                    claimed_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    PRIMARY KEY (task_id, operation)
+                )
+            """)
+
+    @staticmethod
+    def _now():
+        return datetime.now(timezone.utc)
+
+    def claim(self, operation, task_ids):
+        """
+        Claim `operation` for each task ID before sending it.
+        Returns {task_id: (state, result)}; state is one of:
+          CLAIMED    - new claim; send the mutation
+          UNCERTAIN  - claimed, but an earlier attempt may have applied it; verify before sending
+          COMMITTED  - already done (result holds what commit() stored); do not send
+          IN_FLIGHT  - another worker holds a live claim; do not send
+        """
+        now = self._now()
+        stale_before = (now - self.lease).isoformat()
+        claims = {}
+        with self._lock, self._conn:
+            for task_id in task_ids:
+                inserted = self._conn.execute(
+                    "INSERT INTO mutations (task_id, operation, state, owner, claimed_at, updated_at) "
+                    "VALUES (?, ?, 'pending', ?, ?, ?) ON CONFLICT(task_id, operation) DO NOTHING",
+                    (task_id, operation, self.owner, now.isoformat(), now.isoformat())
+                ).rowcount
+                if inserted:
+                    claims[task_id] = (CLAIMED, None)
+                    continue
+                # Take over pending claims left by this worker's earlier attempts or by expired leases
+                taken = self._conn.execute(
+                    "UPDATE mutations SET owner = ?, claimed_at = ?, updated_at = ? "
+                    "WHERE task_id = ? AND operation = ? AND state = 'pending' AND (owner = ? OR claimed_at < ?)",
+                    (self.owner, now.isoformat(), now.isoformat(), task_id, operation, self.owner, stale_before)
+                ).rowcount
+                if taken:
+                    claims[task_id] = (UNCERTAIN, None)
+                    continue
+                row = self._conn.execute(
+                    'SELECT state, result FROM mutations WHERE task_id = ? AND operation = ?', (task_id, operation)
+                ).fetchone()
+                if row['state'] == 'committed':
+                    claims[task_id] = (COMMITTED, json.loads(row['result']) if row['result'] else None)
+                else:
+                    claims[task_id] = (IN_FLIGHT, None)
+        return claims
+
+    def commit(self, operation, task_id, result=None):
+        """Mark a claimed mutation as applied, with what a retry needs to know about it (e.g. the new item ID)."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE mutations SET state = 'committed', result = ?, updated_at = ? "
+                "WHERE task_id = ? AND operation = ?",
+                (json.dumps(result) if result is not None else None, self._now().isoformat(), task_id, operation)
+            )
+
+    def release(self, operation, task_id):
+        """Drop this worker's claim after a definite failure (GitHub rejected it), so it can be retried."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM mutations WHERE task_id = ? AND operation = ? AND state = 'pending' AND owner = ?",
+                (task_id, operation, self.owner)
+            )
+
+    def prune(self, retention_days):
+        """Delete committed entries older than retention_days; returns the number removed."""
+        cutoff = (self._now() - timedelta(days=retention_days)).isoformat()
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM mutations WHERE state = 'committed' AND updated_at < ?", (cutoff,)
+            )
+        return cursor.rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,343 @@
+"""
+Rate-limit-aware scheduling for the sync scripts' GitHub and Google calls.
+
+Every backend call goes through RateLimitScheduler.call(backend, fn), which
+paces requests with a token bucket per backend, caps in-flight calls with an
+adaptive (AIMD) limit, and retries rate-limited calls with jittered backoff,
+honouring Retry-After and GitHub's reported budget/reset time. A throttled
+backend is paused as a whole, since GitHub secondary limits and Google quotas
+apply per user rather than per request.
+"""
+import re
+import copy
+import json
+import time
+import random
+import logging
+import threading
+import subprocess
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+# Requests per second and burst size per backend
+DEFAULT_RATES = {'github': 10.0, 'google': 10.0, 'gmail': 5.0}
+DEFAULT_BURST = {'github': 10, 'google': 20, 'gmail': 5}
+
+GOOGLE_RATE_LIMIT_REASONS = {'rateLimitExceeded', 'userRateLimitExceeded'}
+GH_RATE_LIMIT_PATTERN = re.compile(r'rate limit|HTTP 429|abuse detection', re.IGNORECASE)
+
+# Longest pause accepted from a Retry-After header or rate limit reset time
+MAX_PAUSE_SECONDS = 3600
+
+
+class TokenBucket:
+    def __init__(self, rate, burst, clock=time.monotonic, sleep=time.sleep):
+        self.rate = float(rate)
+        self.burst = max(1.0, float(burst))
+        self._tokens = self.burst
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, sleeping until one is available; returns the time waited."""
+        if self.rate <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            self._sleep(delay)
+            waited += delay
+
+
+class AdaptiveLimiter:
+    """In-flight call limit that halves on throttling and creeps back up on success."""
+
+    def __init__(self, max_limit):
+        self.max_limit = max(1, int(max_limit))
+        self.limit = float(self.max_limit)
+        self._in_flight = 0
+        self._cond = threading.Condition()
+
+    def set_max(self, max_limit):
+        """Move the cap; the adaptive limit is kept (clamped below a lower cap) rather than reset."""
+        with self._cond:
+            self.max_limit = max(1, int(max_limit))
+            self.limit = min(self.limit, float(self.max_limit))
+            self._cond.notify_all()
+
+    def acquire(self):
+        with self._cond:
+            while self._in_flight >= max(1, int(self.limit)):
+                self._cond.wait()
+            self._in_flight += 1
+
+    def release(self, throttled=False):
+        with self._cond:
+            self._in_flight -= 1
+            if throttled:
+                self.limit = max(1.0, self.limit / 2)
+            else:
+                self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+
+def _parse_retry_after(value):
+    """Retry-After is either delta-seconds or an HTTP date."""
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        from email.utils import parsedate_to_datetime
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def _seconds_until(reset_at):
+    """Seconds until a reset time given as epoch seconds or an ISO 8601 timestamp."""
+    if reset_at is None:
+        return None
+    try:
+        reset_epoch = float(reset_at)
+    except (TypeError, ValueError):
+        try:
+            reset_epoch = datetime.fromisoformat(str(reset_at).replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            return None
+    return max(0.0, reset_epoch - time.time())
+
+
+def _google_reasons(exc):
+    try:
+        content = exc.content.decode('utf-8') if isinstance(exc.content, bytes) else exc.content
+        error = json.loads(content).get('error', {})
+    except (AttributeError, ValueError, TypeError):
+        return set()
+    return {e.get('reason') for e in error.get('errors', []) if isinstance(e, dict)}
+
+
+def classify_error(exc):
+    """
+    Return (rate_limited, retry_after_seconds) for an exception raised by a backend call:
+    googleapiclient HttpError, GitHubClientError, or CalledProcessError from the gh CLI.
+    """
+    # googleapiclient.errors.HttpError
+    resp = getattr(exc, 'resp', None)
+    if resp is not None and hasattr(exc, 'content'):
+        status = getattr(resp, 'status', None)
+        retry_after = _parse_retry_after(resp.get('retry-after'))
+        if status == 429 or (status == 403 and _google_reasons(exc) & GOOGLE_RATE_LIMIT_REASONS):
+            return True, retry_after
+        return False, None
+
+    # GitHubClientError (HTTP backend)
+    response = getattr(exc, 'response', None)
+    status = getattr(exc, 'status', None)
+    if status is not None and response is not None:
+        headers = response.headers
+        retry_after = _parse_retry_after(headers.get('Retry-After'))
+        if retry_after is None and headers.get('X-RateLimit-Remaining') == '0':
+            retry_after = _seconds_until(headers.get('X-RateLimit-Reset'))
+        if status == 429 or (status == 403 and (retry_after is not None or GH_RATE_LIMIT_PATTERN.search(str(exc)))):
+            return True, retry_after
+    if any(isinstance(e, dict) and e.get('type') == 'RATE_LIMITED' for e in getattr(exc, 'errors', None) or []):
+        return True, None
+
+    # gh CLI prints the API error on stderr
+    if isinstance(exc, subprocess.CalledProcessError):
+        if GH_RATE_LIMIT_PATTERN.search(f"{exc.stderr or ''}\n{exc.stdout or ''}"):
+            return True, None
+    return False, None
+
+
+class RateLimitScheduler:
+    def __init__(self, rates=None, burst=None, max_retries=5, base_delay=1.0, max_delay=60.0,
+                 concurrency=None, clock=time.monotonic, sleep=time.sleep, metrics=None):
+        rates = {**DEFAULT_RATES, **(rates or {})}
+        burst = {**DEFAULT_BURST, **(burst or {})}
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._buckets = {
+            backend: TokenBucket(rate, burst.get(backend, max(1, rate)), clock=clock, sleep=sleep)
+            for backend, rate in rates.items()
+        }
+        self._limiters = {}
+        self._paused_until = {}
+        self.calls = {}
+        self.retries = {}
+        self.throttled = {}
+        # Optional SyncMetrics receiving every call, retry and response size
+        self.metrics = metrics
+        # Optional sync_profiler.WaitTracker timing every backend call (--profile)
+        self.wait_tracker = None
+        # Views share the limiters of the scheduler they came from and leave its caps alone
+        self._is_view = False
+        for backend, limit in (concurrency or {}).items():
+            self.set_concurrency(backend, limit)
+
+    def view(self, metrics=None):
+        """
+        A scheduler sharing this one's buckets, limits, pauses and counters but reporting to its
+        own metrics, so concurrent sync targets draw on one rate budget with per-target metrics.
+        """
+        scheduler = copy.copy(self)
+        scheduler.metrics = metrics
+        scheduler._is_view = True
+        return scheduler
+
+    def set_concurrency(self, backend, limit):
+        """
+        Upper bound on in-flight calls for a backend (the adaptive limit moves below it).
+        On a view this only sets a cap the root scheduler has not, since every view shares it.
+        """
+        with self._lock:
+            limiter = self._limiters.get(backend)
+            if limiter is None:
+                self._limiters[backend] = AdaptiveLimiter(limit)
+                return
+            if self._is_view:
+                return
+        limiter.set_max(limit)
+
+    def _limiter(self, backend):
+        with self._lock:
+            limiter = self._limiters.get(backend)
+            if limiter is None:
+                limiter = self._limiters[backend] = AdaptiveLimiter(1)
+            return limiter
+
+    def _bucket(self, backend):
+        with self._lock:
+            bucket = self._buckets.get(backend)
+            if bucket is None:
+                bucket = self._buckets[backend] = TokenBucket(
+                    DEFAULT_RATES['github'], DEFAULT_BURST['github'], clock=self._clock, sleep=self._sleep
+                )
+            return bucket
+
+    def _count(self, counter, backend):
+        with self._lock:
+            counter[backend] = counter.get(backend, 0) + 1
+
+    def pause(self, backend, seconds):
+        """Hold every call on the backend for `seconds` (extends, never shortens, a pause)."""
+        seconds = min(max(0.0, seconds), MAX_PAUSE_SECONDS)
+        with self._lock:
+            until = self._clock() + seconds
+            if until > self._paused_until.get(backend, 0):
+                self._paused_until[backend] = until
+
+    def _wait_if_paused(self, backend):
+        while True:
+            with self._lock:
+                remaining = self._paused_until.get(backend, 0) - self._clock()
+            if remaining <= 0:
+                return
+            self._sleep(remaining)
+
+    def backoff_delay(self, attempt, retry_after=None):
+        """Retry-After (plus jitter) when given, otherwise exponential backoff with equal jitter."""
+        if retry_after is not None:
+            return retry_after + random.uniform(0, self.base_delay)
+        cap = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return cap / 2 + random.uniform(0, cap / 2)
+
+    def observe_github_budget(self, remaining, reset_at, cost=1):
+        """Pause GitHub calls until reset_at when the remaining primary budget cannot cover the next call."""
+        try:
+            remaining = int(remaining)
+        except (TypeError, ValueError):
+            return
+        if remaining > max(int(cost or 1), 1):
+            return
+        delay = _seconds_until(reset_at)
+        if delay:
+            logger.warning(f"GitHub rate limit budget exhausted ({remaining} left); pausing {delay:.0f}s until reset")
+            self.pause('github', delay)
+
+    def observe_github_headers(self, headers):
+        self.observe_github_budget(headers.get('X-RateLimit-Remaining'), headers.get('X-RateLimit-Reset'))
+
+    def call(self, backend, fn):
+        """Run fn() under the backend's pacing, concurrency limit and rate-limit retries."""
+        limiter = self._limiter(backend)
+        bucket = self._bucket(backend)
+        attempt = 0
+        while True:
+            queued_at = time.perf_counter()
+            self._wait_if_paused(backend)
+            bucket.acquire()
+            limiter.acquire()
+            self._count(self.calls, backend)
+            if self.metrics is not None:
+                self.metrics.record_call(backend)
+            started_at = time.perf_counter()
+            try:
+                result = fn()
+            except Exception as e:
+                if self.wait_tracker is not None:
+                    self.wait_tracker.record(backend, started_at - queued_at, time.perf_counter() - started_at)
+                rate_limited, retry_after = classify_error(e)
+                limiter.release(throttled=rate_limited)
+                if not rate_limited:
+                    raise
+                self._count(self.throttled, backend)
+                if attempt >= self.max_retries:
+                    logger.error(f"{backend} rate limit persisted after {attempt} retries: {e}")
+                    raise
+                delay = self.backoff_delay(attempt, retry_after)
+                logger.warning(f"{backend} rate limited; retrying in {delay:.1f}s (attempt {attempt + 1}/{self.max_retries})")
+                self.pause(backend, delay)
+                self.record_retry(backend)
+                attempt += 1
+                continue
+            if self.wait_tracker is not None:
+                self.wait_tracker.record(backend, started_at - queued_at, time.perf_counter() - started_at)
+            limiter.release()
+            return result
+
+    def is_rate_limited(self, exc):
+        return classify_error(exc)[0]
+
+    def record_retry(self, backend):
+        """Count a retry (including ones the caller performs itself, e.g. re-sending throttled batch items)."""
+        self._count(self.retries, backend)
+        if self.metrics is not None:
+            self.metrics.record_retry(backend)
+
+    def record_bytes(self, backend, size):
+        if self.metrics is not None:
+            self.metrics.record_bytes(backend, size)
+
+    def record_cache_hit(self, backend):
+        if self.metrics is not None:
+            self.metrics.record_cache_hit(backend)
+
+    def stats(self):
+        with self._lock:
+            return {
+                backend: {
+                    'calls': self.calls.get(backend, 0),
+                    'retries': self.retries.get(backend, 0),
+                    'throttled': self.throttled.get(backend, 0),
+                    'concurrency': int(self._limiters[backend].limit) if backend in self._limiters else None,
+                }
+                for backend in sorted(set(self.calls) | set(self.throttled))
+            }
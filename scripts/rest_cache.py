@@ -0,0 +1,82 @@
+"""
+On-disk conditional request cache for GitHub REST reads.
+
+GET responses are stored with their ETag / Last-Modified validators. The next
+request for the same URL sends If-None-Match / If-Modified-Since, and an
+unchanged resource comes back as a bodiless 304 that GitHub does not count
+against the rate limit; the stored body is served instead. Pagination links
+are stored with each page, so an unchanged multi-page list is walked from
+the cache with one 304 per page.
+"""
+import os
+import sqlite3
+import threading
+from urllib.parse import urlencode
+from datetime import datetime, timezone, timedelta
+
+
+class ConditionalRequestCache:
+    def __init__(self, path, max_age_days=30):
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    body TEXT,
+                    next_url TEXT,
+                    used_at TEXT NOT NULL
+                )
+            """)
+        # Responses no run has asked for in a while (closed issues, old pages) are dropped on open
+        self.prune(max_age_days)
+
+    @staticmethod
+    def _now():
+        return datetime.now(timezone.utc).isoformat()
+
+    @staticmethod
+    def key(url, params=None):
+        if not params:
+            return url
+        return f"{url}?{urlencode(sorted((k, str(v)) for k, v in params.items()))}"
+
+    def get(self, url, params=None):
+        """The stored response for a GET ({'etag', 'last_modified', 'body', 'next_url'}), or None."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT etag, last_modified, body, next_url FROM responses WHERE key = ?', (self.key(url, params),)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def store(self, url, params, etag, last_modified, body, next_url=None):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO responses (key, etag, last_modified, body, next_url, used_at) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET etag = excluded.etag, last_modified = excluded.last_modified, "
+                "body = excluded.body, next_url = excluded.next_url, used_at = excluded.used_at",
+                (self.key(url, params), etag, last_modified, body, next_url, self._now())
+            )
+
+    def touch(self, url, params=None):
+        """Mark a stored response as revalidated (kept by prune)."""
+        with self._lock, self._conn:
+            self._conn.execute('UPDATE responses SET used_at = ? WHERE key = ?', (self._now(), self.key(url, params)))
+
+    def prune(self, max_age_days=30):
+        """Delete responses not used for max_age_days; returns the number removed."""
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=max_age_days)).isoformat()
+        with self._lock, self._conn:
+            cursor = self._conn.execute('DELETE FROM responses WHERE used_at < ?', (cutoff,))
+        return cursor.rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
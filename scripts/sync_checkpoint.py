@@ -0,0 +1,128 @@
+"""
+Step-level checkpoints for the Google Tasks sync.
+
+sync() records each finished step, and within the long per-item steps every
+chunk of items, in a small JSON file. A run killed midway (e.g. by a job
+timeout) can then be resumed with --resume: finished steps are skipped,
+finished items are not processed again, and intermediate results such as
+the task IDs completed from closed issues are restored. The file is removed
+when a run completes.
+"""
+import os
+import json
+import logging
+from datetime import datetime, timezone, timedelta
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 1
+
+
+class SyncCheckpoint:
+    def __init__(self, path, run_key, data=None):
+        self.path = path
+        self.run_key = run_key
+        now = datetime.now(timezone.utc).isoformat()
+        self.data = data or {
+            'version': CHECKPOINT_VERSION,
+            'run_key': run_key,
+            'started_at': now,
+            'updated_at': now,
+            'completed_steps': [],
+            'summary': {},
+            'steps': {},
+            'processed_tasks_from_issues': [],
+        }
+
+    @classmethod
+    def open(cls, path, run_key, resume=False, max_age_hours=6):
+        """
+        Resume the checkpoint at `path` when asked to and it belongs to this run key and was
+        updated within max_age_hours; otherwise start a fresh one.
+        """
+        if resume and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                updated_at = datetime.fromisoformat(data['updated_at'])
+                age = datetime.now(timezone.utc) - updated_at
+                if data.get('version') != CHECKPOINT_VERSION or data.get('run_key') != run_key:
+                    logger.info(f"Checkpoint {path} belongs to another run; starting a fresh sync")
+                elif age > timedelta(hours=max_age_hours):
+                    logger.info(f"Checkpoint {path} is {age} old (max {max_age_hours}h); starting a fresh sync")
+                else:
+                    checkpoint = cls(path, run_key, data)
+                    logger.info(f"Resuming sync from checkpoint {path} "
+                                f"(completed steps: {', '.join(data['completed_steps']) or 'none'})")
+                    return checkpoint
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.warning(f"Could not read checkpoint {path}, starting a fresh sync: {e}")
+        return cls(path, run_key)
+
+    @property
+    def summary(self):
+        return self.data['summary']
+
+    def is_step_done(self, step):
+        return step in self.data['completed_steps']
+
+    def _step(self, step):
+        return self.data['steps'].setdefault(step, {'done': [], 'results': {}})
+
+    def done_keys(self, step):
+        """Item keys a step already finished (for a step that was interrupted midway)."""
+        return set(self.data['steps'].get(step, {}).get('done', []))
+
+    def step_results(self, step):
+        return dict(self.data['steps'].get(step, {}).get('results', {}))
+
+    @property
+    def journal_owner(self):
+        """Mutation journal owner of the run that wrote this checkpoint (taken over by --resume)."""
+        return self.data.get('journal_owner')
+
+    @journal_owner.setter
+    def journal_owner(self, owner):
+        self.data['journal_owner'] = owner
+        self.save()
+
+    @property
+    def processed_tasks_from_issues(self):
+        return set(self.data['processed_tasks_from_issues'])
+
+    def record_items(self, step, keys, results=None, processed_tasks_from_issues=None):
+        """Mark a chunk of a step's items done, with the step's counters so far, and save."""
+        progress = self._step(step)
+        progress['done'].extend(str(key) for key in keys)
+        if results is not None:
+            progress['results'] = dict(results)
+        if processed_tasks_from_issues is not None:
+            self.data['processed_tasks_from_issues'] = sorted(processed_tasks_from_issues)
+        self.save()
+
+    def complete_step(self, step, summary):
+        """Mark a step finished with the run summary so far; its per-item progress is dropped."""
+        if step not in self.data['completed_steps']:
+            self.data['completed_steps'].append(step)
+        self.data['summary'] = dict(summary)
+        self.data['steps'].pop(step, None)
+        self.save()
+
+    def save(self):
+        self.data['updated_at'] = datetime.now(timezone.utc).isoformat()
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save checkpoint {self.path}: {e}")
+
+    def clear(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not remove checkpoint {self.path}: {e}")
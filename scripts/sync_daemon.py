@@ -0,0 +1,104 @@
+"""
+Long-running sync loop for the Google Tasks sync.
+
+Keeps one warm sync engine (credentials, discovery clients, pooled GitHub
+session, link index) and runs it repeatedly instead of cold-starting a
+process per cron tick. The poll interval drops to its minimum as soon as a
+cycle changes something and backs off towards its maximum while idle, so
+propagation latency is seconds when the board is busy without spending more
+API calls when it is not. SIGINT/SIGTERM let the running cycle finish and
+then stop the loop.
+"""
+import signal
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveInterval:
+    """Poll interval: reset to `minimum` after a cycle with changes, multiplied by `backoff` while idle."""
+
+    def __init__(self, minimum=30, maximum=1800, backoff=2.0):
+        self.minimum = max(1.0, float(minimum))
+        self.maximum = max(self.minimum, float(maximum))
+        self.backoff = max(1.0, float(backoff))
+        self.current = self.minimum
+
+    def update(self, changed):
+        if changed:
+            self.current = self.minimum
+        else:
+            self.current = min(self.maximum, self.current * self.backoff)
+        return self.current
+
+
+def summary_has_changes(summary):
+    """True when any step reported a write (created, completed, status set, archived...)."""
+    return any(isinstance(value, (int, float)) and value > 0 for value in (summary or {}).values())
+
+
+class SyncDaemon:
+    def __init__(self, engine, interval=None, on_cycle=None):
+        self.engine = engine
+        self.interval = interval or AdaptiveInterval()
+        # Called with (cycle number, summary or None, error or None) after every cycle
+        self.on_cycle = on_cycle
+        self.cycles = 0
+        self._stop = threading.Event()
+
+    def stop(self, *_):
+        if not self._stop.is_set():
+            logger.info("Shutdown requested; stopping after the current sync cycle")
+        self._stop.set()
+
+    @property
+    def stopped(self):
+        return self._stop.is_set()
+
+    def _install_signal_handlers(self):
+        def handle(signum, frame):
+            self.stop()
+            # A second signal terminates immediately
+            signal.signal(signum, signal.SIG_DFL)
+
+        previous = {}
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            previous[signum] = signal.signal(signum, handle)
+        return previous
+
+    def run_once(self):
+        """Run one sync cycle; returns whether it changed anything. Errors are logged, not raised."""
+        self.cycles += 1
+        summary = error = None
+        try:
+            summary = self.engine.sync()
+        except Exception as e:
+            error = e
+            logger.error(f"Sync cycle {self.cycles} failed: {e}", exc_info=True)
+        if self.on_cycle is not None:
+            try:
+                self.on_cycle(self.cycles, summary, error)
+            except Exception as e:
+                logger.warning(f"Post-cycle hook failed: {e}")
+        return error is None and summary_has_changes(summary)
+
+    def run(self, max_cycles=None, install_signal_handlers=True):
+        """Poll until stopped (or max_cycles cycles ran); returns the number of cycles."""
+        previous = self._install_signal_handlers() if install_signal_handlers else {}
+        logger.info(f"Sync daemon started (poll interval {self.interval.minimum:.0f}s-{self.interval.maximum:.0f}s)")
+        try:
+            while not self.stopped:
+                changed = self.run_once()
+                delay = self.interval.update(changed)
+                if max_cycles is not None and self.cycles >= max_cycles:
+                    break
+                if self.stopped:
+                    break
+                logger.info(f"Cycle {self.cycles} {'changed items' if changed else 'was idle'}; next poll in {delay:.0f}s")
+                self._stop.wait(delay)
+        finally:
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+        logger.info(f"Sync daemon stopped after {self.cycles} cycles")
+        return self.cycles
@@ -6,11 +6,35 @@ import logging
 import sys
 import argparse
 import base64
+import random
+import signal
+import asyncio
+import functools
+import threading
+import uuid
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
+import google_auth_httplib2
+import httplib2
+
+from github_client import GitHubClient, ProjectMutationBatcher, is_rejection
+from task_link_index import TaskLinkIndex
+from rate_limiter import RateLimitScheduler
+from sync_metrics import SyncMetrics, merge_metrics_files, write_json
+from sync_daemon import SyncDaemon, AdaptiveInterval
+from webhook_receiver import WebhookDispatcher, WebhookServer
+from multi_sync import load_targets, run_targets, target_path, write_results
+from sync_checkpoint import SyncCheckpoint
+from mutation_journal import MutationJournal, CLAIMED, COMMITTED, UNCERTAIN
+from rest_cache import ConditionalRequestCache
+from change_events import ChangeEventStream
+from sync_profiler import SyncProfiler
+from sync_shard import parse_shard
 
 # Add path for GoogleWorkspaceSkill
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
@@ -32,6 +56,302 @@ logger = logging.getLogger(__name__)
 # If modifying these SCOPES, delete the file token.json.
 SCOPES = ['https://www.googleapis.com/auth/tasks']
 
+# Google API batch requests accept at most 1000 calls per batch
+GOOGLE_BATCH_LIMIT = 1000
+# tasklists.list / tasks.list page size (the API maximum) and partial-response projections
+# with only the fields the sync reads
+GOOGLE_LIST_PAGE_SIZE = 100
+TASKLIST_FIELDS = 'nextPageToken,items(id,title)'
+TASK_FIELDS = 'nextPageToken,items(id,title,status,updated,notes,due)'
+
+# Draft / issue bodies: the section _build_task_body renders, and the trailers other tools append
+# after it, which survive task edits. Only known trailers end a note: a note line may look like one
+TASK_BODY_HEADER = "## 📋 Task Details"
+FOREIGN_TRAILER = re.compile(r'^(?:Gmail-ID): \S')
+
+# Local sync state (per-tasklist updatedMin watermarks for incremental mode)
+STATE_DIR = os.path.join(BASE_DIR, 'memory')
+SYNC_STATE_FILE = os.path.join(STATE_DIR, 'google_tasks_sync_state.json')
+CHECKPOINT_FILE = os.path.join(STATE_DIR, 'google_tasks_sync_checkpoint.json')
+LINK_INDEX_FILE = os.path.join(STATE_DIR, 'task_links.sqlite3')
+MUTATION_JOURNAL_FILE = os.path.join(STATE_DIR, 'google_tasks_mutation_journal.sqlite3')
+REST_CACHE_FILE = os.path.join(STATE_DIR, 'github_rest_cache.sqlite3')
+PROFILE_DIR = os.path.join(STATE_DIR, 'profiles')
+# Committed journal entries are kept this long; the link index covers the tasks after that
+JOURNAL_RETENTION_DAYS = 7
+
+# Project v2 items with just the fields the sync steps read (status, age, task markers)
+PROJECT_ITEMS_QUERY = """
+query($projectId: ID!, $cursor: String) {
+  rateLimit { cost remaining resetAt }
+  node(id: $projectId) {
+    ... on ProjectV2 {
+      items(first: 100, after: $cursor) {
+        pageInfo { hasNextPage endCursor }
+        nodes {
+          id
+          updatedAt
+          isArchived
+          status: fieldValueByName(name: "Status") {
+            ... on ProjectV2ItemFieldSingleSelectValue { name optionId }
+          }
+          content {
+            __typename
+            ... on DraftIssue { id title body }
+            ... on Issue { id title number }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+# Archive candidates only: the server filters by status and age (`query:`), and only the fields
+# Step 5 reads are selected
+ARCHIVE_CANDIDATES_QUERY = """
+query($projectId: ID!, $cursor: String, $filter: String!) {
+  rateLimit { cost remaining resetAt }
+  node(id: $projectId) {
+    ... on ProjectV2 {
+      items(first: 100, after: $cursor, query: $filter) {
+        pageInfo { hasNextPage endCursor }
+        nodes {
+          id
+          updatedAt
+          isArchived
+          status: fieldValueByName(name: "Status") {
+            ... on ProjectV2ItemFieldSingleSelectValue { name optionId }
+          }
+          content {
+            __typename
+            ... on DraftIssue { title }
+            ... on Issue { title number }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+# One Project v2 item in the same shape as PROJECT_ITEMS_QUERY nodes (webhook per-item path)
+PROJECT_ITEM_QUERY = """
+query($itemId: ID!) {
+  node(id: $itemId) {
+    ... on ProjectV2Item {
+      id
+      updatedAt
+      isArchived
+      status: fieldValueByName(name: "Status") {
+        ... on ProjectV2ItemFieldSingleSelectValue { name optionId }
+      }
+      content {
+        __typename
+        ... on DraftIssue { id title body }
+        ... on Issue { id title number }
+      }
+    }
+  }
+}
+"""
+
+# Issue bodies for many issues in one request; ISSUE_BODY_FIELD is repeated per issue number
+ISSUE_BODIES_QUERY = """
+query($owner: String!, $name: String!) {
+  repository(owner: $owner, name: $name) {
+%s
+  }
+}
+"""
+ISSUE_BODY_FIELD = "    i{number}: issue(number: {number}) {{ number body state }}"
+# Issues per ISSUE_BODIES_QUERY request
+ISSUE_BODIES_PAGE_SIZE = 100
+
+# Issues found by GitHub search, with only the fields the sync reads
+ISSUE_SEARCH_QUERY = """
+query($searchQuery: String!, $cursor: String) {
+  rateLimit { cost remaining resetAt }
+  search(type: ISSUE, query: $searchQuery, first: 100, after: $cursor) {
+    issueCount
+    pageInfo { hasNextPage endCursor }
+    nodes { ... on Issue { number state body createdAt } }
+  }
+}
+"""
+# Search returns at most this many results per query; longer result sets continue with created:>=
+ISSUE_SEARCH_RESULT_LIMIT = 1000
+ISSUE_ORIGIN_MARKER = 'Origin: Google Tasks'
+# The search index lags behind writes, so incremental issue searches start this much before the last run
+ISSUE_SEARCH_OVERLAP = timedelta(minutes=10)
+
+SET_ITEM_STATUS_MUTATION = """
+mutation($projectId: ID!, $itemId: ID!, $fieldId: ID!, $optionId: String!) {
+  updateProjectV2ItemFieldValue(input: {projectId: $projectId, itemId: $itemId, fieldId: $fieldId, value: {singleSelectOptionId: $optionId}}) {
+    projectV2Item { id }
+  }
+}
+"""
+
+ARCHIVE_ITEM_MUTATION = """
+mutation($projectId: ID!, $itemId: ID!) {
+  archiveProjectV2Item(input: {projectId: $projectId, itemId: $itemId}) { item { id } }
+}
+"""
+
+ADD_DRAFT_ITEM_MUTATION = """
+mutation($projectId: ID!, $title: String!, $body: String) {
+  addProjectV2DraftIssue(input: {projectId: $projectId, title: $title, body: $body}) { projectItem { id } }
+}
+"""
+
+ADD_ITEM_BY_ID_MUTATION = """
+mutation($projectId: ID!, $contentId: ID!) {
+  addProjectV2ItemById(input: {projectId: $projectId, contentId: $contentId}) { item { id } }
+}
+"""
+
+
+def load_credentials():
+    """
+    Load credentials from environment variables (CI/CD) or local files (dev).
+    Priority: GOOGLE_TOKEN_BASE64 > token.json > interactive flow
+    """
+    creds = None
+    
+    # 1. Try to load from environment variable (Base64 encoded)
+    env_token = os.environ.get('GOOGLE_TOKEN_BASE64')
+    if env_token:
+        try:
+            token_data = json.loads(base64.b64decode(env_token).decode('utf-8'))
+            creds = Credentials.from_authorized_user_info(token_data, SCOPES)
+            logger.info("Loaded credentials from GOOGLE_TOKEN_BASE64")
+        except Exception as e:
+            logger.error(f"Error loading token from env: {e}", exc_info=True)
+    
+    # 2. Fallback to local file if not loaded from env
+    if not creds and os.path.exists('token.json'):
+        try:
+            creds = Credentials.from_authorized_user_file('token.json', SCOPES)
+            logger.info("Loaded credentials from token.json")
+        except Exception as e:
+            logger.error(f"Error loading token from file: {e}", exc_info=True)
+    
+    # 3. Handle expired or missing credentials
+    if creds and creds.expired and creds.refresh_token:
+        try:
+            creds.refresh(Request())
+            logger.info("Refreshed expired credentials")
+        except Exception as e:
+            logger.warning(f"Error refreshing token: {e}")
+            if os.environ.get('GITHUB_ACTIONS'):
+                logger.error("Token refresh failed in GitHub Actions environment")
+    
+    # 4. Final validation and fallback to interactive flow if possible
+    if not creds or not creds.valid:
+        if os.environ.get('GITHUB_ACTIONS'):
+            if not creds:
+                raise ValueError("No credentials available in GitHub Actions environment. Set GOOGLE_TOKEN_BASE64.")
+            else:
+                logger.warning("Credentials are not valid, but proceeding in GitHub Actions")
+        else:
+            # Only attempt interactive flow if NOT in GitHub Actions
+            logger.info("Attempting interactive authentication flow")
+            
+            # Try to load credentials.json from env or file
+            env_creds = os.environ.get('GOOGLE_CREDENTIALS_BASE64')
+            if env_creds:
+                creds_data = json.loads(base64.b64decode(env_creds).decode('utf-8'))
+                flow = InstalledAppFlow.from_client_config(creds_data, SCOPES)
+            else:
+                if not os.path.exists('credentials.json'):
+                    raise FileNotFoundError("credentials.json not found and GOOGLE_CREDENTIALS_BASE64 not set")
+                flow = InstalledAppFlow.from_client_secrets_file('credentials.json', SCOPES)
+            
+            creds = flow.run_local_server(port=0)
+            
+            # Save to local file for future use
+            with open('token.json', 'w') as token:
+                token.write(creds.to_json())
+            logger.info("Saved new credentials to token.json")
+    
+    return creds
+
+
+class ProjectSnapshot:
+    """
+    Run-scoped view of the Project v2 items, fetched once and shared by all sync steps.
+    Mutations made by the run are applied in place; a step that cannot describe its change
+    calls mark_stale() and the next reader refetches.
+    """
+
+    def __init__(self, loader):
+        self._loader = loader
+        # Steps may record mutations from worker threads (AsyncGoogleTasksSync)
+        self._lock = threading.RLock()
+        self._items = []
+        self._by_id = {}
+        self.stale = True
+        self.fetch_count = 0
+
+    def items(self):
+        with self._lock:
+            if self.stale:
+                self._items = list(self._loader())
+                self._by_id = {item['id']: item for item in self._items if item.get('id')}
+                self.stale = False
+                self.fetch_count += 1
+                logger.info(f"Fetched Project v2 snapshot: {len(self._items)} items")
+            return self._items
+
+    def mark_stale(self):
+        self.stale = True
+
+    def get(self, item_id):
+        self.items()
+        return self._by_id.get(item_id)
+
+    def issue_items(self):
+        """Map issue number -> project item for Issue-backed items."""
+        issue_to_item = {}
+        for item in self.items():
+            content = item.get('content', {})
+            if content.get('type') == 'Issue' and content.get('number'):
+                issue_to_item[int(content['number'])] = item
+        return issue_to_item
+
+    def add(self, item):
+        with self._lock:
+            if self.stale:
+                # The refetch will include the new item
+                return
+            self._items.append(item)
+            self._by_id[item['id']] = item
+
+    def set_status(self, item_id, status_name, option_id):
+        with self._lock:
+            item = self._by_id.get(item_id)
+            if item is None:
+                return
+            item['status'] = status_name
+            item['statusOptionId'] = option_id
+            item['updatedAt'] = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+
+    def set_content(self, item_id, title, body):
+        with self._lock:
+            item = self._by_id.get(item_id)
+            if item is None:
+                return
+            item['title'] = title
+            item['content'] = {**item.get('content', {}), 'title': title, 'body': body}
+
+    def remove(self, item_id):
+        with self._lock:
+            item = self._by_id.pop(item_id, None)
+            if item is not None:
+                self._items.remove(item)
+
+
 class GoogleTasksSync:
     # Project v2 Constants
     PROJECT_ID = 'PVT_kwHOCB_Y0s4BOscH'
@@ -41,7 +361,15 @@ class GoogleTasksSync:
     DONE_OPTION_ID = '67fb16e8'
     DONE_STATUSES = {'Done'}
 
-    def __init__(self, owner="{{GITHUB_USERNAME}}", repo="{{REPO_NAME}}", create_issues=False):
+    def __init__(self, owner="{{GITHUB_USERNAME}}", repo="{{REPO_NAME}}", create_issues=False,
+                 incremental=False, full_resync_hours=24, state_file=SYNC_STATE_FILE,
+                 github_backend='gh', github_client=None, mutation_batch_size=50,
+                 link_index_file=LINK_INDEX_FILE, verify_hours=24, google_batch_size=100,
+                 scheduler=None, service=None, workspace_skill=None, completion_tombstones=True,
+                 tombstone_ttl_hours=None, tombstone_recheck=0.0, creds=None, project=None,
+                 tasklist_filter=None, checkpoint_file=None, checkpoint_every=500, resume=False,
+                 resume_max_age_hours=6, mutation_journal_file=None, journal_lease_minutes=30,
+                 rest_cache_file=None, event_stream=None, shard=None):
         # Validate environment variables
         if not os.environ.get("GITHUB_TOKEN") and not os.environ.get("GH_TOKEN"):
             # Warning only, as we might just want to update a task without GitHub sync
@@ -49,15 +377,87 @@ class GoogleTasksSync:
         
         self.owner = owner
         self.repo = repo
+        # Per-target board (multi-target config): overrides the class-level Project v2 constants
+        project = project or {}
+        self.PROJECT_ID = project.get('id', self.PROJECT_ID)
+        self.STATUS_FIELD_ID = project.get('status_field_id', self.STATUS_FIELD_ID)
+        self.TODO_OPTION_ID = project.get('todo_option_id', self.TODO_OPTION_ID)
+        self.IN_PROGRESS_OPTION_ID = project.get('in_progress_option_id', self.IN_PROGRESS_OPTION_ID)
+        self.DONE_OPTION_ID = project.get('done_option_id', self.DONE_OPTION_ID)
+        self.project_number = str(project['number']) if project.get('number') is not None else None
+        # Tasklist IDs or titles to sync; empty means every tasklist
+        self.tasklist_filter = set(tasklist_filter or [])
         self.create_issues = create_issues
-        self.creds = self.load_credentials()
-        self.service = build('tasks', 'v1', credentials=self.creds)
+        self.incremental = incremental
+        self.full_resync_hours = full_resync_hours
+        self.state_file = state_file
+        self.sync_state = self._load_sync_state()
+        self.snapshot = None
+        # This run's issue search ({'started', 'since', 'ok'}) and failed task completions,
+        # which decide whether the incremental issue watermark may advance
+        self._issue_fetch = None
+        # False after a project item fetch that failed (and returned an empty list)
+        self._project_fetch_ok = None
+        self._completion_failures = 0
+        # Paces and retries every GitHub / Google / Gmail call (token bucket + adaptive concurrency per backend)
+        self.scheduler = scheduler or RateLimitScheduler()
+        self.metrics = SyncMetrics()
+        self.scheduler.metrics = self.metrics
+        # GitHub backend: 'gh' spawns the gh CLI per call, 'http' uses one pooled GitHubClient session
+        # (with REST reads revalidated against the conditional request cache when one is given)
+        self.github = github_client
+        if self.github is None and github_backend == 'http':
+            cache = ConditionalRequestCache(rest_cache_file) if rest_cache_file else None
+            self.github = GitHubClient(scheduler=self.scheduler, cache=cache)
+        elif self.github is not None and getattr(self.github, 'scheduler', None) is None:
+            self.github.scheduler = self.scheduler
+        self.mutation_batch_size = mutation_batch_size
+        # Task ID -> project item / issue / Gmail links; None disables the index (full scan every run)
+        self.link_index = TaskLinkIndex(link_index_file) if link_index_file else None
+        self.verify_hours = verify_hours
+        # (task_id, source) pairs confirmed complete in earlier runs are not re-checked (needs the link index)
+        self.completion_tombstones = completion_tombstones and self.link_index is not None
+        self.tombstone_ttl_hours = tombstone_ttl_hours
+        # Fraction of tombstoned pairs re-checked anyway each run, to catch tasks reopened in Google Tasks
+        self.tombstone_recheck = tombstone_recheck
+        self._tombstones = None
+        # Step checkpoints (None disables them); resume continues a recent interrupted run
+        self.checkpoint_file = checkpoint_file
+        self.checkpoint_every = max(1, int(checkpoint_every))
+        self.resume = resume
+        self.resume_max_age_hours = resume_max_age_hours
+        self.checkpoint = None
+        # Write-ahead journal of draft/issue creations (None disables it)
+        self.journal = (MutationJournal(mutation_journal_file, lease_minutes=journal_lease_minutes)
+                        if mutation_journal_file else None)
+        # Optional ChangeEventStream receiving one NDJSON event per change made or observed
+        self.events = event_stream
+        self.run_id = None
+        # sync_shard.Shard: this worker's share of tasks, issues and project items (None = all of them)
+        self.shard = shard
+        self.google_batch_size = max(1, min(int(google_batch_size), GOOGLE_BATCH_LIMIT))
+        if service is not None:
+            # Injected Tasks service (e.g. the benchmark's in-memory fake): no OAuth flow
+            self.creds = creds
+            self.service = service
+        else:
+            # Shared credentials (multi-target runner) skip the per-engine OAuth flow
+            self.creds = creds or self.load_credentials()
+            self.service = build('tasks', 'v1', credentials=self.creds)
         mode = "issues+project" if self.create_issues else "project-draft-only"
         logger.info(f"Sync mode: {mode}")
+        logger.info(f"GitHub backend: {'http' if self.github is not None else 'gh'}")
+        if self.incremental:
+            logger.info(f"Incremental Google Tasks fetch enabled (full resync every {self.full_resync_hours}h)")
+        if self.shard is not None:
+            logger.info(f"Sharded sync: handling shard {self.shard}"
+                        f"{' (runs the board-wide steps)' if self.shard.is_primary else ''}")
         
         # Initialize GoogleWorkspaceSkill for Gmail processing
         try:
-            if GoogleWorkspaceSkill:
+            if workspace_skill is not None or service is not None:
+                self.workspace_skill = workspace_skill
+            elif GoogleWorkspaceSkill:
                 self.workspace_skill = GoogleWorkspaceSkill()
                 logger.info("Initialized GoogleWorkspaceSkill for Gmail processing")
             else:
@@ -81,7 +481,7 @@ class GoogleTasksSync:
     def _build_task_body(self, task):
         task_id, tasklist_id, notes, gmail_link, link = self._build_task_metadata(task)
         body_lines = [
-            "## 📋 Task Details",
+            TASK_BODY_HEADER,
             "",
             "### Links",
         ]
@@ -94,10 +494,53 @@ class GoogleTasksSync:
             f"Origin: Google Tasks {task_id}",
             f"Tasklist-ID: {tasklist_id}",
             f"System-Link: {link} (Do not click / System use only)",
-            f"Note: {notes}"
         ])
+        if task.get('due'):
+            body_lines.append(f"Due: {task['due'][:10]}")
+        body_lines.append(f"Note: {notes}")
         return "\n".join(body_lines)
 
+    def _merge_task_body(self, current_body, task):
+        """
+        Re-render the section of an existing body that _build_task_body owns (the Task Details
+        header through the Note block) and keep everything else: text before the section and
+        the FOREIGN_TRAILER lines written by other tools, such as `Gmail-ID:`. A note ends at the
+        first of those trailers, so text after them is kept too.
+        """
+        fresh = self._build_task_body(task)
+        lines = (current_body or '').split('\n')
+        start = next((i for i, line in enumerate(lines) if line == TASK_BODY_HEADER), None)
+        if start is None:
+            start = next((i for i, line in enumerate(lines) if line.startswith('Origin: Google Tasks ')), None)
+        if start is None:
+            return fresh
+
+        foreign = []
+        end = len(lines)
+        in_note = False
+        for index in range(start, len(lines)):
+            line = lines[index]
+            if FOREIGN_TRAILER.match(line):
+                if in_note:
+                    end = index
+                    break
+                foreign.append(line)
+            elif line.startswith('Note:'):
+                in_note = True
+        return "\n".join(lines[:start] + [fresh] + foreign + lines[end:])
+
+    def _draft_title(self, task):
+        return f"📝 Phantom Task: {task['title']}"
+
+    def _issue_title(self, task):
+        return f"🐺 Phantom要対応: {task['title']}"
+
+    def _task_content_hash(self, task):
+        """Digest of the task fields rendered into its draft item or issue (title, notes, due)."""
+        content = json.dumps([task.get('title') or '', task.get('notes') or '', task.get('due') or ''],
+                             ensure_ascii=False)
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
     def _extract_task_id_from_text(self, text):
         if not text:
             return None
@@ -168,78 +611,289 @@ class GoogleTasksSync:
 
         return [text for text in candidates if text]
 
-    def load_credentials(self):
+    def _scan_existing_links(self, all_issues, project_items):
         """
-        Load credentials from environment variables (CI/CD) or local files (dev).
-        Priority: GOOGLE_TOKEN_BASE64 > token.json > interactive flow
+        Full regex scan of issue bodies and project items.
+        Returns {task_id: link fields} for every task that already has an issue or item.
         """
-        creds = None
-        
-        # 1. Try to load from environment variable (Base64 encoded)
-        env_token = os.environ.get('GOOGLE_TOKEN_BASE64')
-        if env_token:
-            try:
-                token_data = json.loads(base64.b64decode(env_token).decode('utf-8'))
-                creds = Credentials.from_authorized_user_info(token_data, SCOPES)
-                logger.info("Loaded credentials from GOOGLE_TOKEN_BASE64")
-            except Exception as e:
-                logger.error(f"Error loading token from env: {e}", exc_info=True)
-        
-        # 2. Fallback to local file if not loaded from env
-        if not creds and os.path.exists('token.json'):
-            try:
-                creds = Credentials.from_authorized_user_file('token.json', SCOPES)
-                logger.info("Loaded credentials from token.json")
-            except Exception as e:
-                logger.error(f"Error loading token from file: {e}", exc_info=True)
-        
-        # 3. Handle expired or missing credentials
-        if creds and creds.expired and creds.refresh_token:
-            try:
-                creds.refresh(Request())
-                logger.info("Refreshed expired credentials")
-            except Exception as e:
-                logger.warning(f"Error refreshing token: {e}")
-                if os.environ.get('GITHUB_ACTIONS'):
-                    logger.error("Token refresh failed in GitHub Actions environment")
-        
-        # 4. Final validation and fallback to interactive flow if possible
-        if not creds or not creds.valid:
-            if os.environ.get('GITHUB_ACTIONS'):
-                if not creds:
-                    raise ValueError("No credentials available in GitHub Actions environment. Set GOOGLE_TOKEN_BASE64.")
-                else:
-                    logger.warning("Credentials are not valid, but proceeding in GitHub Actions")
+        links = {}
+        for issue in all_issues:
+            task_id, tasklist_id, gmail_id = self._extract_task_context_from_text(issue.get('body') or '')
+            if task_id:
+                links[task_id] = {
+                    'tasklist_id': tasklist_id,
+                    'issue_number': int(issue['number']),
+                    'gmail_id': gmail_id,
+                }
+        issue_task_ids = {fields['issue_number']: task_id for task_id, fields in links.items()}
+        for item in project_items:
+            content = item.get('content', {})
+            task_id = None
+            tasklist_id = gmail_id = None
+            if isinstance(content, dict) and content.get('type') == 'Issue' and content.get('number'):
+                task_id = issue_task_ids.get(int(content['number']))
+            if not task_id:
+                for text in self._collect_text_candidates_from_project_item(item):
+                    task_id, tasklist_id, gmail_id = self._extract_task_context_from_text(text)
+                    if task_id:
+                        break
+            if task_id:
+                fields = links.setdefault(task_id, {})
+                fields['project_item_id'] = item.get('id')
+                fields.setdefault('tasklist_id', tasklist_id)
+                fields.setdefault('gmail_id', gmail_id)
+        return links
+
+    def _get_existing_task_ids(self, all_issues, project_items):
+        """
+        Task IDs that already have an issue or project item. Served from the link index,
+        with a full body scan (which also refreshes the index) when verification is due.
+        """
+        if self.link_index is not None and not self.link_index.needs_verification(self.verify_hours):
+            existing_task_ids = self.link_index.linked_task_ids()
+            logger.info(f"Loaded {len(existing_task_ids)} linked task IDs from link index")
+            return existing_task_ids
+
+        links = self._scan_existing_links(all_issues, project_items)
+        issues_failed = self._issue_fetch is not None and not self._issue_fetch['ok']
+        if self.link_index is not None and (issues_failed or self._project_fetch_ok is False):
+            # A failed fetch reads as an empty board; verifying against it would clear every link
+            logger.warning("Skipping link index verification: the issue or project item fetch failed")
+            return self.link_index.linked_task_ids() | set(links)
+        if self.link_index is not None:
+            self.link_index.replace_links(links)
+            logger.info(f"Verified link index against GitHub: {len(links)} linked tasks")
+        return set(links)
+
+    def _record_task_link(self, task_id, **fields):
+        if self.link_index is None or not task_id:
+            return
+        try:
+            self.link_index.upsert(task_id, **fields)
+        except Exception as e:
+            logger.warning(f"Could not update link index for task {task_id}: {e}")
+
+    def _load_tombstones(self):
+        if not self.completion_tombstones:
+            return set()
+        try:
+            if self.tombstone_ttl_hours is not None:
+                self.link_index.prune_completions(self.tombstone_ttl_hours)
+            return self.link_index.completed_pairs(self.tombstone_ttl_hours)
+        except Exception as e:
+            logger.warning(f"Could not read completion tombstones: {e}")
+            return set()
+
+    def _is_confirmed_complete(self, task_id, source_ref):
+        """True when (task_id, source_ref) was confirmed complete before and is not sampled for a re-check."""
+        if not self.completion_tombstones or not task_id:
+            return False
+        if self._tombstones is None:
+            self._tombstones = self._load_tombstones()
+        if (task_id, source_ref) not in self._tombstones:
+            return False
+        return not (self.tombstone_recheck and random.random() < self.tombstone_recheck)
+
+    def _issue_confirmed_complete(self, issue_number):
+        if not self.completion_tombstones:
+            return False
+        try:
+            link = self.link_index.find_by_issue(issue_number)
+        except Exception:
+            return False
+        return bool(link) and self._is_confirmed_complete(link['task_id'], f"Issue #{issue_number}")
+
+    def _record_completions(self, confirmed, reopened=()):
+        if not self.completion_tombstones:
+            return
+        try:
+            if reopened:
+                self.link_index.forget_completions(reopened)
+            self.link_index.record_completions(confirmed)
+        except Exception as e:
+            logger.warning(f"Could not update completion tombstones: {e}")
+            return
+        if self._tombstones is not None:
+            self._tombstones.difference_update(reopened)
+            self._tombstones.update(confirmed)
+
+    def _claim_creations(self, operation, tasks, all_issues, project_items, scanned=None):
+        """
+        Claim `operation` ('create_draft' / 'create_issue') for each task in the mutation journal,
+        right before sending them. Returns (tasks to send, tasks held back). Tasks the journal shows
+        as already created are left out; tasks claimed by another worker are held back; tasks whose
+        earlier attempt never reported back are checked against the fetched issues and project
+        items first. `scanned` caches that check across the chunks of one run.
+        """
+        if self.journal is None or not tasks:
+            return tasks, []
+        try:
+            claims = self.journal.claim(operation, [task['id'] for task in tasks])
+        except Exception as e:
+            logger.warning(f"Could not read the mutation journal, creating without it: {e}")
+            return tasks, []
+
+        found = {}
+        if any(state == UNCERTAIN for state, _ in claims.values()):
+            scanned = {} if scanned is None else scanned
+            if 'links' not in scanned:
+                scanned['links'] = self._scan_existing_links(all_issues, project_items)
+            found = scanned['links']
+        to_send = []
+        held_back = []
+        for task in tasks:
+            task_id = task['id']
+            state, result = claims[task_id]
+            if state == CLAIMED:
+                to_send.append(task)
+            elif state == UNCERTAIN and task_id not in found:
+                logger.info(f"Retrying {operation} for task {task_id}: the earlier attempt did not reach GitHub")
+                to_send.append(task)
+            elif state == UNCERTAIN:
+                logger.info(f"Earlier {operation} for task {task_id} did reach GitHub; not sending it again")
+                self._journal_commit(operation, task_id, found[task_id])
+                self._record_task_link(task_id, **found[task_id])
+            elif state == COMMITTED:
+                logger.info(f"Skipping {operation} for task {task_id}: already committed in the mutation journal")
+                self._record_task_link(task_id, **(result or {}))
             else:
-                # Only attempt interactive flow if NOT in GitHub Actions
-                logger.info("Attempting interactive authentication flow")
-                
-                # Try to load credentials.json from env or file
-                env_creds = os.environ.get('GOOGLE_CREDENTIALS_BASE64')
-                if env_creds:
-                    creds_data = json.loads(base64.b64decode(env_creds).decode('utf-8'))
-                    flow = InstalledAppFlow.from_client_config(creds_data, SCOPES)
-                else:
-                    if not os.path.exists('credentials.json'):
-                        raise FileNotFoundError("credentials.json not found and GOOGLE_CREDENTIALS_BASE64 not set")
-                    flow = InstalledAppFlow.from_client_secrets_file('credentials.json', SCOPES)
-                
-                creds = flow.run_local_server(port=0)
-                
-                # Save to local file for future use
-                with open('token.json', 'w') as token:
-                    token.write(creds.to_json())
-                logger.info("Saved new credentials to token.json")
-        
-        return creds
+                logger.info(f"Skipping {operation} for task {task_id}: claimed by another sync worker")
+                held_back.append(task)
+        return to_send, held_back
+
+    def _journal_commit(self, operation, task_id, link_fields):
+        if self.journal is None:
+            return
+        try:
+            self.journal.commit(operation, task_id, {k: v for k, v in link_fields.items() if v is not None})
+        except Exception as e:
+            logger.warning(f"Could not commit {operation} for task {task_id} to the mutation journal: {e}")
+
+    def _journal_release(self, operation, task_id):
+        if self.journal is None:
+            return
+        try:
+            self.journal.release(operation, task_id)
+        except Exception as e:
+            logger.warning(f"Could not release {operation} for task {task_id} in the mutation journal: {e}")
+
+    def _release_if_rejected(self, operation, task_id, error):
+        """
+        Release a creation claim after GitHub definitely rejected the write (HTTP 4xx, GraphQL
+        errors, gh reporting one) so the next run retries it. Timeouts, connection errors and 5xx
+        responses may have been applied and stay claimed for the uncertain-claim check.
+        """
+        if is_rejection(error):
+            self._journal_release(operation, task_id)
+
+    def _owns(self, key):
+        """Whether this worker handles the task ID, issue number or project item ID `key` (--shard)."""
+        return self.shard is None or self.shard.owns(key)
+
+    def _owns_item(self, item):
+        """
+        Project items go with their issue number when they have one, so a closed issue and its
+        Done item land on the same shard and its task is completed once.
+        """
+        content = item.get('content')
+        if isinstance(content, dict) and content.get('type') == 'Issue' and content.get('number'):
+            return self._owns(int(content['number']))
+        return self._owns(item.get('id'))
+
+    def _emit(self, event, **fields):
+        if self.events is None:
+            return
+        try:
+            self.events.emit(event, run_id=self.run_id, repo=f"{self.owner}/{self.repo}",
+                             project_id=self.PROJECT_ID, shard=str(self.shard) if self.shard else None, **fields)
+        except Exception as e:
+            logger.warning(f"Could not write {event} change event: {e}")
+
+    def load_credentials(self):
+        return load_credentials()
+
+    def _iter_google_pages(self, list_method, params):
+        """Yield the items of a Google list call, following nextPageToken GOOGLE_LIST_PAGE_SIZE at a time."""
+        page_token = None
+        while True:
+            page_params = dict(params, maxResults=GOOGLE_LIST_PAGE_SIZE)
+            if page_token:
+                page_params['pageToken'] = page_token
+            results = self._execute_google(list_method(**page_params))
+            yield from results.get('items', [])
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                return
+
+    def iter_task_lists(self):
+        return self._iter_google_pages(self.service.tasklists().list, {'fields': TASKLIST_FIELDS})
 
     def get_task_lists(self):
-        results = self.service.tasklists().list().execute()
-        return results.get('items', [])
+        return list(self.iter_task_lists())
 
-    def get_tasks(self, tasklist_id):
-        results = self.service.tasks().list(tasklist=tasklist_id, showCompleted=True, showHidden=True).execute()
-        return results.get('items', [])
+    def iter_tasks(self, tasklist_id, updated_min=None):
+        params = {'tasklist': tasklist_id, 'showCompleted': True, 'showHidden': True, 'fields': TASK_FIELDS}
+        if updated_min:
+            params['updatedMin'] = updated_min
+        return self._iter_google_pages(self.service.tasks().list, params)
+
+    def get_tasks(self, tasklist_id, updated_min=None):
+        return list(self.iter_tasks(tasklist_id, updated_min=updated_min))
+
+    def _load_sync_state(self):
+        """Load the local sync state file. Missing or broken state means a full sync."""
+        if not os.path.exists(self.state_file):
+            return {}
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            return state if isinstance(state, dict) else {}
+        except Exception as e:
+            logger.warning(f"Could not read sync state {self.state_file}, falling back to full sync: {e}")
+            return {}
+
+    def _save_sync_state(self):
+        try:
+            os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+            tmp_path = f"{self.state_file}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.sync_state, f, indent=2)
+            os.replace(tmp_path, self.state_file)
+        except Exception as e:
+            logger.warning(f"Could not save sync state {self.state_file}: {e}")
+
+    def _get_tasks_updated_min(self, tasklist_id, now):
+        """
+        Return the updatedMin watermark for a tasklist, or None when a full fetch is required
+        (incremental mode off, no watermark yet, or the periodic full resync is due).
+        """
+        if not self.incremental:
+            return None
+        mark = self.sync_state.get('tasklists', {}).get(tasklist_id)
+        if not mark or not mark.get('updated_min') or not mark.get('last_full_sync'):
+            return None
+        try:
+            last_full_sync = datetime.fromisoformat(mark['last_full_sync'])
+        except (ValueError, TypeError):
+            return None
+        if now - last_full_sync >= timedelta(hours=self.full_resync_hours):
+            return None
+        return mark['updated_min']
+
+    def _advance_tasks_watermark(self, tasklist_id, tasks, full_fetch, now):
+        """
+        Move the tasklist watermark to the newest server-side `updated` timestamp seen.
+        Only called when every task in the batch was handled, so failed creations are retried.
+        """
+        tasklists = self.sync_state.setdefault('tasklists', {})
+        mark = tasklists.setdefault(tasklist_id, {})
+        updated_values = [t['updated'] for t in tasks if t.get('updated')]
+        if updated_values:
+            newest = max(updated_values)
+            if not mark.get('updated_min') or newest > mark['updated_min']:
+                mark['updated_min'] = newest
+        if full_fetch:
+            mark['last_full_sync'] = now.isoformat()
 
     def get_open_issues(self):
         command = [
@@ -249,13 +903,9 @@ class GoogleTasksSync:
             '--json', 'number,title,body,labels'
         ]
         try:
-            result = subprocess.run(
-                command, 
-                capture_output=True, 
-                text=True, 
-                timeout=30,
-                check=True
-            )
+            if self.github is not None:
+                return self._list_issues_http('open')
+            result = self._run_gh(command, timeout=30)
             return json.loads(result.stdout)
         except subprocess.TimeoutExpired:
             logger.error(f"Command timeout: {' '.join(command)}")
@@ -275,13 +925,9 @@ class GoogleTasksSync:
             '--json', 'number,title,body,labels'
         ]
         try:
-            result = subprocess.run(
-                command, 
-                capture_output=True, 
-                text=True, 
-                timeout=30,
-                check=True
-            )
+            if self.github is not None:
+                return self._list_issues_http('closed')
+            result = self._run_gh(command, timeout=30)
             return json.loads(result.stdout)
         except subprocess.TimeoutExpired:
             logger.error(f"Command timeout: {' '.join(command)}")
@@ -295,51 +941,152 @@ class GoogleTasksSync:
 
     def get_all_issues(self):
         """
-        Fetch both open and closed issues for robust deduplication and reconciliation.
+        Fetch the issues the sync steps read, narrowed on the server with GitHub search: issues
+        carrying the Google Tasks marker plus open issues (Step 4 adds those to the project).
+        In incremental mode only issues updated since the last run are fetched, until the
+        periodic full resync or a link index verification needs them all.
+        On the http backend with the REST cache, full reads come from the conditional issue
+        listing instead (see list_issues_cached). Returns [{'number', 'state', 'body'}].
         """
-        command = [
-            'gh', 'issue', 'list',
-            '--repo', f"{self.owner}/{self.repo}",
-            '--state', 'all',
-            '--json', 'number,title,body,labels,state,id',
-            '--limit', '1000'
-        ]
+        now = datetime.now(timezone.utc)
+        since = self._get_issues_updated_since(now)
+        self._issue_fetch = {'started': now, 'since': since, 'ok': False}
         try:
-            result = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                timeout=60,
-                check=True
-            )
-            return json.loads(result.stdout)
+            if since:
+                issues = self.search_issues(f"updated:>={since}")
+            elif self.github is not None and self.github.cache is not None:
+                issues = self.list_issues_cached()
+            else:
+                issues = self.search_issues(f'"{ISSUE_ORIGIN_MARKER}" in:body')
+                known = {issue['number'] for issue in issues}
+                issues.extend(issue for issue in self.search_issues('is:open') if issue['number'] not in known)
+            self._issue_fetch['ok'] = True
+            logger.info(f"Fetched {len(issues)} issues" + (f" updated since {since}" if since else ""))
+            return issues
         except subprocess.TimeoutExpired:
-            logger.error(f"Command timeout: {' '.join(command)}")
+            logger.error("Timeout searching issues")
             return []
         except subprocess.CalledProcessError as e:
-            logger.error(f"Error fetching all issues: {e.stderr}", exc_info=True)
+            logger.error(f"Error searching issues: {e.stderr}", exc_info=True)
             return []
         except Exception as e:
-            logger.error(f"Unexpected error fetching all issues: {e}", exc_info=True)
+            logger.error(f"Unexpected error searching issues: {e}", exc_info=True)
             return []
 
+    def list_issues_cached(self):
+        """
+        Full issue read from the REST listing through the conditional request cache, oldest
+        first, so pages of untouched older issues revalidate as free 304s on every later full
+        read (search results cannot be revalidated). Keeps what the full search returns: issues
+        with the Google Tasks marker or open. Incremental reads stay on the narrower search:
+        their `since` bound moves each run, so a listing would never be served from the cache.
+        """
+        params = {'state': 'all', 'sort': 'created', 'direction': 'asc'}
+        issues = []
+        for raw in self.github.paginate(f"repos/{self.owner}/{self.repo}/issues", params):
+            if 'pull_request' in raw:
+                continue
+            issue = self._normalize_rest_issue(raw)
+            if issue['state'] == 'OPEN' or ISSUE_ORIGIN_MARKER in issue['body']:
+                issues.append({'number': issue['number'], 'state': issue['state'], 'body': issue['body']})
+        return issues
+
+    def search_issues(self, terms):
+        """
+        Run a GitHub issue search in this repository and return every match as
+        {'number', 'state', 'body'}. Search stops at 1000 results per query, so results are
+        read oldest first and a full window continues with `created:>=` the last one seen.
+        """
+        issues = {}
+        created_floor = None
+        while True:
+            search_query = f"repo:{self.owner}/{self.repo} is:issue {terms} sort:created-asc"
+            if created_floor:
+                search_query += f" created:>={created_floor}"
+            cursor = None
+            window_count = 0
+            last_created = None
+            while True:
+                data = self._graphql(ISSUE_SEARCH_QUERY, {'searchQuery': search_query, 'cursor': cursor})
+                search = (data.get('data') or {}).get('search') or {}
+                for node in search.get('nodes') or []:
+                    if not node or node.get('number') is None:
+                        continue
+                    window_count += 1
+                    last_created = node.get('createdAt') or last_created
+                    issues[int(node['number'])] = {
+                        'number': int(node['number']),
+                        'state': node.get('state'),
+                        'body': node.get('body') or '',
+                    }
+                page_info = search.get('pageInfo') or {}
+                if not page_info.get('hasNextPage'):
+                    break
+                cursor = page_info.get('endCursor')
+            if (window_count < ISSUE_SEARCH_RESULT_LIMIT or search.get('issueCount', 0) <= window_count
+                    or not last_created or last_created == created_floor):
+                break
+            created_floor = last_created
+        return list(issues.values())
+
+    def _get_issues_updated_since(self, now):
+        """
+        Return the `updated:>=` bound for this run's issue search, or None when every relevant
+        issue is needed (incremental mode off, no watermark yet, full resync or link index
+        verification due).
+        """
+        if not self.incremental:
+            return None
+        if self.link_index is None or self.link_index.needs_verification(self.verify_hours):
+            return None
+        mark = self.sync_state.get('issues') or {}
+        if not mark.get('updated_since') or not mark.get('last_full_sync'):
+            return None
+        try:
+            last_full_sync = datetime.fromisoformat(mark['last_full_sync'])
+        except (ValueError, TypeError):
+            return None
+        if now - last_full_sync >= timedelta(hours=self.full_resync_hours):
+            return None
+        return mark['updated_since']
+
+    def _advance_issues_watermark(self):
+        """
+        After a finished run, let the next incremental issue search start at this run's start
+        (minus the search index lag). Kept in place when the issue search or a completion failed,
+        so those issues are searched again.
+        """
+        fetch = self._issue_fetch
+        if not self.incremental or not fetch or not fetch['ok'] or self._completion_failures:
+            return
+        mark = self.sync_state.setdefault('issues', {})
+        since = fetch['started'] - ISSUE_SEARCH_OVERLAP
+        mark['updated_since'] = since.strftime('%Y-%m-%dT%H:%M:%SZ')
+        if fetch['since'] is None:
+            mark['last_full_sync'] = fetch['started'].isoformat()
+        self._save_sync_state()
+
+    def _note_completion_failure(self, error):
+        # A deleted task (404) will not complete on a retry either
+        if getattr(getattr(error, 'resp', None), 'status', None) != 404:
+            self._completion_failures += 1
+
     def get_all_project_items(self):
         """Get all Project v2 items"""
+        if self.github is not None:
+            # No item-list endpoint outside the gh CLI; GraphQL returns the same normalized shape
+            return self.fetch_project_items()
         command = [
-            'gh', 'project', 'item-list', '{{PROJECT_NUMBER}}',
+            'gh', 'project', 'item-list', self.project_number or '{{PROJECT_NUMBER}}',
             '--owner', self.owner,
             '--format', 'json',
             '--limit', '1000'
         ]
+        self._project_fetch_ok = False
         try:
-            result = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                timeout=60,
-                check=True
-            )
+            result = self._run_gh(command, timeout=60)
             data = json.loads(result.stdout)
+            self._project_fetch_ok = True
             return data.get('items', [])
         except subprocess.TimeoutExpired:
             logger.error(f"Command timeout: {' '.join(command)}")
@@ -351,8 +1098,311 @@ class GoogleTasksSync:
             logger.error(f"Unexpected error fetching project items: {e}", exc_info=True)
             return []
 
+    def fetch_project_items(self):
+        """
+        Fetch all Project v2 items through paginated GraphQL and normalize them to the
+        `gh project item-list` shape, plus updatedAt/isArchived/statusOptionId.
+        """
+        self._project_fetch_ok = False
+        items = []
+        cursor = None
+        while True:
+            try:
+                data = self._graphql(PROJECT_ITEMS_QUERY, {'projectId': self.PROJECT_ID, 'cursor': cursor})
+            except subprocess.TimeoutExpired:
+                logger.error("Timeout fetching project items via GraphQL")
+                return []
+            except subprocess.CalledProcessError as e:
+                logger.error(f"Error fetching project items via GraphQL: {e.stderr}", exc_info=True)
+                return []
+            except Exception as e:
+                logger.error(f"Unexpected error fetching project items via GraphQL: {e}", exc_info=True)
+                return []
+
+            items_data = (data.get('data') or {}).get('node', {}).get('items', {})
+            for node in items_data.get('nodes', []):
+                if node and not node.get('isArchived'):
+                    items.append(self._normalize_project_node(node))
+
+            page_info = items_data.get('pageInfo', {})
+            if page_info.get('hasNextPage'):
+                cursor = page_info.get('endCursor')
+            else:
+                break
+        self._project_fetch_ok = True
+        return items
+
+    def fetch_project_item(self, item_id):
+        """Fetch one Project v2 item by node ID, normalized like fetch_project_items(); None if missing."""
+        if not item_id:
+            return None
+        data = self._graphql(PROJECT_ITEM_QUERY, {'itemId': item_id})
+        node = (data.get('data') or {}).get('node')
+        if not node or not node.get('id'):
+            return None
+        return self._normalize_project_node(node)
+
+    def _normalize_project_node(self, node):
+        content = node.get('content') or {}
+        status = node.get('status') or {}
+        normalized_content = {
+            'type': content.get('__typename'),
+            'id': content.get('id'),
+            'title': content.get('title', ''),
+        }
+        if 'body' in content:
+            normalized_content['body'] = content.get('body') or ''
+        if 'number' in content:
+            normalized_content['number'] = content.get('number')
+        return {
+            'id': node['id'],
+            'title': content.get('title', ''),
+            'status': status.get('name') or '',
+            'statusOptionId': status.get('optionId'),
+            'updatedAt': node.get('updatedAt'),
+            'isArchived': bool(node.get('isArchived')),
+            'content': normalized_content,
+        }
+
+    def _get_project_items(self):
+        """Project items for the current step: the run snapshot if one is active."""
+        if self.snapshot is not None:
+            return self.snapshot.items()
+        return self.get_all_project_items()
+
+    def _record_project_item(self, item_id, content_type, title, body=None, number=None, has_status=True):
+        """Reflect an item created by this run in the snapshot (created items start at Todo)."""
+        if self.snapshot is None:
+            return
+        if not item_id:
+            self.snapshot.mark_stale()
+            return
+        content = {'type': content_type, 'title': title}
+        if body is not None:
+            content['body'] = body
+        if number is not None:
+            content['number'] = int(number)
+        self.snapshot.add({
+            'id': item_id,
+            'title': title,
+            'status': 'Todo' if has_status else '',
+            'statusOptionId': self.TODO_OPTION_ID if has_status else None,
+            'updatedAt': datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
+            'isArchived': False,
+            'content': content,
+        })
+
+    def _get_item_status_option_id(self, item):
+        if item.get('statusOptionId'):
+            return item['statusOptionId']
+        for fv in item.get('fieldValues', {}).get('nodes', []):
+            if fv.get('field', {}).get('id') == self.STATUS_FIELD_ID:
+                return fv.get('singleSelectOptionId')
+        return None
+
+    def _run_gh(self, command, timeout=30):
+        """Run a gh CLI command; raises CalledProcessError/TimeoutExpired like subprocess.run(check=True)."""
+        result = self.scheduler.call('github', lambda: subprocess.run(
+            command, capture_output=True, text=True, timeout=timeout, check=True
+        ))
+        self.scheduler.record_bytes('github', len(result.stdout.encode('utf-8')) if result.stdout else 0)
+        return result
+
+    def _graphql(self, query, variables=None, timeout=60, allow_partial=False):
+        """
+        Run a GraphQL document on the active backend and return the full payload.
+        With allow_partial, a response carrying both data and errors is returned instead of raised.
+        """
+        variables = {k: v for k, v in (variables or {}).items() if v is not None}
+        if self.github is not None:
+            return self._observe_rate_limit(self.github.graphql(query, variables, allow_partial=allow_partial))
+        command = ['gh', 'api', 'graphql', '-f', f'query={query}']
+        for name, value in variables.items():
+            flag = '-F' if isinstance(value, (bool, int)) else '-f'
+            command.extend([flag, f'{name}={value}'])
+        try:
+            result = self._run_gh(command, timeout=timeout)
+        except subprocess.CalledProcessError as e:
+            # gh exits non-zero on GraphQL errors but still prints the response body
+            if allow_partial and e.stdout:
+                try:
+                    payload = json.loads(e.stdout)
+                except ValueError:
+                    raise e
+                if payload.get('data'):
+                    return self._observe_rate_limit(payload)
+            raise
+        return self._observe_rate_limit(json.loads(result.stdout))
+
+    def _observe_rate_limit(self, payload):
+        """Feed a query's `rateLimit { cost remaining resetAt }` into the scheduler; returns the payload."""
+        rate_limit = ((payload or {}).get('data') or {}).get('rateLimit')
+        if rate_limit:
+            self.scheduler.observe_github_budget(rate_limit.get('remaining'), rate_limit.get('resetAt'),
+                                                 rate_limit.get('cost'))
+        return payload
+
+    def _new_batcher(self):
+        return ProjectMutationBatcher(
+            self._graphql,
+            batch_size=self.mutation_batch_size,
+            map_chunks=lambda send, chunks: self._map_io('github', send, chunks)
+        )
+
+    def _list_issues_http(self, state, limit=None):
+        """List repository issues over REST, normalized to the `gh issue list --json` shape."""
+        issues = []
+        for raw in self.github.paginate(f"repos/{self.owner}/{self.repo}/issues", {'state': state}):
+            if 'pull_request' in raw:
+                continue
+            issues.append(self._normalize_rest_issue(raw))
+            if limit and len(issues) >= limit:
+                break
+        return issues
+
+    def _normalize_rest_issue(self, raw):
+        return {
+            'number': raw['number'],
+            'title': raw.get('title', ''),
+            'body': raw.get('body') or '',
+            'labels': [{'name': label.get('name')} for label in raw.get('labels', [])],
+            'state': (raw.get('state') or '').upper(),
+            'id': raw.get('node_id'),
+        }
+
+    def _get_issue(self, issue_number):
+        """Fetch a single issue as {'number', 'body', 'state'}."""
+        if self.github is not None:
+            raw = self.github.rest('GET', f"repos/{self.owner}/{self.repo}/issues/{issue_number}")
+            return self._normalize_rest_issue(raw)
+        command = [
+            'gh', 'issue', 'view', str(issue_number),
+            '--repo', f"{self.owner}/{self.repo}",
+            '--json', 'number,body,state'
+        ]
+        result = self._run_gh(command, timeout=30)
+        return json.loads(result.stdout)
+
+    def _get_issues_bulk(self, issue_numbers, known_issues=None):
+        """
+        Resolve {'number', 'body', 'state'} for many issues: from known_issues (the run's issue
+        list) where possible, the rest with one aliased GraphQL query per 100 issues.
+        Returns {issue_number: issue}; issues that could not be read are left out.
+        """
+        issues = {}
+        for issue in known_issues or []:
+            if issue.get('number') is not None:
+                issues[int(issue['number'])] = issue
+        wanted = sorted({int(number) for number in issue_numbers})
+        missing = [number for number in wanted if number not in issues]
+
+        def fetch_page(numbers):
+            fields = "\n".join(ISSUE_BODY_FIELD.format(number=number) for number in numbers)
+            try:
+                data = self._graphql(ISSUE_BODIES_QUERY % fields, {'owner': self.owner, 'name': self.repo},
+                                     allow_partial=True)
+            except subprocess.TimeoutExpired:
+                logger.error(f"Timeout fetching {len(numbers)} issue bodies")
+                return {}
+            except subprocess.CalledProcessError as e:
+                logger.error(f"Error fetching {len(numbers)} issue bodies: {e.stderr}")
+                return {}
+            except Exception as e:
+                logger.error(f"Unexpected error fetching {len(numbers)} issue bodies: {e}", exc_info=True)
+                return {}
+            repository = (data.get('data') or {}).get('repository') or {}
+            for error in data.get('errors') or []:
+                logger.error(f"Error fetching issue bodies: {error.get('message', error)}")
+            return {int(issue['number']): issue for issue in repository.values() if issue}
+
+        if missing:
+            logger.info(f"Fetching {len(missing)} issue bodies not in the run's issue list")
+            pages = [missing[start:start + ISSUE_BODIES_PAGE_SIZE]
+                     for start in range(0, len(missing), ISSUE_BODIES_PAGE_SIZE)]
+            for fetched in self._map_io('github', fetch_page, pages):
+                issues.update(fetched)
+        return {number: issues[number] for number in wanted if number in issues}
+
+    def _set_item_status(self, item_id, option_id):
+        if self.github is not None:
+            self.github.graphql(SET_ITEM_STATUS_MUTATION, {
+                'projectId': self.PROJECT_ID,
+                'itemId': item_id,
+                'fieldId': self.STATUS_FIELD_ID,
+                'optionId': option_id,
+            })
+            return
+        self._run_gh([
+            'gh', 'project', 'item-edit',
+            '--id', item_id,
+            '--field-id', self.STATUS_FIELD_ID,
+            '--single-select-option-id', option_id,
+            '--project-id', self.PROJECT_ID
+        ], timeout=30)
+
+    def _archive_item(self, item_id):
+        if self.github is not None:
+            self.github.graphql(ARCHIVE_ITEM_MUTATION, {'projectId': self.PROJECT_ID, 'itemId': item_id})
+            return
+        self._run_gh([
+            'gh', 'project', 'item-archive', self.project_number or '1',
+            '--owner', self.owner,
+            '--id', item_id
+        ], timeout=30)
+
+    def _create_draft_item(self, title, body):
+        """Create a draft item and return its project item ID (None if the output had no ID)."""
+        if self.github is not None:
+            payload = self.github.graphql(ADD_DRAFT_ITEM_MUTATION, {
+                'projectId': self.PROJECT_ID, 'title': title, 'body': body
+            })
+            return ((payload.get('data') or {}).get('addProjectV2DraftIssue') or {}).get('projectItem', {}).get('id')
+        command = [
+            'gh', 'project', 'item-create', self.project_number or '1',
+            '--owner', self.owner,
+            '--title', title,
+            '--body', body,
+            '--format', 'json'
+        ]
+        result = self._run_gh(command, timeout=30)
+        try:
+            return json.loads(result.stdout).get('id')
+        except Exception:
+            return None
+
+    def _add_issue_item(self, issue_number):
+        """Add an issue to the project and return (item ID, issue title)."""
+        if self.github is not None:
+            raw = self.github.rest('GET', f"repos/{self.owner}/{self.repo}/issues/{issue_number}")
+            payload = self.github.graphql(ADD_ITEM_BY_ID_MUTATION, {
+                'projectId': self.PROJECT_ID, 'contentId': raw['node_id']
+            })
+            item = ((payload.get('data') or {}).get('addProjectV2ItemById') or {}).get('item') or {}
+            return item.get('id'), raw.get('title', '')
+        add_command = [
+            'gh', 'project', 'item-add', self.project_number or '1',
+            '--owner', self.owner,
+            '--url', f"https://github.com/{self.owner}/{self.repo}/issues/{issue_number}",
+            '--format', 'json'
+        ]
+        add_result = self._run_gh(add_command, timeout=30)
+        add_data = json.loads(add_result.stdout)
+        return add_data.get('id'), add_data.get('title', '')
+
+    def _update_issue(self, issue_number, title, body):
+        if self.github is not None:
+            self.github.rest('PATCH', f"repos/{self.owner}/{self.repo}/issues/{issue_number}",
+                             json_body={'title': title, 'body': body})
+            return
+        self._run_gh([
+            'gh', 'issue', 'edit', str(issue_number),
+            '--repo', f"{self.owner}/{self.repo}",
+            '--title', title,
+            '--body', body
+        ], timeout=30)
+
     def create_issue(self, task):
-        title = f"🐺 Phantom要対応: {task['title']}"
+        title = self._issue_title(task)
         task_id = task['id']
         body = self._build_task_body(task)
 
@@ -364,16 +1414,23 @@ class GoogleTasksSync:
             '--label', 'Status: 🕵️ Infiltration'
         ]
         try:
-            result = subprocess.run(
-                command, 
-                capture_output=True, 
-                text=True, 
-                timeout=30,
-                check=True
-            )
-            issue_url = result.stdout.strip()
+            if self.github is not None:
+                created = self.github.rest('POST', f"repos/{self.owner}/{self.repo}/issues", json_body={
+                    'title': title, 'body': body, 'labels': ['Status: 🕵️ Infiltration']
+                })
+                issue_url = created['html_url']
+            else:
+                result = self._run_gh(command, timeout=30)
+                issue_url = result.stdout.strip()
             issue_number = issue_url.split('/')[-1]
             logger.info(f"Created issue: {issue_url}")
+            _, tasklist_id, gmail_id = self._extract_task_context_from_text(body)
+            self._journal_commit('create_issue', task_id, {'tasklist_id': tasklist_id,
+                                                           'issue_number': int(issue_number), 'gmail_id': gmail_id})
+            self._record_task_link(task_id, tasklist_id=tasklist_id, issue_number=int(issue_number),
+                                   gmail_id=gmail_id, status='needsAction',
+                                   content_hash=self._task_content_hash(task))
+            self._emit('issue_created', task_id=task_id, tasklist_id=tasklist_id, issue_number=int(issue_number))
             
             # Add to Project
             self.add_issue_to_project(issue_number)
@@ -384,47 +1441,32 @@ class GoogleTasksSync:
             return None
         except subprocess.CalledProcessError as e:
             logger.error(f"Error creating issue: {e.stderr}", exc_info=True)
+            self._release_if_rejected('create_issue', task_id, e)
             return None
         except Exception as e:
             logger.error(f"Unexpected error creating issue: {e}", exc_info=True)
+            self._release_if_rejected('create_issue', task_id, e)
             return None
 
     def create_project_draft_item(self, task):
-        title = f"📝 Phantom Task: {task['title']}"
+        title = self._draft_title(task)
         task_id = task['id']
         body = self._build_task_body(task)
-        command = [
-            'gh', 'project', 'item-create', '1',
-            '--owner', self.owner,
-            '--title', title,
-            '--body', body,
-            '--format', 'json'
-        ]
         try:
-            result = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                timeout=30,
-                check=True
-            )
-            item_id = None
-            try:
-                created = json.loads(result.stdout)
-                item_id = created.get('id')
-            except Exception:
-                item_id = None
+            item_id = self._create_draft_item(title, body)
+            _, tasklist_id, gmail_id = self._extract_task_context_from_text(body)
+            self._journal_commit('create_draft', task_id, {'tasklist_id': tasklist_id,
+                                                           'project_item_id': item_id, 'gmail_id': gmail_id})
 
             # Keep board visuals consistent: draft items should also start at Todo (green).
             if item_id:
-                subprocess.run([
-                    'gh', 'project', 'item-edit',
-                    '--id', item_id,
-                    '--field-id', self.STATUS_FIELD_ID,
-                    '--single-select-option-id', self.TODO_OPTION_ID,
-                    '--project-id', self.PROJECT_ID
-                ], capture_output=True, text=True, timeout=30, check=True)
+                self._set_item_status(item_id, self.TODO_OPTION_ID)
 
+            self._record_project_item(item_id, 'DraftIssue', title, body=body)
+            self._record_task_link(task_id, tasklist_id=tasklist_id, project_item_id=item_id,
+                                   gmail_id=gmail_id, status='needsAction',
+                                   content_hash=self._task_content_hash(task))
+            self._emit('draft_created', task_id=task_id, tasklist_id=tasklist_id, item_id=item_id)
             logger.info(f"Created project draft item for task: {task_id}")
             return True
         except subprocess.TimeoutExpired:
@@ -432,48 +1474,204 @@ class GoogleTasksSync:
             return False
         except subprocess.CalledProcessError as e:
             logger.error(f"Error creating project draft item: {e.stderr}", exc_info=True)
+            self._release_if_rejected('create_draft', task_id, e)
             return False
         except Exception as e:
             logger.error(f"Unexpected error creating project draft item: {e}", exc_info=True)
+            self._release_if_rejected('create_draft', task_id, e)
+            return False
+
+    def create_project_draft_items(self, tasks):
+        """
+        Create draft items for many tasks with batched GraphQL mutations: the drafts go out as
+        aliased documents of mutation_batch_size, followed by one batch setting them to Todo.
+        Returns the set of task IDs whose draft item was created.
+        """
+        batcher = self._new_batcher()
+        drafts = []
+        content_hashes = {}
+        for task in tasks:
+            title = self._draft_title(task)
+            body = self._build_task_body(task)
+            content_hashes[task['id']] = self._task_content_hash(task)
+            drafts.append((task['id'], title, body, batcher.add_draft(self.PROJECT_ID, title, body, key=task['id'])))
+        batcher.flush()
+
+        created = set()
+        status_updates = []
+        for task_id, title, body, mutation in drafts:
+            if not mutation.ok:
+                logger.error(f"Error creating project draft item for task {task_id}: {mutation.error}")
+                # A batch lost in transit stays claimed: the next run checks the board before retrying
+                if not mutation.uncertain:
+                    self._journal_release('create_draft', task_id)
+                continue
+            created.add(task_id)
+            item_id = (mutation.result.get('projectItem') or {}).get('id')
+            _, tasklist_id, gmail_id = self._extract_task_context_from_text(body)
+            self._journal_commit('create_draft', task_id, {'tasklist_id': tasklist_id,
+                                                           'project_item_id': item_id, 'gmail_id': gmail_id})
+            # Keep board visuals consistent: draft items should also start at Todo (green).
+            status_mutation = None
+            if item_id:
+                status_mutation = batcher.set_single_select(
+                    self.PROJECT_ID, item_id, self.STATUS_FIELD_ID, self.TODO_OPTION_ID, key=task_id
+                )
+            status_updates.append((task_id, item_id, title, body, status_mutation))
+        batcher.flush()
+
+        for task_id, item_id, title, body, status_mutation in status_updates:
+            has_status = status_mutation is not None and status_mutation.ok
+            if status_mutation is not None and not has_status:
+                logger.error(f"Failed to set Todo status for draft item {item_id}: {status_mutation.error}")
+            self._record_project_item(item_id, 'DraftIssue', title, body=body, has_status=has_status)
+            _, tasklist_id, gmail_id = self._extract_task_context_from_text(body)
+            self._record_task_link(task_id, tasklist_id=tasklist_id, project_item_id=item_id,
+                                   gmail_id=gmail_id, status='needsAction', content_hash=content_hashes[task_id])
+            self._emit('draft_created', task_id=task_id, tasklist_id=tasklist_id, item_id=item_id)
+            logger.info(f"Created project draft item for task: {task_id}")
+        return created
+
+    def propagate_task_edits(self, tasks, all_issues=None):
+        """
+        Rewrite the draft item or issue of linked tasks whose title, notes or due date changed,
+        found by comparing each task's content hash with the one stored in the link index.
+        Only the task-derived section of the body is re-rendered (see _merge_task_body).
+        Links without a stored hash (created before hashes were kept) take the current content
+        as their baseline. Returns ({'updated_drafts': n, 'updated_issues': n}, failed tasks).
+        """
+        counters = {'updated_drafts': 0, 'updated_issues': 0}
+        if self.link_index is None or not tasks:
+            return counters, []
+        try:
+            links = self.link_index.content_links()
+        except Exception as e:
+            logger.warning(f"Could not read content hashes from the link index: {e}")
+            return counters, []
+
+        baseline = {}
+        edited = []
+        for task in tasks:
+            link = links.get(task['id'])
+            if link is None:
+                continue
+            item_id, issue_number, stored_hash = link
+            content_hash = self._task_content_hash(task)
+            if stored_hash == content_hash:
+                continue
+            if stored_hash is None:
+                baseline[task['id']] = content_hash
+            else:
+                edited.append((task, item_id, issue_number, content_hash))
+        if baseline:
+            self._store_content_hashes(baseline)
+            logger.info(f"Recorded content hashes for {len(baseline)} linked tasks")
+        if not edited:
+            return counters, []
+        logger.info(f"Propagating edits of {len(edited)} Google Tasks to their drafts/issues")
+
+        batcher = self._new_batcher()
+        draft_updates = []
+        issue_updates = []
+        failed = []
+        for task, item_id, issue_number, content_hash in edited:
+            if not issue_number and item_id:
+                item = self.snapshot.get(item_id) if self.snapshot is not None else self.fetch_project_item(item_id)
+                content = (item or {}).get('content') or {}
+                if content.get('type') == 'Issue' and content.get('number'):
+                    # The draft was converted to an issue on the board
+                    issue_number = content['number']
+                elif content.get('type') == 'DraftIssue' and content.get('id'):
+                    title = self._draft_title(task)
+                    body = self._merge_task_body(content.get('body'), task)
+                    mutation = batcher.update_draft(content['id'], title, body, key=task['id'])
+                    draft_updates.append((task, item_id, title, body, content_hash, mutation))
+                    continue
+                else:
+                    logger.info(f"Not propagating edit of task {task['id']}: project item {item_id} is gone")
+                    continue
+            issue_updates.append((task, int(issue_number), content_hash))
+        batcher.flush()
+
+        if issue_updates:
+            current = self._get_issues_bulk([number for _, number, _ in issue_updates], known_issues=all_issues)
+            readable = []
+            for task, issue_number, content_hash in issue_updates:
+                if issue_number not in current:
+                    # Rewriting a body we could not read would drop the lines other tools own
+                    logger.error(f"Could not read issue #{issue_number} to update it from task {task['id']}")
+                    failed.append(task)
+                    continue
+                body = self._merge_task_body(current[issue_number].get('body'), task)
+                readable.append((task, issue_number, content_hash, body))
+            issue_updates = readable
+
+        updated_hashes = {}
+        for task, item_id, title, body, content_hash, mutation in draft_updates:
+            if not mutation.ok:
+                logger.error(f"Failed to update draft item {item_id} for task {task['id']}: {mutation.error}")
+                failed.append(task)
+                continue
+            counters['updated_drafts'] += 1
+            updated_hashes[task['id']] = content_hash
+            if self.snapshot is not None:
+                self.snapshot.set_content(item_id, title, body)
+            self._emit('draft_updated', task_id=task['id'], item_id=item_id)
+            logger.info(f"Updated project draft item {item_id} from edited task {task['id']}")
+
+        results = self._map_io('github', self._update_issue_from_task, issue_updates)
+        for (task, issue_number, content_hash, _), ok in zip(issue_updates, results):
+            if not ok:
+                failed.append(task)
+                continue
+            counters['updated_issues'] += 1
+            updated_hashes[task['id']] = content_hash
+            self._emit('issue_updated', task_id=task['id'], issue_number=issue_number)
+
+        self._store_content_hashes(updated_hashes)
+        logger.info(f"Propagated task edits: {counters['updated_drafts']} drafts, {counters['updated_issues']} issues")
+        return counters, failed
+
+    def _update_issue_from_task(self, update):
+        task, issue_number, _, body = update
+        try:
+            self._update_issue(issue_number, self._issue_title(task), body)
+            logger.info(f"Updated issue #{issue_number} from edited task {task['id']}")
+            return True
+        except subprocess.TimeoutExpired:
+            logger.error(f"Timeout updating issue #{issue_number} for task {task['id']}", exc_info=True)
+            return False
+        except subprocess.CalledProcessError as e:
+            logger.error(f"Error updating issue #{issue_number}: {e.stderr}", exc_info=True)
+            return False
+        except Exception as e:
+            logger.error(f"Unexpected error updating issue #{issue_number}: {e}", exc_info=True)
             return False
 
+    def _store_content_hashes(self, hashes):
+        if not hashes:
+            return
+        try:
+            self.link_index.set_content_hashes(hashes)
+        except Exception as e:
+            logger.warning(f"Could not store content hashes in the link index: {e}")
+
     def add_issue_to_project(self, issue_number):
         """Add issue to Project v2 and set status to Todo"""
         try:
             # First, add to project to get item ID
-            add_command = [
-                'gh', 'project', 'item-add', '1',
-                '--owner', self.owner,
-                '--url', f"https://github.com/{self.owner}/{self.repo}/issues/{issue_number}",
-                '--format', 'json'
-            ]
-            add_result = subprocess.run(
-                add_command,
-                capture_output=True, 
-                text=True, 
-                timeout=30,
-                check=True
-            )
-            add_data = json.loads(add_result.stdout)
-            item_id = add_data.get('id')
+            item_id, issue_title = self._add_issue_item(issue_number)
 
             if item_id:
                 logger.info(f"Setting Status to 'Todo' for Project Item ID: {item_id}")
                 
-                edit_command = [
-                    'gh', 'project', 'item-edit', 
-                    '--id', item_id,
-                    '--field-id', self.STATUS_FIELD_ID,
-                    '--single-select-option-id', self.TODO_OPTION_ID,
-                    '--project-id', self.PROJECT_ID
-                ]
-                subprocess.run(
-                    edit_command,
-                    capture_output=True, 
-                    text=True, 
-                    timeout=30,
-                    check=True
-                )
+                self._set_item_status(item_id, self.TODO_OPTION_ID)
+                self._record_project_item(item_id, 'Issue', issue_title, number=issue_number)
+                self._emit('issue_added_to_project', issue_number=int(issue_number), item_id=item_id)
+                if self.link_index is not None:
+                    link = self.link_index.find_by_issue(issue_number)
+                    if link:
+                        self._record_task_link(link['task_id'], project_item_id=item_id)
                 logger.info(f"Successfully set Status to 'Todo' for issue #{issue_number}")
                 return True
         except subprocess.TimeoutExpired:
@@ -484,11 +1682,11 @@ class GoogleTasksSync:
 
     def close_task(self, tasklist_id, task_id):
         try:
-            self.service.tasks().patch(
+            self._execute_google(self.service.tasks().patch(
                 tasklist=tasklist_id,
                 task=task_id,
                 body={'status': 'completed'}
-            ).execute()
+            ))
             logger.info(f"Closed Google Task: {task_id} in list {tasklist_id}")
             return True
         except Exception as e:
@@ -499,21 +1697,22 @@ class GoogleTasksSync:
         """Update a specific task's status"""
         try:
             # First get the task to ensure it exists and get current state
-            task = self.service.tasks().get(tasklist=tasklist_id, task=task_id).execute()
+            task = self._execute_google(self.service.tasks().get(tasklist=tasklist_id, task=task_id))
             
             if task['status'] == status:
                 logger.info(f"Task {task_id} is already {status}")
                 return True
                 
             task['status'] = status
-            self.service.tasks().update(tasklist=tasklist_id, task=task_id, body=task).execute()
+            self._execute_google(self.service.tasks().update(tasklist=tasklist_id, task=task_id, body=task))
             logger.info(f"Task ID {task_id} updated to status: {status}")
+            self._emit('task_status_set', task_id=task_id, tasklist_id=tasklist_id, status=status)
             return True
         except Exception as e:
             logger.error(f"Error updating task {task_id}: {e}")
             return False
 
-    def reconcile_issue_project_consistency(self):
+    def reconcile_issue_project_consistency(self, all_issues=None):
         """
         Ensure consistency between GitHub Issues and Project v2 items.
         1. Add missing Open issues to Project
@@ -522,83 +1721,73 @@ class GoogleTasksSync:
         """
         logger.info("Step 4: Reconciling GitHub Issues ↔ Project v2 consistency...")
         
-        all_issues = self.get_all_issues()
-        if not all_issues:
+        if all_issues is None:
+            all_issues = self.get_all_issues()
+        # An incremental search legitimately finds nothing when no issue changed since the last run
+        incremental_fetch = bool(self._issue_fetch and self._issue_fetch['since'])
+        if not all_issues and not incremental_fetch:
             logger.warning("No issues found to reconcile.")
-            return
+            return {'added_to_project': 0, 'set_done': 0, 'set_todo': 0, 'set_draft_todo': 0}
 
-        project_items = self.get_all_project_items()
+        project_items = self._get_project_items()
+        self.metrics.add_items(len(all_issues))
         
         # Map issue number to project item
-        issue_to_item = {}
-        for item in project_items:
-            content = item.get('content', {})
-            if content.get('type') == 'Issue':
-                number = content.get('number')
-                if number:
-                    issue_to_item[int(number)] = item
-
-        added_to_project = 0
-        set_done = 0
-        set_todo = 0
+        if self.snapshot is not None:
+            issue_to_item = self.snapshot.issue_items()
+        else:
+            issue_to_item = {}
+            for item in project_items:
+                content = item.get('content', {})
+                if content.get('type') == 'Issue':
+                    number = content.get('number')
+                    if number:
+                        issue_to_item[int(number)] = item
+
+        if self._issue_fetch and self._issue_fetch['ok'] and not incremental_fetch:
+            # The full search covers marked and open issues; closed issues on the board without
+            # the marker still need their state to be set Done
+            known = {int(issue['number']) for issue in all_issues}
+            missing = [number for number in issue_to_item if number not in known and self._owns(number)]
+            if missing:
+                all_issues = list(all_issues) + list(self._get_issues_bulk(missing).values())
+
+        issues_to_add = []
+        batcher = self._new_batcher()
+        # (mutation, item_id, status name, option id, counter key, label)
+        status_updates = []
         
         for issue in all_issues:
             issue_number = issue['number']
             issue_state = issue['state'] # OPEN or CLOSED
+            if not self._owns(issue_number):
+                continue
             
             # 1. Open issue not in project -> Add
             if issue_state == 'OPEN' and issue_number not in issue_to_item:
                 logger.info(f"Issue #{issue_number} is OPEN but not in Project. Adding...")
-                if self.add_issue_to_project(issue_number):
-                    added_to_project += 1
+                issues_to_add.append(issue_number)
                 continue
             
             # If item exists in project
             if issue_number in issue_to_item:
                 item = issue_to_item[issue_number]
                 item_id = item['id']
-                current_status_id = None
-                
-                # Get current status option ID
-                for fv in item.get('fieldValues', {}).get('nodes', []):
-                    if fv.get('field', {}).get('id') == self.STATUS_FIELD_ID:
-                        current_status_id = fv.get('singleSelectOptionId')
-                        break
+                current_status_id = self._get_item_status_option_id(item)
                 
                 # 2. Close issue and not Done -> Set Done
                 if issue_state == 'CLOSED' and current_status_id != self.DONE_OPTION_ID:
                     logger.info(f"Issue #{issue_number} is CLOSED but Project Status is not Done. Updating...")
-                    try:
-                        subprocess.run([
-                            'gh', 'project', 'item-edit', 
-                            '--id', item_id,
-                            '--field-id', self.STATUS_FIELD_ID,
-                            '--single-select-option-id', self.DONE_OPTION_ID,
-                            '--project-id', self.PROJECT_ID
-                        ], check=True, capture_output=True)
-                        set_done += 1
-                        logger.info(f"Updated Issue #{issue_number} status to Done")
-                    except Exception as e:
-                        logger.error(f"Failed to update Issue #{issue_number} to Done: {e}")
+                    mutation = batcher.set_single_select(self.PROJECT_ID, item_id, self.STATUS_FIELD_ID, self.DONE_OPTION_ID)
+                    status_updates.append((mutation, item_id, 'Done', self.DONE_OPTION_ID, 'set_done', f"Issue #{issue_number}"))
 
                 # 3. Open issue and status empty -> Set Todo
                 if issue_state == 'OPEN' and not current_status_id:
                     logger.info(f"Issue #{issue_number} is OPEN but has no Project Status. Setting to Todo...")
-                    try:
-                        subprocess.run([
-                            'gh', 'project', 'item-edit', 
-                            '--id', item_id,
-                            '--field-id', self.STATUS_FIELD_ID,
-                            '--single-select-option-id', self.TODO_OPTION_ID,
-                            '--project-id', self.PROJECT_ID
-                        ], check=True, capture_output=True)
-                        set_todo += 1
-                        logger.info(f"Updated Issue #{issue_number} status to Todo")
-                    except Exception as e:
-                        logger.error(f"Failed to update Issue #{issue_number} to Todo: {e}")
+                    mutation = batcher.set_single_select(self.PROJECT_ID, item_id, self.STATUS_FIELD_ID, self.TODO_OPTION_ID)
+                    status_updates.append((mutation, item_id, 'Todo', self.TODO_OPTION_ID, 'set_todo', f"Issue #{issue_number}"))
 
         # 4. Draft items with No Status -> Set Todo
-        set_draft_todo = 0
         for item in project_items:
             content = item.get('content', {})
             item_type = content.get('type') if isinstance(content, dict) else None
@@ -606,343 +1795,727 @@ class GoogleTasksSync:
                 status = item.get('status', '')
                 if not status:
                     item_id = item.get('id')
-                    if not item_id:
+                    if not item_id or not self._owns_item(item):
                         continue
                     logger.info(f"Draft item '{content.get('title', 'unknown')}' has No Status. Setting to Todo...")
-                    try:
-                        subprocess.run([
-                            'gh', 'project', 'item-edit',
-                            '--id', item_id,
-                            '--field-id', self.STATUS_FIELD_ID,
-                            '--single-select-option-id', self.TODO_OPTION_ID,
-                            '--project-id', self.PROJECT_ID
-                        ], check=True, capture_output=True, text=True, timeout=30)
-                        set_draft_todo += 1
-                        logger.info(f"Updated Draft item '{content.get('title', 'unknown')}' status to Todo")
-                    except Exception as e:
-                        logger.error(f"Failed to update Draft item to Todo: {e}")
+                    mutation = batcher.set_single_select(self.PROJECT_ID, item_id, self.STATUS_FIELD_ID, self.TODO_OPTION_ID)
+                    status_updates.append((mutation, item_id, 'Todo', self.TODO_OPTION_ID, 'set_draft_todo',
+                                           f"Draft item '{content.get('title', 'unknown')}'"))
+
+        added_to_project = sum(1 for added in self._map_io('github', self.add_issue_to_project, issues_to_add) if added)
+
+        # Apply all status edits as batched mutations and tally the per-item results
+        batcher.flush()
+        counters = {'set_done': 0, 'set_todo': 0, 'set_draft_todo': 0}
+        for mutation, item_id, status_name, option_id, counter, label in status_updates:
+            if mutation.ok:
+                counters[counter] += 1
+                if self.snapshot is not None:
+                    self.snapshot.set_status(item_id, status_name, option_id)
+                self._emit('item_status_set', item_id=item_id, status=status_name, subject=label)
+                logger.info(f"Updated {label} status to {status_name}")
+            else:
+                logger.error(f"Failed to update {label} to {status_name}: {mutation.error}")
+        set_done = counters['set_done']
+        set_todo = counters['set_todo']
+        set_draft_todo = counters['set_draft_todo']
 
         logger.info(f"Reconcile result: added_to_project={added_to_project}, set_done={set_done}, set_todo={set_todo}, set_draft_todo={set_draft_todo}")
+        return {
+            'added_to_project': added_to_project,
+            'set_done': set_done,
+            'set_todo': set_todo,
+            'set_draft_todo': set_draft_todo,
+        }
+
+    def _run_io(self, calls):
+        """
+        Run independent I/O calls given as (backend, callable) pairs and return their results
+        in order. The sequential engine runs them one after another; AsyncGoogleTasksSync
+        overrides this to run them concurrently with bounded concurrency per backend.
+        """
+        return [fn() for _, fn in calls]
+
+    def _map_io(self, backend, fn, items):
+        return self._run_io([(backend, functools.partial(fn, item)) for item in items])
+
+    def _execute_google(self, request):
+        """Execute a googleapiclient request (or BatchHttpRequest) through the rate limit scheduler."""
+        self._track_google_bytes(request)
+        return self.scheduler.call('google', lambda: self._send_google(request))
+
+    def _send_google(self, request):
+        return request.execute()
+
+    def _track_google_bytes(self, request):
+        """Count response sizes: HttpRequest passes the raw content to its postproc."""
+        postproc = getattr(request, 'postproc', None)
+        if postproc is None or getattr(postproc, 'counts_bytes', False):
+            return request
+
+        def counted(resp, content):
+            self.scheduler.record_bytes('google', len(content or b''))
+            return postproc(resp, content)
+
+        counted.counts_bytes = True
+        request.postproc = counted
+        return request
 
     def sync(self):
+        """Run the five sync steps and return a summary of the counters they report."""
         logger.info("Starting Google Tasks ↔ GitHub sync...")
-        task_lists = self.get_task_lists()
-        all_issues = self.get_all_issues()
-        project_items = self.get_all_project_items()
-        
+        self.run_id = uuid.uuid4().hex[:12]
+        self._emit('sync_started')
+        # Fresh counters per run: the daemon keeps one engine for many runs
+        self.metrics = SyncMetrics()
+        self.scheduler.metrics = self.metrics
+        if self.shard is not None:
+            self.metrics.info['shard'] = str(self.shard)
+        self.snapshot = ProjectSnapshot(self.fetch_project_items)
+        self._completion_failures = 0
+        self._tombstones = self._load_tombstones()
+        if self.journal is not None:
+            try:
+                self.journal.prune(JOURNAL_RETENTION_DAYS)
+            except Exception as e:
+                logger.warning(f"Could not prune the mutation journal: {e}")
+        with self.metrics.step('prefetch'):
+            task_lists, all_issues, project_items = self._run_io([
+                ('google', self.get_task_lists),
+                ('github', self.get_all_issues),
+                ('github', self.snapshot.items),
+            ])
+        task_lists = self._filter_task_lists(task_lists)
+        self.checkpoint = self._open_checkpoint()
+        summary = dict(self.checkpoint.summary) if self.checkpoint is not None else {}
+
         # 1. Google Tasks -> Project Draft or GitHub Issues
-        created_issue_count = 0
-        created_draft_count = 0
-        logger.info("Step 1: Syncing open Google Tasks to Project...")
-        existing_task_ids = set()
-        for issue in all_issues:
-            issue_body = issue.get('body') or ''
-            task_id = self._extract_task_id_from_text(issue_body)
-            if task_id:
-                existing_task_ids.add(task_id)
-        existing_task_ids.update(self._extract_task_ids_from_project_items(project_items))
+        if self._step_pending('create'):
+            with self.metrics.step('create') as step:
+                step.results = self.sync_tasks_to_project(task_lists, all_issues, project_items)
+                summary.update(step.results)
+            self._complete_step('create', summary)
+
+        # 2. GitHub Issues (Closed) -> Google Tasks (Complete)
+        if self._step_pending('closed_issues'):
+            with self.metrics.step('closed_issues') as step:
+                processed_tasks_from_issues = self.complete_tasks_from_closed_issues(all_issues)
+                summary['completed_from_issues'] = len(processed_tasks_from_issues)
+                step.results = {'completed_from_issues': summary['completed_from_issues']}
+            self._complete_step('closed_issues', summary)
+        else:
+            processed_tasks_from_issues = self.checkpoint.processed_tasks_from_issues
+
+        # 3. Project v2 (Done) -> Google Tasks (Complete)
+        if self._step_pending('done_items'):
+            with self.metrics.step('done_items') as step:
+                logger.info("Step 3: Completing Google Tasks from Project v2 'Done' items...")
+                summary['completed_from_done_items'] = self.process_project_done_items(processed_tasks_from_issues, all_issues)
+                step.results = {'completed_from_done_items': summary['completed_from_done_items']}
+            self._complete_step('done_items', summary)
+        
+        # 4. Reconcile Consistency
+        if self._step_pending('reconcile'):
+            with self.metrics.step('reconcile') as step:
+                step.results = self.reconcile_issue_project_consistency(all_issues)
+                summary.update(step.results)
+            self._complete_step('reconcile', summary)
+
+        # 5. Archive Done items older than 7 days (a board-wide sweep: one shard runs it)
+        if self.shard is not None and not self.shard.is_primary:
+            logger.info(f"Skipping step 'archive': run by shard 1/{self.shard.count}")
+        elif self._step_pending('archive'):
+            with self.metrics.step('archive') as step:
+                summary['archived'] = self.archive_completed_items(archive_after_days=7)
+                step.results = {'archived': summary['archived']}
+            self._complete_step('archive', summary)
+
+        self._advance_issues_watermark()
+        if self.checkpoint is not None:
+            self.checkpoint.clear()
+            self.checkpoint = None
+        self.metrics.finish()
+        self.metrics.info['summary'] = summary
+        self._emit('sync_finished', summary=summary)
+        logger.info("Sync completed successfully")
+        return summary
+
+    def _open_checkpoint(self):
+        if not self.checkpoint_file:
+            return None
+        run_key = f"{self.owner}/{self.repo}:{self.PROJECT_ID}"
+        if self.shard is not None:
+            run_key += f"#{self.shard}"
+        checkpoint = SyncCheckpoint.open(self.checkpoint_file, run_key, resume=self.resume,
+                                         max_age_hours=self.resume_max_age_hours)
+        if self.journal is not None:
+            if checkpoint.journal_owner:
+                # Resuming: the interrupted run's journal claims are this run's own, not another worker's
+                self.journal.owner = checkpoint.journal_owner
+            else:
+                checkpoint.journal_owner = self.journal.owner
+        return checkpoint
+
+    def _step_pending(self, step):
+        if self.checkpoint is not None and self.checkpoint.is_step_done(step):
+            logger.info(f"Skipping step '{step}': finished by the resumed run")
+            return False
+        return True
+
+    def _complete_step(self, step, summary):
+        if self.checkpoint is not None:
+            self.checkpoint.complete_step(step, summary)
 
-        for tl in task_lists:
-            tasks = self.get_tasks(tl['id'])
+    def _step_progress(self, step):
+        """Counters an interrupted step reached before the checkpoint (empty on a fresh run)."""
+        return self.checkpoint.step_results(step) if self.checkpoint is not None else {}
+
+    def _pending_chunks(self, step, items, key):
+        """
+        Split a step's items into chunks of checkpoint_every, leaving out the ones a resumed
+        checkpoint already finished. Without checkpoints everything is one chunk.
+        """
+        if self.checkpoint is None:
+            return [items] if items else []
+        done = self.checkpoint.done_keys(step)
+        remaining = [item for item in items if str(key(item)) not in done]
+        if len(remaining) < len(items):
+            logger.info(f"Resuming step '{step}': {len(items) - len(remaining)} items already done")
+        size = self.checkpoint_every
+        return [remaining[start:start + size] for start in range(0, len(remaining), size)]
+
+    def _record_progress(self, step, keys, results=None, processed_tasks_from_issues=None):
+        if self.checkpoint is not None:
+            self.checkpoint.record_items(step, keys, results=results,
+                                         processed_tasks_from_issues=processed_tasks_from_issues)
+
+    def _filter_task_lists(self, task_lists):
+        """Keep the tasklists named (by ID or title) in tasklist_filter; all of them when it is empty."""
+        if not self.tasklist_filter:
+            return task_lists
+        selected = [tl for tl in task_lists
+                    if tl.get('id') in self.tasklist_filter or tl.get('title') in self.tasklist_filter]
+        logger.info(f"Syncing {len(selected)} of {len(task_lists)} tasklists (tasklist filter)")
+        return selected
+
+    def _fetch_tasklist_tasks(self, task_lists, run_started):
+        """Fetch the tasks of every tasklist; returns [(tasklist_id, tasks, updated_min)]."""
+        def fetch(tl):
+            updated_min = self._get_tasks_updated_min(tl['id'], run_started)
+            if updated_min:
+                logger.info(f"Fetching tasks in list {tl['id']} updated since {updated_min}")
+            return tl['id'], self.get_tasks(tl['id'], updated_min=updated_min), updated_min
+
+        return self._map_io('google', fetch, task_lists)
+
+    def create_issues_for_tasks(self, tasks):
+        """Create one issue per task; returns the set of task IDs whose issue was created."""
+        results = self._map_io('github', self.create_issue, tasks)
+        return {task['id'] for task, result in zip(tasks, results) if result}
+
+    def sync_tasks_to_project(self, task_lists, all_issues, project_items):
+        """Step 1: create a Project draft (or Issue) for every open Google Task not yet linked."""
+        progress = self._step_progress('create')
+        created_issue_count = progress.get('created_issues', 0)
+        created_draft_count = progress.get('created_drafts', 0)
+        logger.info("Step 1: Syncing open Google Tasks to Project...")
+        existing_task_ids = self._get_existing_task_ids(all_issues, project_items)
+
+        run_started = datetime.now(timezone.utc)
+        fetched_tasklists = self._fetch_tasklist_tasks(task_lists, run_started)
+        self.metrics.add_items(sum(len(tasks) for _, tasks, _ in fetched_tasklists))
+        pending_tasks = []
+        # Open tasks that already have a draft or issue: candidates for propagating edits
+        linked_tasks = []
+        for tasklist_id, tasks, _ in fetched_tasklists:
             for task in tasks:
                 if task['status'] == 'needsAction':
                     task_id = task['id']
-                    if task_id not in existing_task_ids:
-                        task['tasklist_id'] = tl['id']
-                        if self.create_issues:
-                            result = self.create_issue(task)
-                            if result:
-                                created_issue_count += 1
-                                existing_task_ids.add(task_id)
-                        else:
-                            result = self.create_project_draft_item(task)
-                            if result:
-                                created_draft_count += 1
-                                existing_task_ids.add(task_id)
+                    if not self._owns(task_id):
+                        continue
+                    task['tasklist_id'] = tasklist_id
+                    if task_id in existing_task_ids:
+                        linked_tasks.append(task)
+                    else:
+                        pending_tasks.append(task)
+                        existing_task_ids.add(task_id)
+
+        operation = 'create_issue' if self.create_issues else 'create_draft'
+        failed_tasklists = set()
+        scanned = {}
+        batches = [chunk[start:start + self.mutation_batch_size]
+                   for chunk in self._pending_chunks('create', pending_tasks, lambda task: task['id'])
+                   for start in range(0, len(chunk), self.mutation_batch_size)]
+        for batch in batches:
+            # Claimed per batch: a run killed midway leaves only the batch it was sending claimed
+            to_send, held_back = self._claim_creations(operation, batch, all_issues, project_items, scanned)
+            # Tasks another worker is creating are not ours to vouch for yet; keep them in the next fetch
+            failed_tasklists.update(task['tasklist_id'] for task in held_back)
+            if not to_send:
+                continue
+            if self.create_issues:
+                created_task_ids = self.create_issues_for_tasks(to_send)
+                created_issue_count += len(created_task_ids)
+            else:
+                created_task_ids = self.create_project_draft_items(to_send)
+                created_draft_count += len(created_task_ids)
+            for task in to_send:
+                if task['id'] not in created_task_ids:
+                    existing_task_ids.discard(task['id'])
+                    failed_tasklists.add(task['tasklist_id'])
+            self._record_progress('create', [task['id'] for task in to_send if task['id'] in created_task_ids],
+                                  {'created_issues': created_issue_count, 'created_drafts': created_draft_count})
+
+        updates, failed_updates = self.propagate_task_edits(linked_tasks, all_issues)
+        # Keep failed edits inside the next incremental fetch so they are retried
+        failed_tasklists.update(task['tasklist_id'] for task in failed_updates)
+
+        if self.incremental:
+            for tasklist_id, tasks, updated_min in fetched_tasklists:
+                if tasklist_id not in failed_tasklists:
+                    self._advance_tasks_watermark(tasklist_id, tasks, updated_min is None, run_started)
+            self._save_sync_state()
 
         logger.info(f"Created {created_issue_count} new GitHub issues")
         logger.info(f"Created {created_draft_count} new Project draft items")
+        return {'created_issues': created_issue_count, 'created_drafts': created_draft_count, **updates}
 
-        # 2. GitHub Issues (Closed) -> Google Tasks (Complete)
+    def complete_tasks_from_closed_issues(self, all_issues):
+        """Step 2: complete the Google Tasks behind closed issues; returns the processed task IDs."""
         logger.info("Step 2: Completing Google Tasks from closed GitHub Issues...")
-        
-        # We need to process closed issues. 
-        # get_closed_issues was removed from sync() logic in original code? 
-        # Ah, original code had process_closed_issues() calling get_closed_issues() internally.
-        # But wait, create_issue uses get_all_issues now? No, I defined get_all_issues separately.
-        
-        processed_tasks_from_issues = set()
-        closed_issues = [i for i in all_issues if i['state'] == 'CLOSED']
+        # A resumed run continues with the task IDs the interrupted one already processed
+        processed_tasks_from_issues = (self.checkpoint.processed_tasks_from_issues
+                                       if self.checkpoint is not None else set())
+        closed_issues = [i for i in all_issues if i['state'] == 'CLOSED' and self._owns(i['number'])]
+        self.metrics.add_items(len(closed_issues))
         logger.info(f"Found {len(closed_issues)} closed issues to check")
         
+        candidates = []
         for issue in closed_issues:
-             task_id = self._complete_google_task_from_issue(issue['number'], issue['body'])
-             if task_id:
-                 processed_tasks_from_issues.add(task_id)
-                 
-        logger.info(f"Processed {len(processed_tasks_from_issues)} tasks from closed issues")
-
-        # 3. Project v2 (Done) -> Google Tasks (Complete)
-        logger.info("Step 3: Completing Google Tasks from Project v2 'Done' items...")
-        self.process_project_done_items(processed_tasks_from_issues)
-        
-        # 4. Reconcile Consistency
-        self.reconcile_issue_project_consistency()
+            candidate = self._completion_candidate(f"Issue #{issue['number']}", issue['body'])
+            if candidate:
+                candidates.append(candidate)
+        pending = [c for c in candidates if not self._is_confirmed_complete(c[1], c[0])]
+        if len(pending) < len(candidates):
+            logger.info(f"Skipped {len(candidates) - len(pending)} closed issues whose task was confirmed complete earlier")
+        for chunk in self._pending_chunks('closed_issues', pending, lambda candidate: candidate[0]):
+            for source_ref, task_id, _, _ in chunk:
+                self._emit('issue_closed', issue_number=int(source_ref.split('#', 1)[1]), task_id=task_id)
+            self._complete_google_tasks_batch(chunk)
+            processed_tasks_from_issues.update(task_id for _, task_id, _, _ in chunk if task_id)
+            self._record_progress('closed_issues', [candidate[0] for candidate in chunk],
+                                  processed_tasks_from_issues=processed_tasks_from_issues)
 
-        # 5. Archive Done items older than 7 days
-        self.archive_completed_items(archive_after_days=7)
-        
-        logger.info("Sync completed successfully")
+        logger.info(f"Processed {len(processed_tasks_from_issues)} tasks from closed issues")
+        return processed_tasks_from_issues
 
-    def _complete_google_task_from_text(self, source_ref, source_text):
+    def _completion_candidate(self, source_ref, source_text):
         """
-        Complete a Google Task and associated Gmail based on text payload.
-        Returns task_id if processed, None otherwise.
+        Parse a completion candidate (source_ref, task_id, tasklist_id, gmail_id) from an issue
+        or project item text. Returns None when the text is not a Google Tasks item.
         """
         if not source_text:
             return None
-            
+
         if "Origin: Google Tasks" not in source_text:
             return None
 
         task_id, tasklist_id, gmail_id = self._extract_task_context_from_text(source_text)
+        return source_ref, task_id, tasklist_id, gmail_id
+
+    def _complete_google_task_from_text(self, source_ref, source_text):
+        """
+        Complete a Google Task and associated Gmail based on text payload.
+        Returns task_id if processed, None otherwise.
+        """
+        candidate = self._completion_candidate(source_ref, source_text)
+        if not candidate:
+            return None
+        _, task_id, tasklist_id, gmail_id = candidate
         
         # Process Google Task
         if task_id and tasklist_id:
             try:
-                task = self.service.tasks().get(tasklist=tasklist_id, task=task_id).execute()
+                task = self._execute_google(self.service.tasks().get(tasklist=tasklist_id, task=task_id))
                 if task['status'] == 'needsAction':
-                    self.close_task(tasklist_id, task_id)
-                    logger.info(f"Completed Google Task {task_id} from {source_ref}")
+                    if self.close_task(tasklist_id, task_id):
+                        self._record_task_link(task_id, tasklist_id=tasklist_id, status='completed')
+                        self._record_completions([(task_id, source_ref)])
+                        self._emit('task_completed', task_id=task_id, tasklist_id=tasklist_id, source=source_ref)
+                        logger.info(f"Completed Google Task {task_id} from {source_ref}")
+                    else:
+                        self._completion_failures += 1
+                        logger.warning(f"Could not complete Google Task {task_id} from {source_ref}")
                 else:
+                    self._record_task_link(task_id, tasklist_id=tasklist_id, status=task['status'])
+                    self._record_completions([(task_id, source_ref)])
                     logger.debug(f"Task {task_id} already completed, skipping")
             except Exception as e:
                 logger.error(f"Error checking/closing task {task_id}: {e}", exc_info=True)
+                self._note_completion_failure(e)
         
         # Process associated Gmail if present
-        if gmail_id and self.workspace_skill:
-            try:
-                logger.info(f"Processing associated Gmail {gmail_id} for {source_ref}")
-                result_json = self.workspace_skill.mark_email_as_done(gmail_id)
-                result = json.loads(result_json)
-                
-                if "error" in result:
-                    logger.warning(f"Failed to mark Gmail as done: {result['error']}")
-                else:
-                    logger.info(f"Successfully marked Gmail {gmail_id} as done (removed from INBOX)")
-            except Exception as e:
-                logger.error(f"Error processing Gmail {gmail_id}: {e}", exc_info=True)
-        elif gmail_id and not self.workspace_skill:
-            logger.warning(f"Gmail-ID {gmail_id} found but GoogleWorkspaceSkill not available")
+        if gmail_id:
+            self._mark_gmail_done(gmail_id, source_ref)
         
         return task_id
 
+    def _mark_gmail_done(self, gmail_id, source_ref):
+        if not self.workspace_skill:
+            logger.warning(f"Gmail-ID {gmail_id} found but GoogleWorkspaceSkill not available")
+            return
+        try:
+            logger.info(f"Processing associated Gmail {gmail_id} for {source_ref}")
+            result_json = self.scheduler.call('gmail', lambda: self.workspace_skill.mark_email_as_done(gmail_id))
+            result = json.loads(result_json)
+            
+            if "error" in result:
+                logger.warning(f"Failed to mark Gmail as done: {result['error']}")
+            else:
+                logger.info(f"Successfully marked Gmail {gmail_id} as done (removed from INBOX)")
+                self._emit('gmail_marked_done', gmail_id=gmail_id, source=source_ref)
+        except Exception as e:
+            logger.error(f"Error processing Gmail {gmail_id}: {e}", exc_info=True)
+
+    def _execute_google_batch(self, requests):
+        """
+        Execute (request_id, HttpRequest) pairs through BatchHttpRequest, google_batch_size
+        calls per batch. Returns {request_id: (response, exception)}.
+        """
+        results = {}
+
+        def callback(request_id, response, exception):
+            results[request_id] = (response, exception)
+
+        def run_chunk(chunk):
+            batch = self.service.new_batch_http_request(callback=callback)
+            for request_id, request in chunk:
+                batch.add(self._track_google_bytes(request), request_id=request_id)
+            try:
+                self._execute_google(batch)
+            except Exception as e:
+                logger.error(f"Google API batch of {len(chunk)} requests failed: {e}", exc_info=True)
+                for request_id, _ in chunk:
+                    results.setdefault(request_id, (None, e))
+
+        pending = list(requests)
+        attempt = 0
+        while pending:
+            chunks = [pending[start:start + self.google_batch_size]
+                      for start in range(0, len(pending), self.google_batch_size)]
+            self._map_io('google', run_chunk, chunks)
+            # Calls inside a batch fail individually; re-send only the rate limited ones
+            throttled = [(request_id, request) for request_id, request in pending
+                         if self.scheduler.is_rate_limited(results.get(request_id, (None, None))[1])]
+            if not throttled or attempt >= self.scheduler.max_retries:
+                break
+            delay = self.scheduler.backoff_delay(attempt)
+            logger.warning(f"{len(throttled)} batched Google API calls rate limited; retrying in {delay:.1f}s")
+            self.scheduler.pause('google', delay)
+            self.scheduler.record_retry('google')
+            for request_id, _ in throttled:
+                results.pop(request_id, None)
+            pending = throttled
+            attempt += 1
+        return results
+
+    def _complete_google_tasks_batch(self, candidates):
+        """
+        Complete the Google Tasks (and Gmail) for many completion candidates at once:
+        all distinct (tasklist, task) pairs are checked with one batched tasks().get round,
+        and the ones still open are completed with one batched tasks().patch round.
+        """
+        pairs = []
+        seen = set()
+        for _, task_id, tasklist_id, _ in candidates:
+            if task_id and tasklist_id and (tasklist_id, task_id) not in seen:
+                seen.add((tasklist_id, task_id))
+                pairs.append((tasklist_id, task_id))
+
+        get_results = self._execute_google_batch([
+            (str(index), self.service.tasks().get(tasklist=tasklist_id, task=task_id))
+            for index, (tasklist_id, task_id) in enumerate(pairs)
+        ])
+        to_close = []
+        # Membership checks go through the set; the list keeps the batch request order
+        to_close_keys = set()
+        already_completed = set()
+        for index, (tasklist_id, task_id) in enumerate(pairs):
+            task, error = get_results.get(str(index), (None, None))
+            if error is not None or task is None:
+                logger.error(f"Error checking/closing task {task_id}: {error}")
+                self._note_completion_failure(error)
+                continue
+            if task['status'] == 'needsAction':
+                to_close.append((tasklist_id, task_id))
+                to_close_keys.add((tasklist_id, task_id))
+            else:
+                already_completed.add((tasklist_id, task_id))
+                self._record_task_link(task_id, tasklist_id=tasklist_id, status=task['status'])
+                logger.debug(f"Task {task_id} already completed, skipping")
+
+        patch_results = self._execute_google_batch([
+            (str(index), self.service.tasks().patch(tasklist=tasklist_id, task=task_id, body={'status': 'completed'}))
+            for index, (tasklist_id, task_id) in enumerate(to_close)
+        ])
+        closed = set()
+        for index, (tasklist_id, task_id) in enumerate(to_close):
+            _, error = patch_results.get(str(index), (None, None))
+            if error is not None:
+                logger.error(f"Error closing Google Task {task_id}: {error}")
+                self._note_completion_failure(error)
+                continue
+            closed.add((tasklist_id, task_id))
+            self._record_task_link(task_id, tasklist_id=tasklist_id, status='completed')
+            logger.info(f"Closed Google Task: {task_id} in list {tasklist_id}")
+
+        gmail_refs = {}
+        confirmed = []
+        reopened = []
+        for source_ref, task_id, tasklist_id, gmail_id in candidates:
+            if (tasklist_id, task_id) in closed:
+                logger.info(f"Completed Google Task {task_id} from {source_ref}")
+                self._emit('task_completed', task_id=task_id, tasklist_id=tasklist_id, source=source_ref)
+            if (tasklist_id, task_id) in closed or (tasklist_id, task_id) in already_completed:
+                confirmed.append((task_id, source_ref))
+            elif (tasklist_id, task_id) in to_close_keys:
+                reopened.append((task_id, source_ref))
+            if gmail_id and gmail_id not in gmail_refs:
+                gmail_refs[gmail_id] = source_ref
+        self._run_io([
+            ('gmail', functools.partial(self._mark_gmail_done, gmail_id, source_ref))
+            for gmail_id, source_ref in gmail_refs.items()
+        ])
+        self._record_completions(confirmed, reopened)
+
     def _complete_google_task_from_issue(self, issue_number, issue_body):
         """Compatibility wrapper for issue-based completion."""
         return self._complete_google_task_from_text(f"Issue #{issue_number}", issue_body)
     
-    def process_project_done_items(self, already_processed_tasks):
+    def complete_task_from_project_item(self, item):
+        """
+        Single-item Done handling: complete the Google Task behind one project item
+        (Issue-backed items read the issue body). Returns the task ID, or None.
+        """
+        item_id = item.get('id', 'unknown-item')
+        content = item.get('content', {})
+        if isinstance(content, dict) and content.get('type') == 'Issue':
+            issue_number = content.get('number')
+            if not issue_number:
+                return None
+            try:
+                issue_data = self._get_issue(issue_number)
+            except subprocess.CalledProcessError as e:
+                logger.error(f"Error fetching issue #{issue_number}: {e.stderr}")
+                return None
+            except Exception as e:
+                logger.error(f"Unexpected error fetching issue #{issue_number}: {e}", exc_info=True)
+                return None
+            return self._complete_google_task_from_issue(issue_number, issue_data.get('body', ''))
+
+        for text in self._collect_text_candidates_from_project_item(item):
+            candidate = self._completion_candidate(f"Project Item {item_id}", text)
+            if candidate and candidate[1]:
+                return self._complete_google_task_from_text(f"Project Item {item_id}", text)
+        return None
+
+    def process_project_done_items(self, already_processed_tasks, all_issues=None):
         """
         Process Project v2 items with Status='Done' and complete corresponding Google Tasks.
-        Supports both Issue-backed items and draft items.
+        Supports both Issue-backed items and draft items; issue bodies come from all_issues
+        (the run's issue list) and one bulk query for any issue not in it.
         """
         logger.info("Processing Project v2 'Done' items...")
-        project_items = self.get_all_project_items()
+        project_items = self._get_project_items()
 
         if not project_items:
             logger.info("No 'Done' items found in Project v2")
-            return
+            return 0
         
-        processed_count = 0
-        done_items = [i for i in project_items if i.get('status', '') in self.DONE_STATUSES]
+        processed_count = self._step_progress('done_items').get('completed_from_done_items', 0)
+        done_items = [i for i in project_items
+                      if i.get('status', '') in self.DONE_STATUSES and self._owns_item(i)]
+        self.metrics.add_items(len(done_items))
+        # Gather all completion candidates first, then complete them in batched Google API calls
+        entries = []
+
+        # Issue-backed items: bodies from the run's issue list, bulk-fetched when missing
+        issue_numbers = []
+        for item in done_items:
+            content = item.get('content', {})
+            if isinstance(content, dict) and content.get('type') == 'Issue' and content.get('number'):
+                issue_numbers.append(int(content['number']))
+        # Issues whose linked task was confirmed complete need no body lookup
+        issue_numbers = [number for number in issue_numbers if not self._issue_confirmed_complete(number)]
+        fetched_issues = self._get_issues_bulk(issue_numbers, all_issues)
 
         for item in done_items:
             item_id = item.get('id', 'unknown-item')
             content = item.get('content', {})
             item_type = content.get('type') if isinstance(content, dict) else None
 
-            # Issue-backed item: fetch fresh issue body
             if item_type == 'Issue':
                 issue_number = content.get('number')
-                if not issue_number:
+                issue_data = fetched_issues.get(int(issue_number)) if issue_number else None
+                if not issue_data:
                     continue
-                command = [
-                    'gh', 'issue', 'view', str(issue_number),
-                    '--repo', f"{self.owner}/{self.repo}",
-                    '--json', 'number,body,state'
-                ]
-                try:
-                    result = subprocess.run(
-                        command,
-                        capture_output=True,
-                        text=True,
-                        timeout=30,
-                        check=True
-                    )
-                    issue_data = json.loads(result.stdout)
-                    task_id = self._complete_google_task_from_issue(
-                        issue_data['number'],
-                        issue_data.get('body', '')
-                    )
-                    if task_id and task_id not in already_processed_tasks:
-                        processed_count += 1
-                        logger.info(f"Completed Google Task {task_id} from Project Done Issue #{issue_number} (state={issue_data.get('state')})")
-                except subprocess.TimeoutExpired:
-                    logger.error(f"Timeout fetching issue #{issue_number}")
-                except subprocess.CalledProcessError as e:
-                    logger.error(f"Error fetching issue #{issue_number}: {e.stderr}")
-                except Exception as e:
-                    logger.error(f"Unexpected error processing issue #{issue_number}: {e}", exc_info=True)
+                candidate = self._completion_candidate(f"Issue #{issue_data['number']}", issue_data.get('body', ''))
+                if candidate:
+                    entries.append(('issue', candidate, f"Issue #{issue_number} (state={issue_data.get('state')})"))
                 continue
 
             # Draft or other item types: parse text directly from item payload
             for text in self._collect_text_candidates_from_project_item(item):
-                task_id = self._complete_google_task_from_text(f"Project Item {item_id}", text)
-                if task_id:
-                    if task_id in already_processed_tasks:
-                        break
-                    processed_count += 1
-                    already_processed_tasks.add(task_id)
-                    logger.info(f"Completed Google Task {task_id} from Project Done item {item_id}")
+                candidate = self._completion_candidate(f"Project Item {item_id}", text)
+                if candidate and candidate[1]:
+                    entries.append(('item', candidate, item_id))
                     break
+
+        pending = [entry for entry in entries if not self._is_confirmed_complete(entry[1][1], entry[1][0])]
+        if len(pending) < len(entries):
+            logger.info(f"Skipped {len(entries) - len(pending)} Done items whose task was confirmed complete earlier")
+        for chunk in self._pending_chunks('done_items', pending, lambda entry: entry[1][0]):
+            for kind, candidate, source in chunk:
+                if kind == 'issue':
+                    self._emit('item_done', issue_number=int(candidate[0].split('#', 1)[1]), task_id=candidate[1])
+                else:
+                    self._emit('item_done', item_id=source, task_id=candidate[1])
+            self._complete_google_tasks_batch([candidate for _, candidate, _ in chunk])
+
+            for kind, candidate, source in chunk:
+                task_id = candidate[1]
+                if kind == 'issue':
+                    if task_id and task_id not in already_processed_tasks:
+                        processed_count += 1
+                        logger.info(f"Completed Google Task {task_id} from Project Done {source}")
+                    continue
+                if task_id in already_processed_tasks:
+                    continue
+                processed_count += 1
+                already_processed_tasks.add(task_id)
+                logger.info(f"Completed Google Task {task_id} from Project Done item {source}")
+            self._record_progress('done_items', [candidate[0] for _, candidate, _ in chunk],
+                                  {'completed_from_done_items': processed_count})
         
         logger.info(f"Processed {processed_count} additional tasks from Project v2 'Done' items")
+        return processed_count
     
-    def archive_completed_items(self, archive_after_days=7):
+    def fetch_archive_candidates(self, cutoff):
         """
-        Archive Project v2 items that have been in 'Done' status for longer than archive_after_days.
-        Uses GraphQL to fetch updatedAt timestamps for accurate age calculation.
+        Done items last updated before `cutoff`, filtered on the server with the ProjectV2
+        `items(query:)` search so only candidates are paged in. The filter works on whole days,
+        so callers still compare updatedAt; returns None when the server rejects the filter.
         """
-        logger.info(f"Step 5: Archiving items Done for {archive_after_days}+ days...")
-
-        query = """
-        query($projectId: ID!, $cursor: String) {
-          node(id: $projectId) {
-            ... on ProjectV2 {
-              items(first: 100, after: $cursor) {
-                pageInfo { hasNextPage endCursor }
-                nodes {
-                  id
-                  updatedAt
-                  isArchived
-                  fieldValues(first: 10) {
-                    nodes {
-                      ... on ProjectV2ItemFieldSingleSelectValue {
-                        name
-                        field { ... on ProjectV2SingleSelectField { name } }
-                      }
-                    }
-                  }
-                  content {
-                    ... on DraftIssue { title }
-                    ... on Issue { title number }
-                  }
-                }
-              }
-            }
-          }
-        }
-        """
-
-        cutoff = datetime.now(timezone.utc) - timedelta(days=archive_after_days)
-        archived_count = 0
+        statuses = ','.join(f'"{status}"' for status in sorted(self.DONE_STATUSES))
+        # `updated:<date` excludes that date; items from the cutoff day itself are picked up next run
+        search = f"status:{statuses} updated:<{cutoff.date().isoformat()}"
+        items = []
         cursor = None
-
         while True:
             try:
-                cmd = [
-                    'gh', 'api', 'graphql',
-                    '-f', f'query={query}',
-                    '-F', f'projectId={self.PROJECT_ID}',
-                ]
-                if cursor:
-                    cmd.extend(['-f', f'cursor={cursor}'])
-                result = subprocess.run(
-                    cmd, capture_output=True, text=True, timeout=60, check=True
-                )
-                data = json.loads(result.stdout)
+                data = self._graphql(ARCHIVE_CANDIDATES_QUERY,
+                                     {'projectId': self.PROJECT_ID, 'cursor': cursor, 'filter': search})
+            except subprocess.TimeoutExpired:
+                logger.error("Timeout fetching archive candidates via GraphQL")
+                return None
             except subprocess.CalledProcessError as e:
-                logger.error(f"GraphQL query failed: {e.stderr}")
-                break
+                logger.warning(f"Filtered archive scan failed, falling back to a full scan: {e.stderr}")
+                return None
             except Exception as e:
-                logger.error(f"Unexpected error querying project items for archive: {e}", exc_info=True)
-                break
+                logger.warning(f"Filtered archive scan failed, falling back to a full scan: {e}")
+                return None
 
-            project_node = data.get('data', {}).get('node', {})
-            items_data = project_node.get('items', {})
-            nodes = items_data.get('nodes', [])
+            items_data = (data.get('data') or {}).get('node', {}).get('items', {})
+            for node in items_data.get('nodes', []):
+                if node and not node.get('isArchived'):
+                    items.append(self._normalize_project_node(node))
 
-            for node in nodes:
-                if node.get('isArchived'):
-                    continue
+            page_info = items_data.get('pageInfo', {})
+            if not page_info.get('hasNextPage'):
+                break
+            cursor = page_info.get('endCursor')
+        logger.info(f"Fetched {len(items)} archive candidates with filter '{search}'")
+        return items
 
-                status_name = None
-                for fv in node.get('fieldValues', {}).get('nodes', []):
-                    if fv.get('field', {}).get('name') == 'Status':
-                        status_name = fv.get('name')
-                        break
+    def archive_completed_items(self, archive_after_days=7):
+        """
+        Archive Project v2 items that have been in 'Done' status for longer than archive_after_days.
+        Uses the GraphQL updatedAt timestamps for accurate age calculation: from the run snapshot
+        when it is already loaded, otherwise from a server-filtered scan of the candidates only.
+        """
+        logger.info(f"Step 5: Archiving items Done for {archive_after_days}+ days...")
 
-                if status_name not in self.DONE_STATUSES:
-                    continue
+        cutoff = datetime.now(timezone.utc) - timedelta(days=archive_after_days)
+        if self.snapshot is not None and not self.snapshot.stale:
+            project_items = self.snapshot.items()
+        else:
+            project_items = self.fetch_archive_candidates(cutoff)
+            if project_items is None:
+                project_items = self.snapshot.items() if self.snapshot is not None else self.fetch_project_items()
+        self.metrics.add_items(len(project_items))
 
-                updated_at_str = node.get('updatedAt')
-                if not updated_at_str:
-                    continue
+        archived_count = 0
+        batcher = self._new_batcher()
+        archives = []
 
-                try:
-                    updated_at = datetime.fromisoformat(updated_at_str.replace('Z', '+00:00'))
-                except (ValueError, TypeError):
-                    logger.warning(f"Could not parse updatedAt '{updated_at_str}' for item {node['id']}")
-                    continue
+        for item in list(project_items):
+            if item.get('isArchived'):
+                continue
 
-                if updated_at >= cutoff:
-                    continue
+            if item.get('status') not in self.DONE_STATUSES:
+                continue
 
-                item_id = node['id']
-                content = node.get('content', {})
-                title = content.get('title', 'unknown')
-                days_done = (datetime.now(timezone.utc) - updated_at).days
+            updated_at_str = item.get('updatedAt')
+            if not updated_at_str:
+                continue
 
-                logger.info(f"Archiving item '{title}' (Done for {days_done} days, id={item_id})")
-                try:
-                    subprocess.run([
-                        'gh', 'project', 'item-archive', '1',
-                        '--owner', self.owner,
-                        '--id', item_id
-                    ], check=True, capture_output=True, text=True, timeout=30)
-                    archived_count += 1
-                except subprocess.CalledProcessError as e:
-                    logger.error(f"Failed to archive item {item_id}: {e.stderr}")
-                except Exception as e:
-                    logger.error(f"Unexpected error archiving item {item_id}: {e}", exc_info=True)
+            try:
+                updated_at = datetime.fromisoformat(updated_at_str.replace('Z', '+00:00'))
+            except (ValueError, TypeError):
+                logger.warning(f"Could not parse updatedAt '{updated_at_str}' for item {item['id']}")
+                continue
 
-            page_info = items_data.get('pageInfo', {})
-            if page_info.get('hasNextPage'):
-                cursor = page_info.get('endCursor')
+            if updated_at >= cutoff:
+                continue
+
+            item_id = item['id']
+            content = item.get('content', {})
+            title = content.get('title', 'unknown')
+            days_done = (datetime.now(timezone.utc) - updated_at).days
+
+            logger.info(f"Archiving item '{title}' (Done for {days_done} days, id={item_id})")
+            archives.append((item_id, batcher.archive(self.PROJECT_ID, item_id)))
+
+        batcher.flush()
+        for item_id, mutation in archives:
+            if mutation.ok:
+                archived_count += 1
+                if self.snapshot is not None:
+                    self.snapshot.remove(item_id)
+                self._emit('item_archived', item_id=item_id)
             else:
-                break
+                logger.error(f"Failed to archive item {item_id}: {mutation.error}")
 
         logger.info(f"Archived {archived_count} items that were Done for {archive_after_days}+ days")
+        return archived_count
 
     def get_project_done_items(self):
         """Get all Project v2 items with Status = 'Done'"""
         command = [
-            'gh', 'project', 'item-list', '{{PROJECT_NUMBER}}',
+            'gh', 'project', 'item-list', self.project_number or '{{PROJECT_NUMBER}}',
             '--owner', self.owner,
             '--format', 'json',
             '--limit', '500'
         ]
         try:
-            result = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                timeout=60,  # Longer timeout for large projects
-                check=True
-            )
-            data = json.loads(result.stdout)
-            items = data.get('items', [])
-            total_count = data.get('totalCount', 0)
+            if self.github is not None:
+                items = self.fetch_project_items()
+                total_count = len(items)
+            else:
+                result = self._run_gh(command, timeout=60)
+                data = json.loads(result.stdout)
+                items = data.get('items', [])
+                total_count = data.get('totalCount', 0)
             
             logger.info(f"Retrieved {len(items)} items from Project v2 (total: {total_count})")
             
@@ -976,6 +2549,114 @@ class GoogleTasksSync:
             logger.error(f"Unexpected error fetching project items: {e}", exc_info=True)
             return []
 
+
+class AsyncGoogleTasksSync(GoogleTasksSync):
+    """
+    Same five steps, counters and logging as GoogleTasksSync, but independent network calls
+    (tasklist fetches, issue creation/reads, mutation and Google batch chunks, Gmail marks)
+    run concurrently on an asyncio event loop, bounded per backend by a semaphore.
+
+    The step logic itself runs in one worker thread and hands each fan-out to the loop via
+    _run_io, so results come back in submission order and the run produces the same
+    writes and summary as the sequential engine.
+    """
+
+    # Gmail goes through the workspace skill's single shared httplib2 client, which is not thread-safe
+    DEFAULT_CONCURRENCY = {'google': 8, 'github': 8, 'gmail': 1}
+
+    def __init__(self, *args, concurrency=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.concurrency = dict(self.DEFAULT_CONCURRENCY)
+        self.concurrency.update(concurrency or {})
+        # The scheduler adapts in-flight calls below these caps when a backend starts throttling
+        for backend, limit in self.concurrency.items():
+            self.scheduler.set_concurrency(backend, limit)
+        self._loop = None
+        self._semaphores = {}
+        self._local = threading.local()
+
+    def _google_http(self):
+        """Per-thread authorized httplib2 client; httplib2.Http must not be shared across threads."""
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            http = google_auth_httplib2.AuthorizedHttp(self.creds, http=httplib2.Http()) if self.creds else None
+            self._local.http = http
+        return http
+
+    def _send_google(self, request):
+        http = self._google_http()
+        if http is None:
+            return request.execute()
+        return request.execute(http=http)
+
+    async def _call(self, backend, fn):
+        semaphore = self._semaphores.get(backend)
+        if semaphore is None:
+            return await asyncio.to_thread(fn)
+        async with semaphore:
+            return await asyncio.to_thread(fn)
+
+    async def _gather(self, calls):
+        return await asyncio.gather(*(self._call(backend, fn) for backend, fn in calls))
+
+    def _run_io(self, calls):
+        if self._loop is None or len(calls) < 2:
+            return super()._run_io(calls)
+        return asyncio.run_coroutine_threadsafe(self._gather(calls), self._loop).result()
+
+    async def sync_async(self):
+        self._loop = asyncio.get_running_loop()
+        self._semaphores = {
+            backend: asyncio.Semaphore(max(1, int(limit)))
+            for backend, limit in self.concurrency.items()
+        }
+        # Steps block their worker thread while fan-outs run, so size the pool for both
+        workers = sum(max(1, int(limit)) for limit in self.concurrency.values()) + 2
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='sync-io')
+        self._loop.set_default_executor(executor)
+        try:
+            return await asyncio.to_thread(GoogleTasksSync.sync, self)
+        finally:
+            self._loop = None
+            executor.shutdown(wait=False)
+
+    def sync(self):
+        logger.info(f"Async engine concurrency: {self.concurrency}")
+        return asyncio.run(self.sync_async())
+
+
+def _parse_backend_values(value, cast):
+    """Parse `N` (every backend) or `google=8,github=4,gmail=1` into a per-backend dict."""
+    if '=' not in value:
+        return {backend: cast(value) for backend in AsyncGoogleTasksSync.DEFAULT_CONCURRENCY}
+    limits = {}
+    for part in value.split(','):
+        backend, _, limit = part.partition('=')
+        limits[backend.strip()] = cast(limit)
+    return limits
+
+
+def parse_concurrency(value):
+    return _parse_backend_values(value, int)
+
+
+def parse_rate_limits(value):
+    return _parse_backend_values(value, float)
+
+
+def shared_concurrency(workers, concurrency=None):
+    """
+    Per-backend in-flight caps for the scheduler every --config target shares: room for each
+    worker and, with the async engine (`concurrency` given), for one engine's own concurrency.
+    Target schedulers are views, which cannot change these caps once set.
+    """
+    caps = {'github': workers, 'google': workers}
+    if concurrency is not None:
+        for backend, limit in {**AsyncGoogleTasksSync.DEFAULT_CONCURRENCY, **concurrency}.items():
+            caps[backend] = max(caps.get(backend, 0), limit)
+    return caps
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Sync Google Tasks with GitHub Project v2 (and optionally Issues)')
     parser.add_argument('--owner', default='{{GITHUB_USERNAME}}', help='GitHub repository owner')
@@ -988,19 +2669,284 @@ if __name__ == "__main__":
         default=False,
         help='Create GitHub Issues from tasks (default: disabled, create Project draft items only)'
     )
+    parser.add_argument(
+        '--incremental',
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help='Only fetch Google Tasks updated since the last run (per-tasklist watermark stored under memory/)'
+    )
+    parser.add_argument('--full-resync-hours', type=float, default=24,
+                        help='In incremental mode, force a full Google Tasks fetch after this many hours (default: 24)')
+    parser.add_argument('--state-file', default=SYNC_STATE_FILE, help='Path of the local sync state file')
+    parser.add_argument(
+        '--github-backend',
+        choices=['gh', 'http'],
+        default='gh',
+        help="GitHub access: 'gh' spawns the gh CLI per call, 'http' uses one pooled keep-alive session "
+             "authenticated with GITHUB_TOKEN/GH_TOKEN (default: gh)"
+    )
+    parser.add_argument('--mutation-batch-size', type=int, default=50,
+                        help='Project v2 mutations sent per aliased GraphQL request (default: 50)')
+    parser.add_argument(
+        '--link-index',
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help='Deduplicate through the persistent task link index instead of scanning every body each run'
+    )
+    parser.add_argument('--link-index-file', default=LINK_INDEX_FILE, help='Path of the SQLite task link index')
+    parser.add_argument('--google-batch-size', type=int, default=100,
+                        help=f'Google API calls per batch request when completing tasks (max {GOOGLE_BATCH_LIMIT}, default: 100)')
+    parser.add_argument('--verify-hours', type=float, default=24,
+                        help='Re-verify the link index with a full issue/project scan after this many hours (default: 24)')
+    parser.add_argument(
+        '--engine',
+        choices=['sequential', 'async'],
+        default='sequential',
+        help="'async' runs independent network calls concurrently on an asyncio loop (default: sequential)"
+    )
+    parser.add_argument('--concurrency', type=parse_concurrency, default=None,
+                        help='Async engine in-flight calls per backend: N, or e.g. google=8,github=8,gmail=1')
+    parser.add_argument('--rate-limit', type=parse_rate_limits, default=None,
+                        help='Requests per second per backend: N, or e.g. github=10,google=10,gmail=5')
+    parser.add_argument('--max-retries', type=int, default=5,
+                        help='Retries for a rate limited call before giving up (default: 5)')
+    parser.add_argument('--metrics-out', default=None,
+                        help='Write per-step wall time, call counts, bytes received, retries and items to this JSON file')
+    parser.add_argument('--daemon', action='store_true',
+                        help='Keep running and re-sync with a warm engine at an adaptive interval (stop with SIGINT/SIGTERM)')
+    parser.add_argument('--poll-min-seconds', type=float, default=30,
+                        help='Daemon poll interval right after a cycle that changed something (default: 30)')
+    parser.add_argument('--poll-max-seconds', type=float, default=1800,
+                        help='Longest daemon poll interval while idle (default: 1800)')
+    parser.add_argument('--poll-backoff', type=float, default=2.0,
+                        help='Factor the daemon poll interval grows by after each idle cycle (default: 2.0)')
+    parser.add_argument('--webhook', action='store_true',
+                        help='Serve a GitHub webhook receiver applying issue closes and Done moves per item')
+    parser.add_argument('--webhook-host', default='127.0.0.1', help='Webhook receiver bind address (default: 127.0.0.1)')
+    parser.add_argument('--webhook-port', type=int, default=8787, help='Webhook receiver port (default: 8787)')
+    parser.add_argument('--webhook-secret', default=os.environ.get('GITHUB_WEBHOOK_SECRET'),
+                        help='Secret used to verify X-Hub-Signature-256 (default: GITHUB_WEBHOOK_SECRET)')
+    parser.add_argument('--webhook-replay', action='append', default=[], metavar='FILE',
+                        help='Apply recorded deliveries ({"event": ..., "payload": ...} or a list of them) and exit')
+    parser.add_argument(
+        '--completion-tombstones',
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help='Skip closed issues / Done items whose Google Task was already confirmed complete (needs --link-index)'
+    )
+    parser.add_argument('--tombstone-ttl-hours', type=float, default=None,
+                        help='Re-check tombstoned completions after this many hours (default: never)')
+    parser.add_argument('--tombstone-recheck', type=float, default=0.0,
+                        help='Fraction of tombstoned completions re-checked anyway each run (default: 0)')
+    parser.add_argument('--config', default=None,
+                        help='JSON file listing several owner/repo/project/tasklist targets to sync concurrently')
+    parser.add_argument('--config-workers', type=int, default=None,
+                        help='Targets synced at the same time in --config mode (default: all)')
+    parser.add_argument('--checkpoint-file', default=CHECKPOINT_FILE,
+                        help='Where sync progress is checkpointed after each step and item chunk')
+    parser.add_argument('--checkpoint-every', type=int, default=500,
+                        help='Items per checkpoint within a step (default: 500)')
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue an interrupted sync from its checkpoint (skips finished steps and items)')
+    parser.add_argument('--resume-max-age-hours', type=float, default=6,
+                        help='Ignore checkpoints older than this many hours (default: 6)')
+    parser.add_argument(
+        '--mutation-journal',
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help='Claim draft/issue creations in a write-ahead journal so retries and concurrent runs never create duplicates'
+    )
+    parser.add_argument('--mutation-journal-file', default=MUTATION_JOURNAL_FILE,
+                        help='Path of the SQLite mutation journal')
+    parser.add_argument('--journal-lease-minutes', type=float, default=30,
+                        help="Minutes another worker's unfinished claim is respected before it is checked and retried (default: 30)")
+    parser.add_argument(
+        '--rest-cache',
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help='Revalidate GitHub REST reads with ETag/Last-Modified and serve unchanged ones from disk (http backend)'
+    )
+    parser.add_argument('--rest-cache-file', default=REST_CACHE_FILE,
+                        help='Path of the SQLite GitHub REST response cache')
+    parser.add_argument('--events-out', default=None, metavar='PATH',
+                        help="Append one NDJSON change event per change the sync makes or observes ('-' for stdout)")
+    parser.add_argument('--profile', action='store_true',
+                        help='Run under cProfile and write .pstats, flame graph .collapsed stacks and a per call site I/O wait report')
+    parser.add_argument('--profile-out', default=None, metavar='PREFIX',
+                        help='Path prefix of the profile files (implies --profile; default: memory/profiles/sync-<timestamp>)')
+    parser.add_argument('--shard', type=parse_shard, default=None, metavar='i/N',
+                        help='Handle only shard i of N (tasks, issues and project items split by a stable hash); '
+                             'shard 1 also runs the archive sweep')
+    parser.add_argument('--merge-metrics', nargs='+', default=None, metavar='FILE',
+                        help='Combine the --metrics-out files of a sharded run into --metrics-out and exit')
     args = parser.parse_args()
+    if args.merge_metrics and not args.metrics_out:
+        parser.error('--merge-metrics needs --metrics-out for the combined file')
     
+    if args.events_out == '-':
+        # stdout carries the change feed; keep log lines out of it
+        for handler in logging.getLogger().handlers:
+            if isinstance(handler, logging.StreamHandler) and handler.stream is sys.stdout:
+                handler.setStream(sys.stderr)
+
+    profiler = None
+    if args.profile or args.profile_out:
+        profiler = SyncProfiler(
+            args.profile_out or os.path.join(PROFILE_DIR, f"sync-{datetime.now().strftime('%Y%m%d-%H%M%S')}")
+        )
+        profiler.start()
+
     try:
-        sync_engine = GoogleTasksSync(owner=args.owner, repo=args.repo, create_issues=args.create_issues)
+        if args.merge_metrics:
+            merged = merge_metrics_files(args.merge_metrics)
+            write_json(merged, args.metrics_out)
+            logger.info(f"Merged {len(args.merge_metrics)} metrics files into {args.metrics_out}")
+            if merged.get('missing_shards'):
+                logger.warning(f"No metrics for shards: {', '.join(merged['missing_shards'])}")
+            sys.exit(0)
+
+        if args.shard is not None and args.shard.count > 1:
+            # Shards on one machine keep their own watermarks and checkpoints; the link index
+            # and mutation journal are shared (SQLite, safe for concurrent workers)
+            shard_name = f"shard{args.shard.index}of{args.shard.count}"
+            args.state_file = target_path(args.state_file, shard_name)
+            args.checkpoint_file = target_path(args.checkpoint_file, shard_name)
+
+        scheduler = RateLimitScheduler(rates=args.rate_limit, max_retries=args.max_retries)
+        if profiler is not None:
+            scheduler.wait_tracker = profiler.waits
+        engine_kwargs = {'concurrency': args.concurrency} if args.engine == 'async' else {}
+        engine_class = AsyncGoogleTasksSync if args.engine == 'async' else GoogleTasksSync
+        engine_kwargs.update(
+            mutation_batch_size=args.mutation_batch_size,
+            google_batch_size=args.google_batch_size,
+            completion_tombstones=args.completion_tombstones,
+            tombstone_ttl_hours=args.tombstone_ttl_hours,
+            tombstone_recheck=args.tombstone_recheck,
+            checkpoint_every=args.checkpoint_every,
+            resume=args.resume,
+            resume_max_age_hours=args.resume_max_age_hours,
+            journal_lease_minutes=args.journal_lease_minutes,
+            event_stream=ChangeEventStream(args.events_out) if args.events_out else None,
+            shard=args.shard,
+        )
+
+        if args.config:
+            # Multi-target mode: shared credentials, GitHub session and rate budget, one engine per target
+            targets = load_targets(args.config)
+            creds = load_credentials()
+            github_client = None
+            if args.github_backend == 'http':
+                cache = ConditionalRequestCache(args.rest_cache_file) if args.rest_cache else None
+                github_client = GitHubClient(scheduler=scheduler, cache=cache)
+            workspace_skill = None
+            if GoogleWorkspaceSkill:
+                try:
+                    workspace_skill = GoogleWorkspaceSkill()
+                except Exception as e:
+                    logger.warning(f"Failed to initialize GoogleWorkspaceSkill: {e}")
+            workers = args.config_workers or len(targets)
+            caps = shared_concurrency(workers, (args.concurrency or {}) if args.engine == 'async' else None)
+            for backend, limit in caps.items():
+                scheduler.set_concurrency(backend, limit)
+
+            def build_target(target):
+                target_scheduler = scheduler.view()
+                return engine_class(
+                    owner=target['owner'],
+                    repo=target['repo'],
+                    project=target.get('project'),
+                    tasklist_filter=target.get('tasklists'),
+                    create_issues=target.get('create_issues', args.create_issues),
+                    incremental=target.get('incremental', args.incremental),
+                    full_resync_hours=target.get('full_resync_hours', args.full_resync_hours),
+                    verify_hours=target.get('verify_hours', args.verify_hours),
+                    state_file=target_path(args.state_file, target['name']),
+                    link_index_file=target_path(args.link_index_file, target['name']) if args.link_index else None,
+                    checkpoint_file=target_path(args.checkpoint_file, target['name']),
+                    mutation_journal_file=(target_path(args.mutation_journal_file, target['name'])
+                                           if args.mutation_journal else None),
+                    github_backend=args.github_backend,
+                    github_client=github_client.with_scheduler(target_scheduler) if github_client else None,
+                    scheduler=target_scheduler,
+                    creds=creds,
+                    workspace_skill=workspace_skill,
+                    **engine_kwargs
+                )
+
+            results = run_targets(targets, build_target, max_workers=workers)
+            if args.metrics_out:
+                write_results(results, args.metrics_out)
+                logger.info(f"Wrote per-target sync results to {args.metrics_out}")
+            failed = [name for name, result in results.items() if result.error]
+            if failed:
+                logger.error(f"Sync failed for targets: {', '.join(failed)}")
+                sys.exit(1)
+            sys.exit(0)
+
+        sync_engine = engine_class(
+            owner=args.owner,
+            repo=args.repo,
+            create_issues=args.create_issues,
+            incremental=args.incremental,
+            full_resync_hours=args.full_resync_hours,
+            state_file=args.state_file,
+            github_backend=args.github_backend,
+            link_index_file=args.link_index_file if args.link_index else None,
+            verify_hours=args.verify_hours,
+            checkpoint_file=args.checkpoint_file,
+            mutation_journal_file=args.mutation_journal_file if args.mutation_journal else None,
+            rest_cache_file=args.rest_cache_file if args.rest_cache else None,
+            scheduler=scheduler,
+            **engine_kwargs
+        )
         
+        def write_metrics():
+            if args.metrics_out:
+                sync_engine.metrics.info.update(engine=args.engine, github_backend=args.github_backend)
+                sync_engine.metrics.write(args.metrics_out)
+                logger.info(f"Wrote sync metrics to {args.metrics_out}")
+
         if args.task_id and args.status:
             # Single task update mode
             sync_engine.update_task_status(args.task_id, args.status)
+        elif args.webhook_replay:
+            # Recorded webhook deliveries through the same per-item paths as the receiver
+            dispatcher = WebhookDispatcher(sync_engine)
+            for path in args.webhook_replay:
+                with open(path, 'r', encoding='utf-8') as f:
+                    records = json.load(f)
+                dispatcher.replay(records if isinstance(records, list) else [records])
+        elif args.webhook:
+            server = WebhookServer(WebhookDispatcher(sync_engine), args.webhook_secret,
+                                   host=args.webhook_host, port=args.webhook_port)
+            # shutdown() blocks until serve_forever returns, so it cannot run on the serving thread
+            signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                logger.info("Webhook receiver stopped")
+        elif args.daemon:
+            # Daemon mode: one warm engine, re-synced until a shutdown signal
+            daemon = SyncDaemon(
+                sync_engine,
+                interval=AdaptiveInterval(args.poll_min_seconds, args.poll_max_seconds, args.poll_backoff),
+                on_cycle=lambda cycle, summary, error: write_metrics()
+            )
+            daemon.run()
         else:
             # Full sync mode
-            sync_engine.sync()
-            logger.info("Sync completed successfully")
+            try:
+                sync_engine.sync()
+                logger.info("Sync completed successfully")
+            finally:
+                write_metrics()
             
     except Exception as e:
         logger.error(f"Operation failed: {e}", exc_info=True)
         sys.exit(1)
+    finally:
+        if profiler is not None:
+            # Also reached through sys.exit() and Ctrl-C, so interrupted runs keep their profile
+            profiler.stop()
+            profiler.write()
@@ -0,0 +1,232 @@
+"""
+Per-step timing and call counters for a sync run.
+
+The rate limit scheduler reports every backend call, retry and response size
+here; calls are attributed to whichever step is running, so the written JSON
+shows which step dominates and how that changes from run to run.
+"""
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+# Calls made before Step 1 (task lists, issue list, project snapshot) are reported under 'prefetch'
+PREFETCH_STEP = 'prefetch'
+
+
+class StepMetrics:
+    def __init__(self, name):
+        self.name = name
+        self.wall_time = 0.0
+        self.calls = {}
+        self.bytes_received = {}
+        self.retries = {}
+        # Reads answered from a local cache after a 304 revalidation
+        self.cache_hits = {}
+        self.items = 0
+        self.results = {}
+
+    def to_dict(self):
+        return {
+            'wall_time_s': round(self.wall_time, 4),
+            'calls': dict(self.calls),
+            'bytes_received': dict(self.bytes_received),
+            'retries': dict(self.retries),
+            'cache_hits': dict(self.cache_hits),
+            'items': self.items,
+            'results': dict(self.results),
+        }
+
+
+class SyncMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.steps = {}
+        self._current = None
+        self.started_at = datetime.now(timezone.utc)
+        self._started = time.perf_counter()
+        self.finished_at = None
+        self.wall_time = None
+        self.info = {}
+
+    def _step(self, name=None):
+        name = name or self._current or PREFETCH_STEP
+        step = self.steps.get(name)
+        if step is None:
+            step = self.steps[name] = StepMetrics(name)
+        return step
+
+    @contextmanager
+    def step(self, name):
+        """Attribute calls to `name` while the block runs and record its wall time."""
+        with self._lock:
+            previous, self._current = self._current, name
+            step = self._step(name)
+        started = time.perf_counter()
+        try:
+            yield step
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                step.wall_time += elapsed
+                self._current = previous
+
+    def _add(self, counter, backend, amount):
+        with self._lock:
+            values = getattr(self._step(), counter)
+            values[backend] = values.get(backend, 0) + amount
+
+    def record_call(self, backend):
+        self._add('calls', backend, 1)
+
+    def record_retry(self, backend):
+        self._add('retries', backend, 1)
+
+    def record_bytes(self, backend, size):
+        if size:
+            self._add('bytes_received', backend, size)
+
+    def record_cache_hit(self, backend):
+        self._add('cache_hits', backend, 1)
+
+    def add_items(self, count, step=None):
+        with self._lock:
+            self._step(step).items += count
+
+    def finish(self):
+        self.finished_at = datetime.now(timezone.utc)
+        self.wall_time = time.perf_counter() - self._started
+
+    def to_dict(self):
+        if self.finished_at is None:
+            self.finish()
+        totals = StepMetrics('total')
+        with self._lock:
+            steps = {name: step.to_dict() for name, step in self.steps.items()}
+            for step in self.steps.values():
+                totals.items += step.items
+                for counter in ('calls', 'bytes_received', 'retries', 'cache_hits'):
+                    merged = getattr(totals, counter)
+                    for backend, value in getattr(step, counter).items():
+                        merged[backend] = merged.get(backend, 0) + value
+        totals.wall_time = self.wall_time
+        total = totals.to_dict()
+        del total['results']
+        return {
+            **self.info,
+            'started_at': self.started_at.isoformat(),
+            'finished_at': self.finished_at.isoformat(),
+            'wall_time_s': round(self.wall_time, 4),
+            'steps': steps,
+            'totals': total,
+        }
+
+    def write(self, path):
+        write_json(self.to_dict(), path)
+
+
+def write_json(document, path):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _sum_into(merged, values):
+    for key, value in (values or {}).items():
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            merged[key] = merged.get(key, 0) + value
+
+
+def _merge_step(steps):
+    """Counters add up; wall time is the slowest shard's, since shards run side by side."""
+    merged = {'wall_time_s': 0.0, 'calls': {}, 'bytes_received': {}, 'retries': {}, 'cache_hits': {}, 'items': 0}
+    results = {}
+    for step in steps:
+        merged['wall_time_s'] = max(merged['wall_time_s'], step.get('wall_time_s') or 0.0)
+        for counter in ('calls', 'bytes_received', 'retries', 'cache_hits'):
+            _sum_into(merged[counter], step.get(counter))
+        merged['items'] += step.get('items', 0)
+        if 'results' in step:
+            _sum_into(results, step['results'])
+    if any('results' in step for step in steps):
+        merged['results'] = results
+    return merged
+
+
+def merge_metrics(documents):
+    """
+    Combine the metrics JSON written by each shard of a sharded run (--shard i/N) into one
+    document shaped like a single run's, plus per-shard wall times and any shards missing.
+    """
+    if not documents:
+        raise ValueError("No metrics to merge")
+    step_names = []
+    for document in documents:
+        step_names.extend(name for name in document.get('steps', {}) if name not in step_names)
+    summary = {}
+    for document in documents:
+        _sum_into(summary, document.get('summary'))
+
+    shards = [document.get('shard') for document in documents]
+    counts = {int(shard.split('/')[1]) for shard in shards if shard}
+    missing = []
+    if len(counts) > 1:
+        raise ValueError(f"Metrics come from runs with different shard counts: {sorted(counts)}")
+    if counts:
+        count = counts.pop()
+        present = {shard for shard in shards if shard}
+        missing = [f"{index}/{count}" for index in range(1, count + 1) if f"{index}/{count}" not in present]
+
+    merged = {
+        key: value for key, value in documents[0].items()
+        if key not in ('shard', 'started_at', 'finished_at', 'wall_time_s', 'steps', 'totals', 'summary')
+    }
+    merged.update({
+        'shards': shards,
+        'missing_shards': missing,
+        'shard_wall_time_s': {str(shard): document.get('wall_time_s') for shard, document in zip(shards, documents)},
+        'started_at': min(document['started_at'] for document in documents),
+        'finished_at': max(document['finished_at'] for document in documents),
+        'wall_time_s': max(document.get('wall_time_s') or 0.0 for document in documents),
+        'steps': {name: _merge_step([document['steps'][name] for document in documents
+                                     if name in document.get('steps', {})])
+                  for name in step_names},
+        'totals': _merge_step([document.get('totals', {}) for document in documents]),
+        'summary': summary,
+    })
+    return merged
+
+
+def merge_metrics_files(paths):
+    """
+    Load and merge per-shard metrics files. Multi-target results files ({'targets': ...})
+    are merged target by target; a target counts as failed if any shard failed it.
+    """
+    documents = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            documents.append(json.load(f))
+    if not all('targets' in document for document in documents):
+        return merge_metrics(documents)
+    names = []
+    for document in documents:
+        names.extend(name for name in document['targets'] if name not in names)
+    targets = {}
+    for name in names:
+        results = [document['targets'][name] for document in documents if name in document['targets']]
+        errors = [result['error'] for result in results if result.get('error')]
+        summary = {}
+        for result in results:
+            _sum_into(summary, result.get('summary'))
+        metrics = [result['metrics'] for result in results if result.get('metrics')]
+        targets[name] = {
+            'summary': summary,
+            'error': '; '.join(errors) if errors else None,
+            'metrics': merge_metrics(metrics) if metrics else None,
+        }
+    return {'targets': targets}
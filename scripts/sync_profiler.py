@@ -0,0 +1,219 @@
+"""
+Profiling mode for the Google Tasks sync (--profile).
+
+Runs the selected CLI mode under cProfile and writes three files sharing one
+prefix:
+
+  PREFIX.pstats     the raw profile (python -m pstats, snakeviz, ...)
+  PREFIX.collapsed  collapsed stacks, one "root;caller;callee <microseconds>"
+                    line per call path, for flamegraph.pl, speedscope or inferno
+  PREFIX.waits.txt  wall time spent in gh subprocesses, GitHub HTTP requests and
+                    Google/Gmail round trips, per backend and per call site
+
+cProfile attributes a blocked subprocess.run or socket read to the stdlib
+frame it sits in, so the wait report is recorded separately: the rate limit
+scheduler times every backend call and reports it to a WaitTracker, which
+names the sync engine method that issued it. Worker threads (async engine,
+--config targets, webhook handlers) get a profiler of their own that is
+merged into the same output.
+"""
+import os
+import sys
+import time
+import cProfile
+import pstats
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Frames that only forward a call to a backend; the call site is the first engine frame above them
+PLUMBING_FILES = {'rate_limiter.py', 'github_client.py', 'sync_profiler.py'}
+PLUMBING_FUNCTIONS = {'_run_gh', '_graphql', '_execute_google', '_send_google', '_run_io', '_map_io', '<lambda>', '<listcomp>'}
+
+# Collapsed stacks: paths below this many microseconds or deeper than this are folded into their parent
+MIN_STACK_MICROSECONDS = 1
+MAX_STACK_DEPTH = 128
+
+
+def call_site(frame):
+    """'qualname (file:line)' of the first sync engine frame at or above `frame` that is not backend plumbing."""
+    fallback = None
+    while frame is not None:
+        code = frame.f_code
+        filename = code.co_filename
+        if (os.path.dirname(os.path.abspath(filename)) == SCRIPTS_DIR
+                and os.path.basename(filename) not in PLUMBING_FILES):
+            name = getattr(code, 'co_qualname', code.co_name)
+            label = f"{name} ({os.path.basename(filename)}:{frame.f_lineno})"
+            if code.co_name not in PLUMBING_FUNCTIONS:
+                return label
+            # Fan-out workers start at the engine's lambda; keep it in case nothing above it is ours
+            fallback = fallback or label
+        frame = frame.f_back
+    return fallback or '<unknown>'
+
+
+class WaitTracker:
+    """Per backend and call site: calls, seconds in the call and seconds queued behind pacing/limits."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.sites = {}
+
+    def record(self, backend, queued, waited):
+        site = call_site(sys._getframe(1))
+        with self._lock:
+            entry = self.sites.setdefault((backend, site), [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += waited
+            entry[2] += queued
+
+    def rows(self):
+        """[(backend, site, calls, wait_seconds, queued_seconds)], longest total wait first."""
+        with self._lock:
+            rows = [(backend, site, calls, waited, queued)
+                    for (backend, site), (calls, waited, queued) in self.sites.items()]
+        return sorted(rows, key=lambda row: row[3] + row[4], reverse=True)
+
+    def report(self):
+        rows = self.rows()
+        lines = [f"{'backend':<8} {'calls':>7} {'wait s':>10} {'mean ms':>9} {'queued s':>9}  call site"]
+        for backend, site, calls, waited, queued in rows:
+            lines.append(f"{backend:<8} {calls:>7} {waited:>10.3f} {waited / calls * 1000:>9.1f} {queued:>9.3f}  {site}")
+        for backend in sorted({row[0] for row in rows}):
+            backend_rows = [row for row in rows if row[0] == backend]
+            lines.append(
+                f"total {backend}: {sum(row[2] for row in backend_rows)} calls, "
+                f"{sum(row[3] for row in backend_rows):.3f}s waiting, {sum(row[4] for row in backend_rows):.3f}s queued"
+            )
+        return '\n'.join(lines) + '\n'
+
+
+def _frame_label(func):
+    filename, lineno, name = func
+    if filename == '~':
+        # Builtins and C functions, e.g. "<method 'recv_into' of '_socket.socket' objects>"
+        label = name
+    else:
+        label = f"{name} ({os.path.basename(filename)}:{lineno})"
+    # ';' separates frames in the collapsed format (the count follows the last space)
+    return label.replace(';', ':')
+
+
+def collapsed_stacks(stats):
+    """
+    Rebuild per-path self time from a pstats caller graph.
+    cProfile only keeps caller -> callee edges, so a function's time on one path is its
+    total scaled by the share of its cumulative time that came through that edge.
+    """
+    entries = stats.stats
+    callees = {}
+    called = set()
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller, edge in callers.items():
+            if caller != func:
+                callees.setdefault(caller, []).append((func, edge[3]))
+                called.add(func)
+
+    lines = {}
+
+    def walk(func, path, scale, depth):
+        _, _, tt, ct, _ = entries[func]
+        self_us = int(tt * scale * 1_000_000)
+        children = callees.get(func, []) if depth < MAX_STACK_DEPTH else []
+        folded_us = 0
+        for callee, edge_ct in children:
+            callee_ct = entries[callee][3]
+            if callee in path or callee_ct <= 0:
+                continue
+            callee_scale = scale * min(1.0, edge_ct / callee_ct)
+            if callee_ct * callee_scale * 1_000_000 < MIN_STACK_MICROSECONDS:
+                continue
+            walk(callee, path + (callee,), callee_scale, depth + 1)
+        if depth >= MAX_STACK_DEPTH:
+            folded_us = int((ct - tt) * scale * 1_000_000)
+        if self_us + folded_us > 0:
+            key = ';'.join(_frame_label(f) for f in path)
+            lines[key] = lines.get(key, 0) + self_us + folded_us
+
+    roots = [func for func in entries if func not in called]
+    for root in roots:
+        walk(root, (root,), 1.0, 1)
+    return [f"{stack} {weight}" for stack, weight in sorted(lines.items())]
+
+
+class SyncProfiler:
+    """cProfile for the main thread and every thread started while it runs, plus a WaitTracker."""
+
+    def __init__(self, out_prefix):
+        for suffix in ('.pstats', '.collapsed'):
+            if out_prefix.endswith(suffix):
+                out_prefix = out_prefix[:-len(suffix)]
+        self.out_prefix = out_prefix
+        self.waits = WaitTracker()
+        self._profile = cProfile.Profile()
+        self._thread_profiles = []
+        self._lock = threading.Lock()
+        self._started = None
+        self.elapsed = 0.0
+
+    def _profile_thread(self, frame, event, arg):
+        # Installed with threading.setprofile: runs once in each new thread and swaps in its own profiler
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Python 3.12+ profiles every thread from the main profiler (sys.monitoring)
+            sys.setprofile(None)
+            return
+        with self._lock:
+            self._thread_profiles.append(profile)
+
+    def start(self):
+        self._started = time.perf_counter()
+        threading.setprofile(self._profile_thread)
+        self._profile.enable()
+
+    def stop(self):
+        self._profile.disable()
+        threading.setprofile(None)
+        self.elapsed = time.perf_counter() - self._started
+
+    def stats(self):
+        stats = pstats.Stats(self._profile)
+        with self._lock:
+            thread_profiles = list(self._thread_profiles)
+        for profile in thread_profiles:
+            try:
+                stats.add(profile)
+            except TypeError:
+                # Thread finished without recording a call
+                continue
+        return stats
+
+    def write(self):
+        """Write PREFIX.pstats, PREFIX.collapsed and PREFIX.waits.txt; returns their paths."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.out_prefix)), exist_ok=True)
+        stats = self.stats()
+        paths = {
+            'pstats': f"{self.out_prefix}.pstats",
+            'collapsed': f"{self.out_prefix}.collapsed",
+            'waits': f"{self.out_prefix}.waits.txt",
+        }
+        stats.dump_stats(paths['pstats'])
+        for kind, content in (
+            ('collapsed', '\n'.join(collapsed_stacks(stats)) + '\n'),
+            ('waits', f"wall time {self.elapsed:.3f}s\n" + self.waits.report()),
+        ):
+            temp_path = f"{paths[kind]}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            os.replace(temp_path, paths[kind])
+
+        for backend, site, calls, waited, queued in self.waits.rows()[:10]:
+            logger.info(f"Profile wait: {backend} {waited:.3f}s over {calls} calls (+{queued:.3f}s queued) in {site}")
+        logger.info(f"Wrote profile to {paths['pstats']}, {paths['collapsed']} and {paths['waits']}")
+        return paths
@@ -0,0 +1,53 @@
+"""
+Deterministic sharding of the Google Tasks sync across parallel workers.
+
+`--shard i/N` makes a worker handle only its share of the board: Google Tasks
+by task ID, issues by number and project items by item ID are assigned to
+one of N shards by a stable hash, so every worker (on any machine, in any
+run) agrees on who owns what without coordinating. Every shard still reads
+the full task, issue and project lists, which deduplication needs; only the
+writes and per-item lookups are split. Board-wide sweeps (archiving old
+Done items) run on shard 1 only.
+
+Each shard writes its own metrics file; `--merge-metrics` combines them
+(see sync_metrics.merge_metrics).
+"""
+import hashlib
+import argparse
+
+
+class Shard:
+    def __init__(self, index, count):
+        if count < 1 or not 1 <= index <= count:
+            raise ValueError(f"Shard {index}/{count} is out of range (expected 1 <= i <= N)")
+        self.index = index
+        self.count = count
+
+    @property
+    def is_primary(self):
+        """The shard that runs the board-wide steps."""
+        return self.index == 1
+
+    @staticmethod
+    def slot(key, count):
+        # Python's hash() is salted per process; the digest is the same on every worker
+        digest = hashlib.blake2b(str(key).encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'big') % count
+
+    def owns(self, key):
+        """Whether the task ID, issue number or project item ID `key` belongs to this shard."""
+        return self.count == 1 or self.slot(key, self.count) == self.index - 1
+
+    def __str__(self):
+        return f"{self.index}/{self.count}"
+
+
+def parse_shard(value):
+    """argparse type for `i/N` (1-based shard index of N)."""
+    index, sep, count = value.partition('/')
+    try:
+        if not sep:
+            raise ValueError(value)
+        return Shard(int(index), int(count))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid shard {value!r}: expected i/N with 1 <= i <= N, e.g. 2/4")
@@ -0,0 +1,213 @@
+"""
+Persistent link index for the Google Tasks sync.
+
+Maps each Google Task ID to what the sync knows about it (project item,
+issue number, tasklist, originating Gmail message, last known task status),
+so deduplication is an indexed lookup instead of a regex scan of every issue
+and project item body. Full scans are only needed to periodically verify it.
+
+Each link also stores a hash of the task content rendered into its draft item
+or issue (title, notes, due date), so edits made in Google Tasks are found by
+comparing hashes instead of diffing bodies.
+
+It also keeps completion tombstones: (task_id, source) pairs already confirmed
+complete in Google Tasks, so closed issues and Done items are not re-checked
+with tasks().get() on every run until they are archived.
+"""
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone, timedelta
+
+LINK_FIELDS = ('tasklist_id', 'project_item_id', 'issue_number', 'gmail_id', 'status', 'content_hash')
+
+
+class TaskLinkIndex:
+    def __init__(self, path):
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS links (
+                    task_id TEXT PRIMARY KEY,
+                    tasklist_id TEXT,
+                    project_item_id TEXT,
+                    issue_number INTEGER,
+                    gmail_id TEXT,
+                    status TEXT,
+                    content_hash TEXT,
+                    updated_at TEXT
+                )
+            """)
+            # Indexes created before content hashes were kept
+            columns = {row['name'] for row in self._conn.execute('PRAGMA table_info(links)')}
+            if 'content_hash' not in columns:
+                self._conn.execute('ALTER TABLE links ADD COLUMN content_hash TEXT')
+            self._conn.execute('CREATE INDEX IF NOT EXISTS links_project_item ON links(project_item_id)')
+            self._conn.execute('CREATE INDEX IF NOT EXISTS links_issue ON links(issue_number)')
+            self._conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS completions (
+                    task_id TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    confirmed_at TEXT NOT NULL,
+                    PRIMARY KEY (task_id, source)
+                )
+            """)
+
+    @staticmethod
+    def _now():
+        return datetime.now(timezone.utc).isoformat()
+
+    def get(self, task_id):
+        with self._lock:
+            row = self._conn.execute('SELECT * FROM links WHERE task_id = ?', (task_id,)).fetchone()
+        return dict(row) if row else None
+
+    def is_linked(self, task_id):
+        """True when the task already has a project item or issue."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT 1 FROM links WHERE task_id = ? AND (project_item_id IS NOT NULL OR issue_number IS NOT NULL)',
+                (task_id,)
+            ).fetchone()
+        return row is not None
+
+    def linked_task_ids(self):
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT task_id FROM links WHERE project_item_id IS NOT NULL OR issue_number IS NOT NULL'
+            ).fetchall()
+        return {row['task_id'] for row in rows}
+
+    def content_links(self):
+        """{task_id: (project_item_id, issue_number, content_hash)} for every linked task."""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT task_id, project_item_id, issue_number, content_hash FROM links '
+                'WHERE project_item_id IS NOT NULL OR issue_number IS NOT NULL'
+            ).fetchall()
+        return {row['task_id']: (row['project_item_id'], row['issue_number'], row['content_hash']) for row in rows}
+
+    def set_content_hashes(self, hashes):
+        """Store the content hash of many linked tasks at once ({task_id: hash})."""
+        now = self._now()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                'UPDATE links SET content_hash = ?, updated_at = ? WHERE task_id = ?',
+                [(content_hash, now, task_id) for task_id, content_hash in hashes.items()]
+            )
+
+    def find_by_project_item(self, item_id):
+        with self._lock:
+            row = self._conn.execute('SELECT * FROM links WHERE project_item_id = ?', (item_id,)).fetchone()
+        return dict(row) if row else None
+
+    def find_by_issue(self, issue_number):
+        with self._lock:
+            row = self._conn.execute('SELECT * FROM links WHERE issue_number = ?', (int(issue_number),)).fetchone()
+        return dict(row) if row else None
+
+    def _upsert(self, task_id, fields):
+        columns = [name for name in LINK_FIELDS if fields.get(name) is not None]
+        values = [fields[name] for name in columns]
+        placeholders = ', '.join('?' for _ in columns)
+        updates = ', '.join(f"{name} = excluded.{name}" for name in columns)
+        insert_columns = ', '.join(['task_id'] + columns + ['updated_at'])
+        sql = (
+            f"INSERT INTO links ({insert_columns}) VALUES (?{', ' if columns else ''}{placeholders}, ?) "
+            f"ON CONFLICT(task_id) DO UPDATE SET {updates + ', ' if updates else ''}updated_at = excluded.updated_at"
+        )
+        self._conn.execute(sql, [task_id] + values + [self._now()])
+
+    def upsert(self, task_id, **fields):
+        """Insert or update a link; fields left as None keep their stored value."""
+        unknown = set(fields) - set(LINK_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown link fields: {sorted(unknown)}")
+        with self._lock, self._conn:
+            self._upsert(task_id, fields)
+
+    def set_status(self, task_id, status):
+        self.upsert(task_id, status=status)
+
+    def replace_links(self, links):
+        """
+        Apply the result of a full verification scan: upsert every link found and clear the
+        project item / issue of indexed tasks the scan no longer sees (deleted on GitHub).
+        """
+        with self._lock, self._conn:
+            for task_id, fields in links.items():
+                self._upsert(task_id, fields)
+            found = list(links)
+            self._conn.execute('CREATE TEMP TABLE IF NOT EXISTS verified_ids (task_id TEXT PRIMARY KEY)')
+            self._conn.execute('DELETE FROM verified_ids')
+            self._conn.executemany('INSERT OR IGNORE INTO verified_ids VALUES (?)', [(t,) for t in found])
+            self._conn.execute("""
+                UPDATE links SET project_item_id = NULL, issue_number = NULL, updated_at = ?
+                WHERE task_id NOT IN (SELECT task_id FROM verified_ids)
+                  AND (project_item_id IS NOT NULL OR issue_number IS NOT NULL)
+            """, (self._now(),))
+            self._conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('last_verified', ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (self._now(),)
+            )
+
+    def completed_pairs(self, ttl_hours=None, now=None):
+        """(task_id, source) pairs confirmed complete, limited to the last ttl_hours when given."""
+        with self._lock:
+            if ttl_hours is None:
+                rows = self._conn.execute('SELECT task_id, source FROM completions').fetchall()
+            else:
+                cutoff = (now or datetime.now(timezone.utc)) - timedelta(hours=ttl_hours)
+                rows = self._conn.execute(
+                    'SELECT task_id, source FROM completions WHERE confirmed_at >= ?', (cutoff.isoformat(),)
+                ).fetchall()
+        return {(row['task_id'], row['source']) for row in rows}
+
+    def record_completions(self, pairs):
+        """Tombstone (task_id, source) pairs just confirmed complete; refreshes their confirmation time."""
+        pairs = [(task_id, source) for task_id, source in pairs if task_id and source]
+        if not pairs:
+            return
+        now = self._now()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO completions (task_id, source, confirmed_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(task_id, source) DO UPDATE SET confirmed_at = excluded.confirmed_at",
+                [(task_id, source, now) for task_id, source in pairs]
+            )
+
+    def forget_completions(self, pairs):
+        """Drop tombstones whose task turned out to be open again."""
+        with self._lock, self._conn:
+            self._conn.executemany('DELETE FROM completions WHERE task_id = ? AND source = ?', list(pairs))
+
+    def prune_completions(self, ttl_hours, now=None):
+        """Delete tombstones older than ttl_hours; returns the number removed."""
+        cutoff = (now or datetime.now(timezone.utc)) - timedelta(hours=ttl_hours)
+        with self._lock, self._conn:
+            cursor = self._conn.execute('DELETE FROM completions WHERE confirmed_at < ?', (cutoff.isoformat(),))
+        return cursor.rowcount
+
+    def needs_verification(self, interval_hours, now=None):
+        now = now or datetime.now(timezone.utc)
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'last_verified'").fetchone()
+        if not row:
+            return True
+        try:
+            last_verified = datetime.fromisoformat(row['value'])
+        except (ValueError, TypeError):
+            return True
+        return now - last_verified >= timedelta(hours=interval_hours)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
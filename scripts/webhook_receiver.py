@@ -0,0 +1,168 @@
+"""
+GitHub webhook receiver for the Google Tasks sync.
+
+Accepts `issues` and `projects_v2_item` deliveries, verifies their
+X-Hub-Signature-256 HMAC, and runs only the per-item path of the sync for
+the item that changed: a closed issue completes its Google Task, and a
+project item moved to Done completes the task behind it. The periodic full
+sync becomes a safety net instead of the only way changes are noticed.
+
+Deliveries are acknowledged with 202 and applied in order by one worker
+thread, since the sync engine's Google client is not thread-safe. Recorded
+payloads ({"event": ..., "payload": ...}) can be replayed through the same
+dispatcher without a server.
+"""
+import hmac
+import json
+import queue
+import hashlib
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+logger = logging.getLogger(__name__)
+
+# GitHub caps webhook payloads at 25 MB
+MAX_PAYLOAD_BYTES = 25 * 1024 * 1024
+
+
+def verify_signature(secret, body, signature_header):
+    """Check an `X-Hub-Signature-256: sha256=<hex>` header against the raw request body."""
+    if not secret or not signature_header or not signature_header.startswith('sha256='):
+        return False
+    expected = 'sha256=' + hmac.new(secret.encode('utf-8'), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature_header)
+
+
+class WebhookDispatcher:
+    """Map a webhook event to the sync engine's per-item path; returns a small result dict."""
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def handle(self, event, payload):
+        if event == 'ping':
+            return {'handled': True, 'action': 'pong'}
+        if event == 'issues':
+            return self._handle_issue(payload)
+        if event == 'projects_v2_item':
+            return self._handle_project_item(payload)
+        return {'handled': False, 'reason': f"unsupported event {event}"}
+
+    def _handle_issue(self, payload):
+        action = payload.get('action')
+        issue = payload.get('issue') or {}
+        repository = (payload.get('repository') or {}).get('full_name', '')
+        expected = f"{self.engine.owner}/{self.engine.repo}"
+        if repository and repository.lower() != expected.lower():
+            return {'handled': False, 'reason': f"repository {repository} is not {expected}"}
+        if action != 'closed':
+            return {'handled': False, 'reason': f"issue action {action} needs no sync"}
+        logger.info(f"Webhook: issue #{issue.get('number')} closed")
+        task_id = self.engine._complete_google_task_from_issue(issue.get('number'), issue.get('body') or '')
+        return {'handled': task_id is not None, 'action': 'complete_from_issue', 'task_id': task_id}
+
+    def _handle_project_item(self, payload):
+        action = payload.get('action')
+        item = payload.get('projects_v2_item') or {}
+        if item.get('project_node_id') and item['project_node_id'] != self.engine.PROJECT_ID:
+            return {'handled': False, 'reason': f"project {item['project_node_id']} is not synced"}
+        if action != 'edited':
+            return {'handled': False, 'reason': f"project item action {action} needs no sync"}
+        field_value = (payload.get('changes') or {}).get('field_value') or {}
+        if field_value.get('field_node_id') != self.engine.STATUS_FIELD_ID:
+            return {'handled': False, 'reason': 'not a Status change'}
+        # Newer deliveries carry the new option; skip the lookup when it is clearly not Done
+        to = field_value.get('to') or {}
+        if to.get('id') and to['id'] != self.engine.DONE_OPTION_ID:
+            return {'handled': False, 'reason': f"status changed to {to.get('name', to['id'])}"}
+
+        project_item = self.engine.fetch_project_item(item.get('node_id'))
+        if project_item is None:
+            return {'handled': False, 'reason': f"project item {item.get('node_id')} not found"}
+        if project_item.get('status') not in self.engine.DONE_STATUSES:
+            return {'handled': False, 'reason': f"status is {project_item.get('status') or 'empty'}"}
+        logger.info(f"Webhook: project item {project_item['id']} moved to Done")
+        task_id = self.engine.complete_task_from_project_item(project_item)
+        return {'handled': task_id is not None, 'action': 'complete_from_done_item', 'task_id': task_id}
+
+    def replay(self, records):
+        """Dispatch recorded deliveries ({'event', 'payload'} dicts) in order; returns their results."""
+        results = []
+        for record in records:
+            result = self.handle(record['event'], record['payload'])
+            logger.info(f"Replayed {record['event']}: {result}")
+            results.append(result)
+        return results
+
+
+class WebhookServer:
+    def __init__(self, dispatcher, secret, host='127.0.0.1', port=8787, path='/webhook'):
+        if not secret:
+            raise ValueError("A webhook secret is required to verify deliveries")
+        self.dispatcher = dispatcher
+        self.secret = secret
+        self.path = path
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._work, name='webhook-worker', daemon=True)
+        self.httpd = HTTPServer((host, port), self._handler_class())
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self, status, message):
+                body = json.dumps({'message': message}).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                if self.path.split('?', 1)[0] != server.path:
+                    return self._reply(404, 'not found')
+                length = int(self.headers.get('Content-Length') or 0)
+                if length > MAX_PAYLOAD_BYTES:
+                    return self._reply(413, 'payload too large')
+                body = self.rfile.read(length)
+                if not verify_signature(server.secret, body, self.headers.get('X-Hub-Signature-256')):
+                    logger.warning(f"Rejected webhook delivery {self.headers.get('X-GitHub-Delivery')}: bad signature")
+                    return self._reply(401, 'invalid signature')
+                try:
+                    payload = json.loads(body)
+                except ValueError:
+                    return self._reply(400, 'invalid JSON')
+                event = self.headers.get('X-GitHub-Event', '')
+                server._queue.put((event, payload, self.headers.get('X-GitHub-Delivery')))
+                return self._reply(202, 'accepted')
+
+            def log_message(self, format, *args):
+                logger.debug(f"webhook {self.address_string()} {format % args}")
+
+        return Handler
+
+    def _work(self):
+        while True:
+            event, payload, delivery = self._queue.get()
+            if event is None:
+                return
+            try:
+                result = self.dispatcher.handle(event, payload)
+                logger.info(f"Webhook delivery {delivery} ({event}): {result}")
+            except Exception as e:
+                logger.error(f"Webhook delivery {delivery} ({event}) failed: {e}", exc_info=True)
+
+    def serve_forever(self):
+        host, port = self.httpd.server_address[:2]
+        logger.info(f"Listening for GitHub webhooks on http://{host}:{port}{self.path}")
+        self._worker.start()
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.httpd.server_close()
+            self._queue.put((None, None, None))
+            self._worker.join()
+
+    def shutdown(self):
+        self.httpd.shutdown()
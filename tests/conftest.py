@@ -0,0 +1,56 @@
+"""
+Shared fixtures for the sync tests: a synthetic board served by the fake `gh`
+and in-memory Google Tasks / Gmail fakes from scripts/benchmark_sync.py.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+import benchmark_sync  # noqa: E402
+from rate_limiter import RateLimitScheduler  # noqa: E402
+from sync_google_tasks import GoogleTasksSync  # noqa: E402
+
+
+class FakeBoard:
+    def __init__(self, directory, scale):
+        self.directory = directory
+        self.fixtures = benchmark_sync.generate_fixtures(scale, seed=0, tasklists=2)
+        self.fixture_dir = os.path.join(directory, 'fixtures')
+        benchmark_sync.write_fixtures(self.fixtures, self.fixture_dir)
+        self.bin_dir = benchmark_sync.install_fake_gh(directory)
+        self.service = benchmark_sync.FakeTasksService(self.fixtures['tasklists'], self.fixtures['tasks'])
+        self.workspace_skill = benchmark_sync.FakeWorkspaceSkill()
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def engine(self, engine_class=GoogleTasksSync, **kwargs):
+        """A sync engine on this board; state files live in the board directory unless overridden."""
+        options = {
+            'owner': 'bench-owner',
+            'repo': 'bench-repo',
+            'state_file': self.path('sync_state.json'),
+            'link_index_file': self.path('task_links.sqlite3'),
+            'mutation_journal_file': self.path('mutation_journal.sqlite3'),
+            'checkpoint_file': self.path('checkpoint.json'),
+            'scheduler': RateLimitScheduler(rates={'github': 0, 'google': 0, 'gmail': 0}),
+            'service': self.service,
+            'workspace_skill': self.workspace_skill,
+        }
+        options.update(kwargs)
+        return engine_class(**options)
+
+    def gh_calls(self):
+        return benchmark_sync.read_gh_calls(self.fixture_dir)
+
+
+@pytest.fixture
+def board(tmp_path, monkeypatch):
+    board = FakeBoard(str(tmp_path), scale=60)
+    monkeypatch.setenv('PATH', board.bin_dir + os.pathsep + os.environ.get('PATH', ''))
+    monkeypatch.setenv('FAKE_GH_FIXTURES', board.fixture_dir)
+    monkeypatch.setenv('GH_TOKEN', 'test')
+    return board
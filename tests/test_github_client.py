@@ -0,0 +1,74 @@
+import json
+import subprocess
+
+import pytest
+
+from github_client import GitHubClientError, ProjectMutationBatcher
+
+
+def failing_graphql(error):
+    def graphql(query, variables, allow_partial=False):
+        raise error
+    return graphql
+
+
+@pytest.mark.parametrize('error, uncertain', [
+    (GitHubClientError('GraphQL error: invalid input', status=200), False),
+    (GitHubClientError('POST graphql failed with HTTP 422', status=422), False),
+    (subprocess.CalledProcessError(1, 'gh', stderr='GraphQL: Title cannot be blank (addProjectV2DraftIssue)'), False),
+    (subprocess.CalledProcessError(1, 'gh', output=json.dumps({'errors': [{'message': 'bad'}]}),
+                                   stderr='gh: bad'), False),
+    (GitHubClientError('POST graphql failed with HTTP 502', status=502), True),
+    (subprocess.CalledProcessError(1, 'gh', stderr='HTTP 502: Bad Gateway'), True),
+    (subprocess.CalledProcessError(1, 'gh', stderr='error connecting to api.github.com'), True),
+    (subprocess.TimeoutExpired('gh', 30), True),
+    (ConnectionError('connection reset'), True),
+])
+def test_failed_batch_is_uncertain_only_when_it_may_have_landed(error, uncertain):
+    batcher = ProjectMutationBatcher(failing_graphql(error))
+    mutations = [batcher.add_draft('PVT_1', f'title {index}', 'body') for index in range(2)]
+    batcher.flush()
+    for mutation in mutations:
+        assert mutation.done and not mutation.ok
+        assert mutation.exception is error
+        assert mutation.uncertain is uncertain
+
+
+def test_partial_errors_map_to_their_aliases():
+    sent = []
+
+    def graphql(query, variables, allow_partial=False):
+        sent.append((query, variables))
+        return {
+            'data': {'m0': {'projectItem': {'id': 'PVTI_0'}}, 'm1': None, 'm2': None},
+            'errors': [
+                {'message': 'Title cannot be blank', 'path': ['m1']},
+                {'message': 'Something went wrong'},
+            ],
+        }
+
+    batcher = ProjectMutationBatcher(graphql)
+    mutations = [batcher.add_draft('PVT_1', title, 'body') for title in ('first', '', 'third')]
+    batcher.flush()
+
+    query, variables = sent[0]
+    assert 'm2: addProjectV2DraftIssue(input: {projectId: $m2_projectId' in query
+    assert variables['m1_title'] == '' and variables['m2_title'] == 'third'
+    assert mutations[0].ok and mutations[0].result == {'projectItem': {'id': 'PVTI_0'}}
+    assert mutations[1].error == 'Title cannot be blank'
+    # No alias of its own: the unscoped error is reported
+    assert mutations[2].error == 'Something went wrong'
+    assert not any(mutation.uncertain for mutation in mutations)
+
+
+def test_batches_split_by_size_against_the_fake_board(board):
+    engine = board.engine(mutation_batch_size=2)
+    batcher = engine._new_batcher()
+    mutations = [batcher.add_draft(engine.PROJECT_ID, f"title {index}", 'body', key=index) for index in range(5)]
+    batcher.flush()
+
+    assert batcher.request_count == 3
+    assert board.gh_calls().get('api graphql mutation') == 3
+    assert all(mutation.ok for mutation in mutations)
+    item_ids = [mutation.result['projectItem']['id'] for mutation in mutations]
+    assert len(set(item_ids)) == 5
@@ -0,0 +1,58 @@
+import json
+import os
+
+import pytest
+
+import sync_google_tasks
+
+SEARCH_LIMIT = 150
+MARKED = '"Origin: Google Tasks" in:body'
+
+
+@pytest.fixture
+def small_search_window(board, monkeypatch):
+    """Lower the 1000-result search window on both sides so a board of hundreds of issues crosses it."""
+    monkeypatch.setenv('FAKE_GH_SEARCH_LIMIT', str(SEARCH_LIMIT))
+    monkeypatch.setattr(sync_google_tasks, 'ISSUE_SEARCH_RESULT_LIMIT', SEARCH_LIMIT)
+    return board
+
+
+def write_issues(board, created_at):
+    """Replace the board's issues with one marked issue per createdAt timestamp given."""
+    issues = [{
+        'number': number,
+        'title': f"Issue {number}",
+        'body': f"Origin: Google Tasks task-{number}\nTasklist-ID: tasklist-00",
+        'state': 'OPEN',
+        'createdAt': created,
+        'updatedAt': created,
+    } for number, created in enumerate(created_at, start=1)]
+    with open(os.path.join(board.fixture_dir, 'issues.json'), 'w', encoding='utf-8') as f:
+        json.dump(issues, f)
+    return issues
+
+
+def search_queries(board):
+    return board.gh_calls().get('api graphql query', 0)
+
+
+def test_search_continues_past_the_result_window(small_search_window):
+    board = small_search_window
+    # Three issues per second, so every window boundary splits issues created together
+    issues = write_issues(board, [f"2026-01-01T00:{index // 180:02d}:{index // 3 % 60:02d}Z" for index in range(400)])
+
+    found = board.engine().search_issues(MARKED)
+    numbers = [issue['number'] for issue in found]
+    assert len(numbers) == len(set(numbers))
+    assert sorted(numbers) == [issue['number'] for issue in issues]
+
+
+def test_search_stops_when_a_window_cannot_advance(small_search_window):
+    board = small_search_window
+    # More issues created in the same second than one window holds: created:>= cannot move past them
+    write_issues(board, ['2026-01-01T00:00:00Z'] * (SEARCH_LIMIT + 50))
+
+    found = board.engine().search_issues(MARKED)
+    assert len({issue['number'] for issue in found}) == len(found) == SEARCH_LIMIT
+    # One window, then one repeat of it that shows no progress
+    assert search_queries(board) == 4
@@ -0,0 +1,24 @@
+import subprocess
+
+from sync_google_tasks import PROJECT_ITEMS_QUERY
+
+
+def test_failed_project_fetch_keeps_the_link_index(board, caplog):
+    board.engine().sync()
+    engine = board.engine(verify_hours=0)
+    linked = engine.link_index.linked_task_ids()
+    assert linked
+
+    graphql = engine._graphql
+
+    def project_fetch_fails(query, variables=None, **kwargs):
+        if query == PROJECT_ITEMS_QUERY:
+            raise subprocess.CalledProcessError(1, 'gh', stderr='HTTP 502: Bad Gateway')
+        return graphql(query, variables, **kwargs)
+
+    engine._graphql = project_fetch_fails
+    assert engine.fetch_project_items() == []
+    assert engine._get_existing_task_ids(engine.get_all_issues(), []) >= linked
+    assert 'Skipping link index verification' in caplog.text
+    assert engine.link_index.linked_task_ids() == linked
+    assert engine.link_index.needs_verification(engine.verify_hours)
@@ -0,0 +1,76 @@
+import json
+import sqlite3
+import subprocess
+
+import pytest
+
+from mutation_journal import MutationJournal, CLAIMED, UNCERTAIN
+
+
+def journal_states(path):
+    with sqlite3.connect(path) as conn:
+        return dict(conn.execute('SELECT state, COUNT(*) FROM mutations GROUP BY state').fetchall())
+
+
+def test_killed_run_resumes_its_own_claims(board, caplog):
+    first = board.engine(checkpoint_every=5, mutation_batch_size=5)
+    send = first.create_project_draft_items
+    calls = []
+
+    def killed_after_first_batch(tasks):
+        calls.append(len(tasks))
+        if len(calls) == 2:
+            raise KeyboardInterrupt
+        return send(tasks)
+
+    first.create_project_draft_items = killed_after_first_batch
+    with pytest.raises(KeyboardInterrupt):
+        first.sync()
+    journal = board.path('mutation_journal.sqlite3')
+    # Only the batch being sent when the run died is left claimed
+    assert journal_states(journal) == {'committed': 5, 'pending': 5}
+
+    # A new process (new journal owner) resumes the run
+    resumed = board.engine(resume=True)
+    summary = resumed.sync()
+    assert 'claimed by another sync worker' not in caplog.text
+    states = journal_states(journal)
+    assert 'pending' not in states
+    assert summary['created_drafts'] == states['committed'] > 5
+
+    caplog.clear()
+    assert board.engine().sync()['created_drafts'] == 0
+    assert 'claimed by another sync worker' not in caplog.text
+
+
+def test_tasks_held_by_another_worker_keep_the_watermark(board):
+    tasklist_id = board.fixtures['tasklists'][0]['id']
+    other = MutationJournal(board.path('mutation_journal.sqlite3'), owner='other-worker')
+    other.claim('create_draft', [task['id'] for task in board.fixtures['tasks'][tasklist_id]])
+
+    engine = board.engine(incremental=True)
+    engine.sync()
+    with open(board.path('sync_state.json'), 'r', encoding='utf-8') as f:
+        marks = json.load(f)['tasklists']
+    assert 'updated_min' not in marks.get(tasklist_id, {})
+    assert all(marks[tl['id']].get('updated_min') for tl in board.fixtures['tasklists'][1:])
+
+
+@pytest.mark.parametrize('error, released', [
+    (subprocess.CalledProcessError(1, 'gh', stderr='GraphQL: Title cannot be blank'), True),
+    (subprocess.CalledProcessError(1, 'gh', stderr='HTTP 502: Bad Gateway'), False),
+    (subprocess.CalledProcessError(1, 'gh', stderr='error connecting to api.github.com'), False),
+    (subprocess.TimeoutExpired('gh', 30), False),
+])
+def test_rejected_creation_releases_its_claim(board, error, released):
+    engine = board.engine()
+    task = dict(board.fixtures['tasks'][board.fixtures['tasklists'][0]['id']][0])
+    engine.journal.claim('create_draft', [task['id']])
+
+    def fail(title, body):
+        raise error
+
+    engine._create_draft_item = fail
+    assert engine.create_project_draft_item(task) is False
+    state, _ = engine.journal.claim('create_draft', [task['id']])[task['id']]
+    assert state == (CLAIMED if released else UNCERTAIN)
@@ -0,0 +1,39 @@
+from rate_limiter import AdaptiveLimiter, RateLimitScheduler
+from sync_google_tasks import AsyncGoogleTasksSync, shared_concurrency
+
+
+def test_views_keep_the_root_concurrency_cap():
+    root = RateLimitScheduler()
+    root.set_concurrency('github', 2)
+    for limit in (8, 4):
+        root.view().set_concurrency('github', limit)
+    assert root._limiter('github').max_limit == 2
+
+    view = root.view()
+    view.set_concurrency('gmail', 1)
+    assert root._limiter('gmail') is view._limiter('gmail')
+
+
+def test_set_max_keeps_the_adaptive_limit():
+    limiter = AdaptiveLimiter(8)
+    limiter.acquire()
+    limiter.release(throttled=True)
+    assert limiter.limit == 4
+
+    limiter.set_max(16)
+    assert (limiter.max_limit, limiter.limit) == (16, 4)
+    limiter.set_max(2)
+    assert (limiter.max_limit, limiter.limit) == (2, 2)
+
+
+def test_config_mode_caps_leave_room_for_async_engines(board):
+    root = RateLimitScheduler(rates={'github': 0, 'google': 0, 'gmail': 0})
+    for backend, limit in shared_concurrency(2, {'github': 16}).items():
+        root.set_concurrency(backend, limit)
+    engines = [board.engine(AsyncGoogleTasksSync, scheduler=root.view(), concurrency={'github': 16})
+               for _ in range(2)]
+
+    caps = {backend: root._limiter(backend).max_limit for backend in ('github', 'google', 'gmail')}
+    assert caps == {'github': 16, 'google': 8, 'gmail': 1}
+    assert engines[0].scheduler._limiter('github') is root._limiter('github')
+    assert shared_concurrency(4) == {'github': 4, 'google': 4}
@@ -0,0 +1,80 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from github_client import GitHubClient
+from rest_cache import ConditionalRequestCache
+
+ISSUES = [
+    {'number': 1, 'state': 'closed', 'body': 'Origin: Google Tasks task-1\nNote: done'},
+    {'number': 2, 'state': 'closed', 'body': 'Unrelated closed issue'},
+    {'number': 3, 'state': 'open', 'body': 'Unrelated open issue'},
+    {'number': 4, 'state': 'open', 'body': 'A pull request', 'pull_request': {}},
+]
+
+
+class IssuesHandler(BaseHTTPRequestHandler):
+    etag = '"issues-v1"'
+
+    def do_GET(self):
+        self.server.requests.append((self.path, self.headers.get('If-None-Match')))
+        if not self.path.startswith('/repos/o/r/issues?'):
+            self.send_error(404)
+            return
+        if self.headers.get('If-None-Match') == self.etag:
+            self.send_response(304)
+            self.send_header('ETag', self.etag)
+            self.end_headers()
+            return
+        body = json.dumps(ISSUES).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', self.etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def api():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), IssuesHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_repeat_issue_read_is_served_from_the_cache(board, api, tmp_path):
+    cache_file = str(tmp_path / 'rest_cache.sqlite3')
+
+    def read_issues():
+        client = GitHubClient(token='test', api_url=f"http://127.0.0.1:{api.server_port}",
+                              cache=ConditionalRequestCache(cache_file))
+        engine = board.engine(owner='o', repo='r', github_client=client)
+        issues = engine.get_all_issues()
+        hits = sum(step.cache_hits.get('github', 0) for step in engine.metrics.steps.values())
+        return sorted(issue['number'] for issue in issues), hits
+
+    assert read_issues() == ([1, 3], 0)
+    assert read_issues() == ([1, 3], 1)
+    assert [etag for _, etag in api.requests] == [None, IssuesHandler.etag]
+
+
+def test_incremental_issue_read_stays_on_search(board, api, tmp_path):
+    client = GitHubClient(token='test', api_url=f"http://127.0.0.1:{api.server_port}",
+                          cache=ConditionalRequestCache(str(tmp_path / 'rest_cache.sqlite3')))
+    engine = board.engine(owner='o', repo='r', github_client=client, incremental=True)
+    searches = []
+    engine._get_issues_updated_since = lambda now: '2026-01-01T00:00:00Z'
+    engine.search_issues = lambda terms: searches.append(terms) or []
+
+    assert engine.get_all_issues() == []
+    assert searches == ['updated:>=2026-01-01T00:00:00Z']
+    assert api.requests == []
@@ -0,0 +1,71 @@
+import argparse
+
+import pytest
+
+import benchmark_sync
+from sync_metrics import merge_metrics
+from sync_shard import Shard, parse_shard
+
+
+def run(board, name, shard=None, service=None):
+    """One sync on the board with its own watermarks and checkpoint; returns (summary, metrics)."""
+    engine = board.engine(
+        shard=shard,
+        service=service or benchmark_sync.FakeTasksService(board.fixtures['tasklists'], board.fixtures['tasks']),
+        state_file=board.path(f'{name}_state.json'),
+        checkpoint_file=board.path(f'{name}_checkpoint.json'),
+        link_index_file=board.path(f'{name}_links.sqlite3'),
+        mutation_journal_file=board.path(f'{name}_journal.sqlite3'),
+    )
+    summary = engine.sync()
+    return summary, engine.metrics.to_dict()
+
+
+def test_every_key_has_exactly_one_owner():
+    keys = [f"bench-task-{index:07d}" for index in range(500)] + list(range(1, 500))
+    shards = [Shard(index, 4) for index in range(1, 5)]
+    owners = [[shard.index for shard in shards if shard.owns(key)] for key in keys]
+    assert all(len(owner) == 1 for owner in owners)
+    assert {owner[0] for owner in owners} == {1, 2, 3, 4}
+    # A fixed digest, not the per-process salted hash(): every worker agrees on the owner
+    assert Shard.slot('bench-task-0000000', 4) == 3
+    assert Shard(1, 1).owns('anything')
+
+
+def test_project_items_follow_their_issue(board):
+    engine = board.engine(shard=Shard(1, 2))
+    issue_item = {'id': 'PVTI_x', 'content': {'type': 'Issue', 'number': 7}}
+    draft_item = {'id': 'PVTI_y', 'content': {'type': 'DraftIssue'}}
+    assert engine._owns_item(issue_item) == engine._owns(7)
+    assert engine._owns_item(draft_item) == engine._owns('PVTI_y')
+
+
+@pytest.mark.parametrize('value', ['0/2', '3/2', '1', 'a/b', '1/0'])
+def test_invalid_shards_are_rejected(value):
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_shard(value)
+
+
+def test_sharded_run_merges_to_the_unsharded_summary(board):
+    baseline, _ = run(board, 'unsharded')
+
+    service = benchmark_sync.FakeTasksService(board.fixtures['tasklists'], board.fixtures['tasks'])
+    runs = [run(board, f'shard{index}', Shard(index, 2), service) for index in (1, 2)]
+    merged = merge_metrics([document for _, document in runs])
+
+    assert merged['shards'] == ['1/2', '2/2'] and merged['missing_shards'] == []
+    assert merged['summary'] == {key: value for key, value in baseline.items() if isinstance(value, int)}
+    assert merged['wall_time_s'] == max(document['wall_time_s'] for _, document in runs)
+    for backend, calls in merged['totals']['calls'].items():
+        assert calls == sum(document['totals']['calls'].get(backend, 0) for _, document in runs)
+    # Only the primary shard sweeps the board for old Done items
+    assert 'archive' in runs[0][1]['steps'] and 'archive' not in runs[1][1]['steps']
+
+
+def test_merge_reports_missing_and_mismatched_shards(board):
+    _, first = run(board, 'shard1', Shard(1, 2))
+    assert merge_metrics([first])['missing_shards'] == ['2/2']
+    with pytest.raises(ValueError):
+        merge_metrics([first, dict(first, shard='1/3')])
+    with pytest.raises(ValueError):
+        merge_metrics([])
@@ -0,0 +1,66 @@
+from github_client import ProjectMutationBatcher
+
+
+def edit_linked_tasks(board, marker):
+    """Edit the notes of every task whose issue or draft body carries a Gmail-ID; returns their IDs."""
+    bodies = [issue['body'] for issue in board.fixtures['issues']]
+    bodies += [node['content'].get('body') or '' for node in board.fixtures['project_nodes']]
+    edited = set()
+    for tasks in board.service._tasks.values():
+        for task in tasks.values():
+            origin = f"Origin: Google Tasks {task['id']}\n"
+            if any(origin in body and 'Gmail-ID:' in body for body in bodies):
+                task['notes'] = f"{marker}\n{task['notes']}"
+                edited.add(task['id'])
+    return edited
+
+
+def test_edit_round_trip_keeps_foreign_lines(board, monkeypatch):
+    board.engine().sync()
+    edited = edit_linked_tasks(board, 'Edited notes')
+    assert edited
+
+    issue_bodies = {}
+    draft_bodies = []
+    update_draft = ProjectMutationBatcher.update_draft
+
+    def record_draft(batcher, draft_issue_id, title, body, key=None):
+        draft_bodies.append(body)
+        return update_draft(batcher, draft_issue_id, title, body, key=key)
+
+    monkeypatch.setattr(ProjectMutationBatcher, 'update_draft', record_draft)
+    engine = board.engine()
+    monkeypatch.setattr(engine, '_update_issue', lambda number, title, body: issue_bodies.__setitem__(number, body))
+    summary = engine.sync()
+
+    bodies = list(issue_bodies.values()) + draft_bodies
+    assert summary['updated_issues'] == len(issue_bodies) > 0
+    assert summary['updated_drafts'] == len(draft_bodies) > 0
+    assert len(bodies) == len(edited)
+    for body in bodies:
+        assert 'Note: Edited notes\n' in body
+        assert body.count('Gmail-ID: gmail') == 1
+        assert body.count('Origin: Google Tasks') == 1
+
+
+def test_merge_keeps_text_around_the_task_section(board):
+    engine = board.engine()
+    task = {'id': 'task-1', 'tasklist_id': 'list-1', 'title': 'Task', 'notes': 'new notes', 'due': '2026-10-20T00:00:00Z'}
+    stale = engine._build_task_body(dict(task, notes='old notes\nsecond line', due=None))
+    current = f"Context written by hand\n\n{stale}\nGmail-ID: abc123\nFollow-up written by hand"
+
+    merged = engine._merge_task_body(current, task)
+    assert merged == (f"Context written by hand\n\n{engine._build_task_body(task)}\n"
+                      "Gmail-ID: abc123\nFollow-up written by hand")
+    assert engine._merge_task_body(merged, task) == merged
+    assert engine._merge_task_body('', task) == engine._build_task_body(task)
+
+
+def test_note_lines_shaped_like_trailers_are_replaced_with_the_note(board):
+    engine = board.engine()
+    task = {'id': 'task-1', 'tasklist_id': 'list-1', 'title': 'Task', 'notes': 'just milk'}
+    stale = engine._build_task_body(dict(task, notes='Groceries\nFollow-Up: call Bob\nbring bags'))
+
+    assert engine._merge_task_body(stale, task) == engine._build_task_body(task)
+    merged = engine._merge_task_body(f"{stale}\nGmail-ID: abc123", task)
+    assert merged == f"{engine._build_task_body(task)}\nGmail-ID: abc123"
@@ -0,0 +1,107 @@
+import json
+import os
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from webhook_receiver import WebhookDispatcher, WebhookServer, verify_signature
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'webhooks')
+
+
+def delivery(name):
+    with open(os.path.join(FIXTURES, f'{name}.json'), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def task_status(board, tasklist_id, task_id):
+    return board.service._tasks[tasklist_id][task_id]['status']
+
+
+def test_signature_verification():
+    signed = delivery('signed_ping')
+    body = signed['body'].encode('utf-8')
+    assert verify_signature(signed['secret'], body, signed['signature'])
+    assert not verify_signature('wrong-secret', body, signed['signature'])
+    assert not verify_signature(signed['secret'], body + b' ', signed['signature'])
+    assert not verify_signature(signed['secret'], body, signed['signature'].replace('sha256=', 'sha1='))
+    assert not verify_signature(signed['secret'], body, None)
+    assert not verify_signature('', body, signed['signature'])
+
+
+@pytest.mark.parametrize('signature, status', [('recorded', 202), ('sha256=' + '0' * 64, 401), (None, 401)])
+def test_server_rejects_unsigned_deliveries(signature, status):
+    signed = delivery('signed_ping')
+    handled = []
+
+    class Recorder:
+        def handle(self, event, payload):
+            handled.append((event, payload))
+
+    server = WebhookServer(Recorder(), signed['secret'], port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        host, port = server.httpd.server_address[:2]
+        headers = {'X-GitHub-Event': signed['event'], 'Content-Type': 'application/json'}
+        if signature:
+            headers['X-Hub-Signature-256'] = signed['signature'] if signature == 'recorded' else signature
+        request = urllib.request.Request(f"http://{host}:{port}/webhook", data=signed['body'].encode('utf-8'),
+                                         headers=headers, method='POST')
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                assert response.status == status
+        except urllib.error.HTTPError as e:
+            assert e.code == status
+    finally:
+        server.shutdown()
+        thread.join(timeout=10)
+    assert handled == ([(signed['event'], json.loads(signed['body']))] if status == 202 else [])
+
+
+def test_closed_issue_completes_its_task_and_reopened_does_not(board):
+    dispatcher = WebhookDispatcher(board.engine())
+    reopened, closed = dispatcher.replay([delivery('issue_reopened'), delivery('issue_closed')])
+
+    assert reopened['handled'] is False
+    assert closed == {'handled': True, 'action': 'complete_from_issue', 'task_id': 'bench-task-0000002'}
+    assert task_status(board, 'tasklist-00', 'bench-task-0000002') == 'completed'
+
+
+def test_status_change_to_done_completes_its_task(board):
+    dispatcher = WebhookDispatcher(board.engine())
+    other, unknown_target, done = dispatcher.replay([
+        delivery('item_moved_to_in_progress'),
+        delivery('item_status_edited_without_target'),
+        delivery('item_moved_to_done'),
+    ])
+
+    assert other == {'handled': False, 'reason': 'status changed to In Progress'}
+    # Without the new option in the delivery the item is looked up; it is still Todo
+    assert unknown_target == {'handled': False, 'reason': 'status is Todo'}
+    assert done == {'handled': True, 'action': 'complete_from_done_item', 'task_id': 'bench-task-0000022'}
+    assert task_status(board, 'tasklist-00', 'bench-task-0000022') == 'completed'
+    assert task_status(board, 'tasklist-01', 'bench-task-0000003') == 'needsAction'
+
+
+def test_foreign_repository_and_project_are_ignored(board):
+    dispatcher = WebhookDispatcher(board.engine())
+    issue, item = dispatcher.replay([delivery('issue_closed_foreign_repo'), delivery('item_in_foreign_project')])
+
+    assert issue['handled'] is False and 'someone-else/other-repo' in issue['reason']
+    assert item['handled'] is False and 'PVT_someone_else' in item['reason']
+    assert task_status(board, 'tasklist-00', 'bench-task-0000002') == 'needsAction'
+    assert task_status(board, 'tasklist-00', 'bench-task-0000022') == 'needsAction'
+
+
+def test_failed_completion_is_logged_as_a_failure(board, caplog):
+    engine = board.engine()
+    engine.close_task = lambda tasklist_id, task_id: False
+    WebhookDispatcher(engine).replay([delivery('issue_closed')])
+
+    assert 'Could not complete Google Task bench-task-0000002' in caplog.text
+    assert 'Completed Google Task' not in caplog.text
+    assert engine._completion_failures == 1
+    assert task_status(board, 'tasklist-00', 'bench-task-0000002') == 'needsAction'